@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Archive (and optionally clear) locale column data before the columns are dropped.
+
+The columns come from the schema change itself: by default the committed
+prisma/schema.prisma (--from REF) is compared with the working copy, and
+every column the new schema drops or makes optional gets a job. With
+--suffix the columns are picked by name instead.
+
+Each table is walked in primary-key batches, one short transaction per
+batch, with a checkpoint that lets an interrupted run resume (see
+codemod/backfill.py):
+
+    python3 scripts/backfill_locales.py --plan
+    python3 scripts/backfill_locales.py --database sqlite:///tmp/dev.db --suffix _th --suffix _zh
+    DATABASE_URL=postgresql://... python3 scripts/backfill_locales.py --clear --pause 0.1
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from codemod import backfill, gitdiff, prisma_schema
+from codemod.files import REPO_ROOT
+from codemod.output import read_text
+
+
+def load_schemas(root: Path, schema_path: Path, ref: str):
+    """(old, new) schemas: `schema_path` at `ref` and in the working tree."""
+    rel = schema_path.resolve().relative_to(root).as_posix()
+    old = gitdiff.git(root, "show", f"{ref}:{rel}").decode("utf-8")
+    return prisma_schema.parse(old), prisma_schema.parse(read_text(schema_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--root", type=Path, default=REPO_ROOT,
+                        help="Repository root (default: this checkout)")
+    parser.add_argument("--schema", type=Path, help="Schema file (default: <root>/prisma/schema.prisma)")
+    parser.add_argument("--from", dest="ref", default="HEAD", metavar="REF",
+                        help="Git revision holding the schema before the change (default: HEAD)")
+    parser.add_argument("--suffix", action="append", default=[],
+                        help="Take every column ending with SUFFIX from the current schema (repeatable)")
+    parser.add_argument("--database", default=os.environ.get("DATABASE_URL"), metavar="URL",
+                        help="sqlite:PATH, file:PATH or postgresql://... (default: $DATABASE_URL)")
+    parser.add_argument("--clear", action="store_true", help="Set the columns to NULL after archiving")
+    parser.add_argument("--no-archive", action="store_true", help="Do not copy values to the archive table")
+    parser.add_argument("--batch-size", type=int, default=backfill.DEFAULT_BATCH_SIZE, metavar="N",
+                        help=f"Rows per initial batch (default: {backfill.DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--max-batch", type=int, default=backfill.MAX_BATCH_SIZE, metavar="N",
+                        help=f"Largest adaptive batch (default: {backfill.MAX_BATCH_SIZE})")
+    parser.add_argument("--target-ms", type=float, default=backfill.DEFAULT_TARGET_SECONDS * 1000, metavar="MS",
+                        help="Transaction duration the batch size adapts to (default: 500)")
+    parser.add_argument("--pause", type=float, default=0.0, metavar="SEC",
+                        help="Sleep between batches to leave room for other writers")
+    parser.add_argument("--restart", action="store_true",
+                        help="Forget the checkpoints and start every job over (archives values again)")
+    parser.add_argument("--plan", action="store_true", help="Print the jobs and their SQL, touch nothing")
+    parser.add_argument("--metrics", type=Path, metavar="PATH", help="Write per-job metrics as JSON to PATH")
+    args = parser.parse_args()
+
+    if args.no_archive and not args.clear:
+        parser.error("--no-archive without --clear leaves nothing to do")
+    if args.batch_size < 1 or args.max_batch < args.batch_size:
+        parser.error("need 1 <= --batch-size <= --max-batch")
+
+    root = args.root.resolve()
+    schema_path = args.schema or root / "prisma/schema.prisma"
+    try:
+        if args.suffix:
+            old = new = prisma_schema.parse(read_text(schema_path))
+        else:
+            old, new = load_schemas(root, schema_path, args.ref)
+    except (RuntimeError, ValueError) as e:
+        sys.exit(f"✗ {e}")
+
+    jobs, warnings = backfill.plan(old, new, args.suffix)
+    for warning in warnings:
+        print(f"- {warning}")
+    if not jobs:
+        print("No locale columns to back up")
+        return
+
+    runner = backfill.Backfill(
+        conn=None, archive=not args.no_archive, clear=args.clear, batch_size=args.batch_size,
+        max_batch=args.max_batch, target_seconds=args.target_ms / 1000, pause=args.pause,
+    )
+    if args.plan:
+        for job in jobs:
+            print(f"{job.model} ({job.table}): {', '.join(column.name for column in job.columns)}")
+            for statement in runner.statements(job):
+                print(f"    {' '.join(statement.split())};")
+        return
+
+    if not args.database:
+        parser.error("--database or DATABASE_URL is required")
+    try:
+        runner.conn, runner.dialect = backfill.connect(args.database)
+    except (RuntimeError, ValueError) as e:
+        sys.exit(f"✗ {e}")
+
+    metrics = []
+    try:
+        runner.setup()
+        for job in jobs:
+            if args.restart:
+                runner.reset(job)
+            print(f"{job.model}: {', '.join(column.name for column in job.columns)}")
+            stats = runner.run(job)
+            if stats.done and not stats.batches:
+                print(f"- {job.table} already done ({stats.resumed_rows} rows)")
+            else:
+                resumed = f", resumed after {stats.resumed_rows} rows" if stats.resumed_rows else ""
+                print(f"✓ {job.table}: {stats.rows} rows in {stats.batches} batches "
+                      f"({stats.seconds:.1f}s, {stats.rate:.0f} rows/s{resumed}); "
+                      f"archived {stats.archived} values, cleared {stats.cleared} rows")
+            metrics.append(backfill.summary(stats))
+    except KeyboardInterrupt:
+        print("\nInterrupted; run again to resume from the last checkpoint")
+        sys.exit(130)
+    finally:
+        runner.conn.close()
+        if args.metrics and metrics:
+            with open(args.metrics, 'w', encoding='utf-8') as f:
+                json.dump(metrics, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
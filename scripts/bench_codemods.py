@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark the codemod transforms on a synthetic TSX/Prisma corpus.
+
+Generates 10 to 10,000 realistic form components and API routes (plus a
+schema.prisma scaled to match) and runs each script's transform function
+over them, reporting throughput and peak Python memory so regex blow-ups
+show up here instead of in a CI migration job.
+
+Every transform is timed twice: as the script shipped it (`baseline`,
+pinned in codemod/baseline.py) and as it is implemented now (`current`,
+with the code it runs named in the table). The `speedup` column compares
+the two on the same corpus.
+"""
+
+import argparse
+import importlib.util
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from codemod import baseline, corpus
+from codemod.engine import apply_rules
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+def load_script(filename: str):
+    """Import a script from scripts/ by file name (some contain hyphens)."""
+    name = filename[:-3].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _remove_language_fields(module):
+    def run(content):
+        return module.remove_language_fields(module.remove_language_fields(content, '_th'), '_zh')
+    return run
+
+
+def benchmarks():
+    """(name, implementation, what it runs, input kind, callable) for every case.
+
+    Kind "text" takes a TS/TSX string, "file" a path it rewrites in place,
+    "schema" the schema.prisma string.
+    """
+    return [
+        ('remove_language_fields', 'baseline', 'regexes', 'text', _remove_language_fields(baseline)),
+        ('remove_language_fields', 'current', 'regexes + jsx index', 'text',
+         _remove_language_fields(load_script('remove-lang-fields.py'))),
+        ('remove_th_zh_from_file', 'baseline', 'regexes', 'file', baseline.remove_th_zh_from_file),
+        ('remove_th_zh_from_file', 'current', 'regexes + jsx index', 'file',
+         load_script('remove_lang.py').remove_th_zh_from_file),
+        ('ultra_clean', 'baseline', 'line loop', 'text', baseline.ultra_clean),
+        ('ultra_clean', 'current', 'line loop, compiled', 'text', load_script('ultra_clean.py').ultra_clean),
+        ('remove_from_destructuring', 'baseline', 'brace regex', 'text', baseline.remove_from_destructuring),
+        ('remove_from_destructuring', 'current', 'destructure scanner', 'text',
+         load_script('remove_lang_final.py').remove_from_destructuring),
+        ('make_lang_optional', 'baseline', 'line regex', 'schema', baseline.make_lang_optional),
+        ('make_lang_optional', 'current', 'prisma_schema parser', 'schema',
+         load_script('make_lang_optional.py').make_lang_optional),
+        ('engine.apply_rules', 'current', 'whole registry', 'text', apply_rules),
+    ]
+
+
+def _inputs(kind, files, tmp_root: Path):
+    """Fresh inputs for one run; file inputs are rewritten on disk."""
+    if kind == 'schema':
+        return [files['prisma/schema.prisma']]
+    sources = {rel: content for rel, content in files.items() if not rel.endswith('.prisma')}
+    if kind == 'text':
+        return list(sources.values())
+    run_dir = Path(tempfile.mkdtemp(dir=tmp_root))
+    corpus.write(sources, run_dir)
+    return [run_dir / rel for rel in sources]
+
+
+def _run(func, inputs):
+    for item in inputs:
+        func(item)
+
+
+def measure(name, implementation, runs, kind, func, files, tmp_root: Path, repeat: int) -> dict:
+    if kind == 'schema':
+        size = len(files['prisma/schema.prisma'].encode('utf-8'))
+        count = 1
+    else:
+        sources = [c for rel, c in files.items() if not rel.endswith('.prisma')]
+        size = sum(len(c.encode('utf-8')) for c in sources)
+        count = len(sources)
+
+    best = None
+    for _ in range(repeat):
+        inputs = _inputs(kind, files, tmp_root)
+        start = time.perf_counter()
+        _run(func, inputs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Separate run so tracemalloc's overhead does not skew the timing.
+    inputs = _inputs(kind, files, tmp_root)
+    tracemalloc.start()
+    _run(func, inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'transform': name,
+        'implementation': implementation,
+        'runs': runs,
+        'files': count,
+        'bytes': size,
+        'seconds': best,
+        'files_per_sec': count / best if best else float('inf'),
+        'mb_per_sec': size / 1e6 / best if best else float('inf'),
+        'peak_kib': peak / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,1000',
+                        help='Comma-separated corpus sizes in files (default: 10,100,1000)')
+    parser.add_argument('--only', help='Comma-separated transform names to run')
+    parser.add_argument('--implementation', choices=('baseline', 'current'),
+                        help='Only time one implementation (default: both, side by side)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case; the best is kept')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', type=Path, metavar='PATH', help='Also write the results as JSON')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    selected = benchmarks()
+    if args.only:
+        wanted = set(args.only.split(','))
+        unknown = wanted.difference(bench[0] for bench in selected)
+        if unknown:
+            parser.error(f"Unknown transform(s): {', '.join(sorted(unknown))}")
+        selected = [bench for bench in selected if bench[0] in wanted]
+    if args.implementation:
+        selected = [bench for bench in selected if bench[1] == args.implementation]
+
+    results = []
+    print(f"{'transform':<28}{'implementation':<32}{'files':>7}{'KiB':>10}{'sec':>10}{'files/s':>11}"
+          f"{'MB/s':>8}{'peak KiB':>11}{'speedup':>9}")
+    with tempfile.TemporaryDirectory(prefix='codemod-bench-') as tmp:
+        for size in sizes:
+            files = corpus.generate(size, args.seed)
+            baseline_seconds = {}
+            for name, implementation, runs, kind, func in selected:
+                row = measure(name, implementation, runs, kind, func, files, Path(tmp), args.repeat)
+                if implementation == 'baseline':
+                    baseline_seconds[name] = row['seconds']
+                elif name in baseline_seconds and row['seconds']:
+                    row['speedup'] = baseline_seconds[name] / row['seconds']
+                results.append(row)
+                speedup = f"{row['speedup']:.2f}x" if 'speedup' in row else ''
+                print(f"{row['transform']:<28}{implementation + ' (' + runs + ')':<32}{row['files']:>7}"
+                      f"{row['bytes'] / 1024:>10.0f}{row['seconds']:>10.3f}{row['files_per_sec']:>11.0f}"
+                      f"{row['mb_per_sec']:>8.2f}{row['peak_kib']:>11.0f}{speedup:>9}")
+                sys.stdout.flush()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'seed': args.seed, 'results': results}, f, indent=2)
+            f.write('\n')
+        print(f"\n✓ Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Report codemod rule patterns that can backtrack super-linearly.
+
+Every regex in the registry (and any pattern given on the command line)
+is checked for nested or competing repeats, see codemod/regex_safety.py.
+Findings limited to a single line are only listed with -v.
+
+    python3 scripts/check_rules.py
+    python3 scripts/check_rules.py --check
+    python3 scripts/check_rules.py --pattern '(\\w+\\s?)*$'
+"""
+
+import argparse
+import re
+import sys
+
+from codemod import regex_safety, rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rules", metavar="SOURCES",
+                        help=f"Comma-separated rule sources to check ({', '.join(rules.SOURCES)})")
+    parser.add_argument("--pattern", action="append", default=[], metavar="REGEX",
+                        help="Check REGEX instead of the registry (repeatable)")
+    parser.add_argument("--dotall", action="store_true", help="Compile --pattern with re.DOTALL")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Also list findings that can only blow up within one line")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit with status 1 if a pattern can blow up on a whole file")
+    args = parser.parse_args()
+
+    if args.pattern:
+        flags = re.DOTALL if args.dotall else 0
+        try:
+            findings = [
+                regex_safety.RuleFinding(f"--pattern {i}", "command line", pattern, finding)
+                for i, pattern in enumerate(args.pattern, 1)
+                for finding in regex_safety.analyze(pattern, flags)
+            ]
+        except re.error as e:
+            parser.error(f"invalid pattern: {e}")
+    else:
+        try:
+            selected = rules.rules_for(args.rules.split(",") if args.rules else None)
+        except ValueError as e:
+            parser.error(str(e))
+        findings = regex_safety.check_rules((*selected, *rules.CLEANUP_RULES))
+
+    serious = regex_safety.serious(findings)
+    for finding in findings:
+        if finding in serious:
+            print(f"✗ {finding}")
+        elif args.verbose:
+            print(f"- {finding}")
+        else:
+            continue
+        print(f"    {finding.pattern}")
+
+    bounded = len(findings) - len(serious)
+    print(f"\n{len(serious)} whole-file, {bounded} single-line findings")
+    if args.check and serious:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Check TS/TSX files for structural breakage left behind by the codemods.
+
+Reports unbalanced brackets and JSX tags, unterminated strings, templates
+and comments, and orphaned commas or operators, with line and column, in
+seconds instead of a full `next build`.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from codemod.files import DEFAULT_DIRECTORIES, REPO_ROOT, iter_source_files, resolve_files
+from codemod.parallel import ERROR, run_files
+from codemod.validate import validate
+
+
+def check_file(file_path: Path):
+    """Return (False, problems); the file is never modified."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return False, [str(problem) for problem in validate(content, file_path.suffix == '.tsx')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*",
+                        help="Files or directories relative to --root (default: src/app, src/components, src/hooks)")
+    parser.add_argument("--root", type=Path, default=REPO_ROOT,
+                        help="Repository root (default: this checkout)")
+    parser.add_argument("-j", "--jobs", type=int, default=0, metavar="N",
+                        help="Worker processes (0 = one per CPU, default: 0)")
+    args = parser.parse_args()
+    root = args.root.resolve()
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+
+    if args.paths:
+        files = resolve_files(root, args.paths)
+    else:
+        files = list(iter_source_files(root, DEFAULT_DIRECTORIES))
+
+    broken = 0
+    for result in run_files(check_file, files, args.jobs):
+        file_rel = result.path.relative_to(root)
+        if result.status == ERROR:
+            print(f"✗ {file_rel}: {result.error}")
+            broken += 1
+        elif result.detail:
+            broken += 1
+            for problem in result.detail:
+                print(f"✗ {file_rel}:{problem}")
+
+    print(f"\nChecked {len(files)} files, {broken} with problems")
+    sys.exit(1 if broken else 0)
+
+
+if __name__ == "__main__":
+    main()
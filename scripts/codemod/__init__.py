@@ -0,0 +1,20 @@
+"""
+Single-pass codemod engine for the locale-stripping migrations in scripts/.
+"""
+
+from .destructure import remove_suffixed_entries
+from .engine import apply_rules, process_file, profile_file
+from .rules import CLEANUP_RULES, RULES, LineRule, Rule, TransformRule, rules_for
+
+__all__ = [
+    "CLEANUP_RULES",
+    "RULES",
+    "LineRule",
+    "Rule",
+    "TransformRule",
+    "apply_rules",
+    "process_file",
+    "profile_file",
+    "remove_suffixed_entries",
+    "rules_for",
+]
@@ -0,0 +1,351 @@
+"""
+Batched, resumable archive/clear jobs for locale columns that are going away.
+
+`plan` compares two versions of schema.prisma and produces one `Job` per
+table for the scalar columns that were dropped or made optional (or, with
+explicit suffixes, every column ending in one of them). `Backfill.run`
+then walks the table in primary-key order with keyset pagination
+(`WHERE id > :last ORDER BY id LIMIT :n`), and for every batch, in one
+short transaction:
+
+- copies the non-null values into `_locale_archive` (table, row id,
+  column, value as text, time), so the data survives the column drop;
+- optionally sets the columns to NULL;
+- records the last key of the batch in `_backfill_checkpoint`.
+
+Because the checkpoint commits together with the batch, an interrupted
+run resumes exactly where it stopped. The batch size adapts to keep each
+transaction near a target duration, an optional pause between batches
+leaves room for other writers, and progress (rows, rows/s, ETA) is
+reported as it goes.
+
+Connections are plain DB-API: sqlite3 from the standard library, or
+psycopg for PostgreSQL when it is installed.
+"""
+
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .prisma_schema import Field, Model, Schema
+
+ARCHIVE_TABLE = "_locale_archive"
+CHECKPOINT_TABLE = "_backfill_checkpoint"
+
+DEFAULT_BATCH_SIZE = 1000
+MIN_BATCH_SIZE = 50
+MAX_BATCH_SIZE = 20000
+DEFAULT_TARGET_SECONDS = 0.5
+
+_MAP = re.compile(r'@@?map\(\s*(?:name:\s*)?"([^"]+)"\s*\)')
+
+
+@dataclass(frozen=True)
+class Column:
+    field: str
+    name: str          # database column name (@map)
+    nullable: bool     # in the target schema; a dropped column counts as not nullable unless it was
+
+
+@dataclass
+class Job:
+    model: str
+    table: str         # database table name (@@map)
+    key: str           # single-column primary key
+    columns: List[Column]
+    integer_key: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.table}:{','.join(column.name for column in self.columns)}"
+
+
+def _table_name(model: Model) -> str:
+    for attr in model.block_attributes:
+        match = _MAP.match(attr)
+        if match:
+            return match.group(1)
+    return model.name
+
+
+def _column_name(fld: Field) -> str:
+    for attr in fld.attributes:
+        match = _MAP.match(attr)
+        if match:
+            return match.group(1)
+    return fld.name
+
+
+def _primary_key(model: Model) -> Optional[Field]:
+    for fld in model.fields:
+        if any(attr.split('(')[0] == '@id' for attr in fld.attributes):
+            return fld
+    return None
+
+
+def plan(old: Schema, new: Schema, suffixes: Sequence[str] = ()) -> Tuple[List[Job], List[str]]:
+    """Jobs for the columns `new` drops or relaxes, and warnings for skipped models.
+
+    With `suffixes`, every scalar column of `old` ending in one of them is
+    included, whether or not `new` changed it.
+    """
+    jobs: List[Job] = []
+    warnings: List[str] = []
+    for name, model in old.models.items():
+        if model.keyword != 'model':
+            continue
+        target = new.models.get(name)
+        columns = []
+        for fld in model.fields:
+            if not fld.is_scalar or fld.is_list:
+                continue
+            after = target.field(fld.name) if target is not None else None
+            if suffixes:
+                selected = fld.has_suffix(suffixes)
+            else:
+                selected = after is None or (after.optional and not fld.optional)
+            if selected:
+                nullable = after.optional if after is not None else fld.optional
+                columns.append(Column(fld.name, _column_name(fld), nullable))
+        if not columns:
+            continue
+        key = _primary_key(model)
+        if key is None:
+            warnings.append(f"{name} has no single-column @id; skipped")
+            continue
+        jobs.append(Job(name, _table_name(model), _column_name(key), columns, key.type in ('Int', 'BigInt')))
+    return jobs, warnings
+
+
+# -- database ----------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Dialect:
+    name: str
+    placeholder: str
+
+    def sql(self, statement: str) -> str:
+        """Statements are written with `?` placeholders."""
+        return statement if self.placeholder == '?' else statement.replace('?', self.placeholder)
+
+
+SQLITE = Dialect("sqlite", "?")
+POSTGRES = Dialect("postgresql", "%s")
+
+
+def quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def connect(url: str):
+    """(connection, dialect) for a sqlite:/file: path or a postgres URL."""
+    if url.startswith(('sqlite:', 'file:')):
+        path = re.sub(r'^(?:sqlite:(?://)?|file:)', '', url)
+        return sqlite3.connect(path), SQLITE
+    if url.startswith(('postgres://', 'postgresql://')):
+        try:
+            import psycopg
+        except ImportError:
+            raise RuntimeError("PostgreSQL needs psycopg: pip install 'psycopg[binary]'")
+        # Prisma URLs carry ?schema=...; libpq does not know that parameter.
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query))
+        schema = query.pop('schema', None)
+        conn = psycopg.connect(urlunsplit(parts._replace(query=urlencode(query))))
+        if schema:
+            conn.execute(f"SET search_path TO {quote(schema)}")
+            conn.commit()
+        return conn, POSTGRES
+    raise ValueError(f"Unsupported database URL: {url}")
+
+
+@dataclass
+class JobStats:
+    job: str
+    rows: int = 0                  # processed by this run
+    batches: int = 0
+    archived: int = 0
+    cleared: int = 0
+    seconds: float = 0.0
+    resumed_rows: int = 0          # processed by earlier, interrupted runs
+    resumed_from: Optional[str] = None
+    done: bool = False
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class Backfill:
+    conn: object
+    dialect: Dialect = SQLITE
+    archive: bool = True
+    clear: bool = False
+    batch_size: int = DEFAULT_BATCH_SIZE
+    min_batch: int = MIN_BATCH_SIZE
+    max_batch: int = MAX_BATCH_SIZE
+    target_seconds: float = DEFAULT_TARGET_SECONDS
+    pause: float = 0.0
+    report_every: float = 5.0
+    report: Callable[[str], None] = print
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+
+    def _execute(self, cursor, statement: str, params: Sequence = ()):
+        cursor.execute(self.dialect.sql(statement), tuple(params))
+        return cursor
+
+    def setup(self):
+        cursor = self.conn.cursor()
+        self._execute(cursor, f"""CREATE TABLE IF NOT EXISTS {quote(ARCHIVE_TABLE)} (
+            table_name TEXT NOT NULL, row_id TEXT NOT NULL, column_name TEXT NOT NULL,
+            value TEXT, archived_at TEXT NOT NULL)""")
+        self._execute(cursor, f"""CREATE TABLE IF NOT EXISTS {quote(CHECKPOINT_TABLE)} (
+            job TEXT PRIMARY KEY, last_key TEXT, rows_done INTEGER NOT NULL DEFAULT 0,
+            done INTEGER NOT NULL DEFAULT 0, updated_at TEXT NOT NULL)""")
+        self.conn.commit()
+
+    def checkpoint(self, job: Job) -> Tuple[Optional[str], int, bool]:
+        """(last key, rows done, finished) recorded for `job`."""
+        cursor = self._execute(self.conn.cursor(),
+                               f"SELECT last_key, rows_done, done FROM {quote(CHECKPOINT_TABLE)} WHERE job = ?",
+                               [job.name])
+        row = cursor.fetchone()
+        self.conn.commit()
+        if row is None:
+            return None, 0, False
+        # Keys are stored as text; integer keys must compare as integers again.
+        last_key = int(row[0]) if job.integer_key and row[0] is not None else row[0]
+        return last_key, row[1], bool(row[2])
+
+    def reset(self, job: Job):
+        self._execute(self.conn.cursor(), f"DELETE FROM {quote(CHECKPOINT_TABLE)} WHERE job = ?", [job.name])
+        self.conn.commit()
+
+    def _save_checkpoint(self, cursor, job: Job, last_key, rows: int, done: bool):
+        self._execute(cursor, f"""INSERT INTO {quote(CHECKPOINT_TABLE)} (job, last_key, rows_done, done, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (job) DO UPDATE SET last_key = excluded.last_key, rows_done = excluded.rows_done,
+                done = excluded.done, updated_at = excluded.updated_at""",
+                      [job.name, last_key, rows, int(done), _now()])
+
+    def _remaining(self, job: Job, last_key) -> int:
+        table, key = quote(job.table), quote(job.key)
+        cursor = self.conn.cursor()
+        if last_key is None:
+            self._execute(cursor, f"SELECT COUNT(*) FROM {table}")
+        else:
+            self._execute(cursor, f"SELECT COUNT(*) FROM {table} WHERE {key} > ?", [last_key])
+        count = cursor.fetchone()[0]
+        self.conn.commit()
+        return count
+
+    def statements(self, job: Job) -> List[str]:
+        """The per-batch statements for `job`, for --plan output."""
+        table, key = quote(job.table), quote(job.key)
+        statements = [f"SELECT {key} FROM {table} WHERE {key} > ? ORDER BY {key} LIMIT ?"]
+        window = f"{key} >= ? AND {key} <= ?"
+        if self.archive:
+            statements += [
+                f"INSERT INTO {quote(ARCHIVE_TABLE)} (table_name, row_id, column_name, value, archived_at) "
+                f"SELECT ?, CAST({key} AS TEXT), ?, CAST({quote(column.name)} AS TEXT), ? FROM {table} "
+                f"WHERE {window} AND {quote(column.name)} IS NOT NULL"
+                for column in job.columns
+            ]
+        cleared = self._clearable(job)
+        if self.clear and cleared:
+            assignments = ', '.join(f"{quote(column.name)} = NULL" for column in cleared)
+            any_set = ' OR '.join(f"{quote(column.name)} IS NOT NULL" for column in cleared)
+            statements.append(f"UPDATE {table} SET {assignments} WHERE {window} AND ({any_set})")
+        return statements
+
+    def _clearable(self, job: Job) -> List[Column]:
+        return [column for column in job.columns if column.nullable]
+
+    def run(self, job: Job) -> JobStats:
+        last_key, rows_done, done = self.checkpoint(job)
+        stats = JobStats(job.name, resumed_rows=rows_done, resumed_from=last_key, done=done)
+        if done:
+            return stats
+        if self.clear and len(self._clearable(job)) < len(job.columns):
+            skipped = [column.name for column in job.columns if not column.nullable]
+            self.report(f"  {job.table}: {', '.join(skipped)} not nullable; archived but not cleared")
+
+        select, *writes = self.statements(job)
+        table, key = quote(job.table), quote(job.key)
+        first = f"SELECT {key} FROM {table} ORDER BY {key} LIMIT ?"
+        total = rows_done + self._remaining(job, last_key)
+        size = max(self.min_batch, min(self.batch_size, self.max_batch))
+        started = self.clock()
+        last_report = started
+
+        while True:
+            batch_started = self.clock()
+            cursor = self.conn.cursor()
+            if last_key is None:
+                self._execute(cursor, first, [size])
+            else:
+                self._execute(cursor, select, [last_key, size])
+            keys = [row[0] for row in cursor.fetchall()]
+            if not keys:
+                self._save_checkpoint(cursor, job, last_key, rows_done + stats.rows, True)
+                self.conn.commit()
+                stats.done = True
+                break
+            low, high = keys[0], keys[-1]
+            now = _now()
+            if self.archive:
+                for statement, column in zip(writes, job.columns):
+                    self._execute(cursor, statement, [job.table, column.name, now, low, high])
+                    stats.archived += max(cursor.rowcount, 0)
+            if self.clear and self._clearable(job):
+                self._execute(cursor, writes[-1], [low, high])
+                stats.cleared += max(cursor.rowcount, 0)
+            stats.rows += len(keys)
+            stats.batches += 1
+            self._save_checkpoint(cursor, job, high, rows_done + stats.rows, False)
+            self.conn.commit()
+            last_key = high
+
+            elapsed = self.clock() - batch_started
+            size = self._adapt(size, elapsed)
+            now_clock = self.clock()
+            stats.seconds = now_clock - started
+            if now_clock - last_report >= self.report_every:
+                last_report = now_clock
+                self.report(_progress(job, stats, total, size))
+            if self.pause:
+                time.sleep(self.pause)
+        stats.seconds = self.clock() - started
+        return stats
+
+    def _adapt(self, size: int, elapsed: float) -> int:
+        """Halve the batch when a transaction runs long, double it when it is quick."""
+        if elapsed > self.target_seconds * 1.5:
+            return max(self.min_batch, size // 2)
+        if elapsed < self.target_seconds / 2:
+            return min(self.max_batch, size * 2)
+        return size
+
+
+def _now() -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+
+def _progress(job: Job, stats: JobStats, total: int, size: int) -> str:
+    rows = stats.resumed_rows + stats.rows
+    percent = f"{100 * rows / total:.0f}%" if total else "-"
+    eta = f", ETA {(total - rows) / stats.rate:.0f}s" if stats.rate and total > rows else ""
+    return (f"  {job.table}: {rows}/{total} rows ({percent}), "
+            f"{stats.rate:.0f} rows/s, batch {size}{eta}")
+
+
+def summary(stats: JobStats) -> Dict[str, object]:
+    return {
+        "job": stats.job, "rows": stats.rows, "resumed_rows": stats.resumed_rows, "batches": stats.batches, "archived": stats.archived,
+        "cleared": stats.cleared, "seconds": round(stats.seconds, 3), "rows_per_second": round(stats.rate, 1),
+    }
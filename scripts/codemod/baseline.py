@@ -0,0 +1,124 @@
+"""
+The original one-shot transforms, kept as a fixed reference for benchmarks.
+
+These are the functions the scripts shipped with before the codemod
+package replaced their internals, copied with their comments stripped;
+make_lang_optional, which ran at import time, is wrapped in a function.
+bench_codemods.py times each of them next to the current implementation
+of the same transform, so a result always says which code it measured.
+Nothing else imports this module, and fixes belong in the scripts.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+
+# remove-lang-fields.py
+
+def remove_language_fields(content: str, lang_suffix: str) -> str:
+    """Remove all occurrences of fields with the given language suffix."""
+    content = re.sub(rf'^\s*\w+{lang_suffix}:.*?[,;]\s*$', '', content, flags=re.MULTILINE)
+    content = re.sub(rf'^\s*\w+{lang_suffix}:\s*z\..*?[,;]\s*$', '', content, flags=re.MULTILINE)
+    content = re.sub(rf'^\s*\w+{lang_suffix}:\s*[\'"].*?[\'"],?\s*$', '', content, flags=re.MULTILINE)
+    content = re.sub(rf'^\s*\w+{lang_suffix}:\s*.*?\|\|.*?[,;]\s*$', '', content, flags=re.MULTILINE)
+    content = re.sub(rf'<(?:Input|Textarea)[^>]*name="{lang_suffix}"[^>]*>.*?</(?:Input|Textarea)>', '', content, flags=re.DOTALL)
+    content = re.sub(rf'<(?:Input|Textarea)[^>]*name="{lang_suffix}"[^>]*/>', '', content)
+    content = re.sub(rf"onChange=\{{.*?'{lang_suffix}'.*?\}}", '', content)
+    content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+    return content
+
+
+# remove_lang.py
+
+def remove_th_zh_from_file(file_path: Path) -> bool:
+    """Remove _th and _zh fields from a single file."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        original = content
+        content = re.sub(r'^\s+\w+_(th|zh):.*?;\s*$', '', content, flags=re.MULTILINE)
+        content = re.sub(r'^\s+\w+_(th|zh):\s*[^,]+,?\s*$', '', content, flags=re.MULTILINE)
+        content = re.sub(
+            r'<div[^>]*>\s*<label[^>]*>(?:Thai|Chinese|ไทย|中文)[^<]*</label>\s*<(?:input|textarea)[^>]*name="[^"]*_(th|zh)"[^>]*(?:/>|>[^<]*</(?:input|textarea)>)\s*</div>',
+            '',
+            content,
+            flags=re.DOTALL | re.MULTILINE
+        )
+        content = re.sub(
+            r'<div>\s*<label[^>]*>(?:Thai|Chinese|ไทย|中文)[^<]*</label>\s*<(?:input|textarea)[^>]*name="[^"]*_(th|zh)"[^>]*(?:/>|>[^<]*</(?:input|textarea)>)\s*</div>',
+            '',
+            content,
+            flags=re.DOTALL
+        )
+        content = re.sub(
+            r"{\s*code:\s*'(th|zh)',\s*label:\s*'[^']+',\s*flag:\s*'[^']+'\s*},?\s*",
+            '',
+            content
+        )
+        content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
+        content = re.sub(r',(\s*[}\]])', r'\1', content)
+
+        if content != original:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            return True
+        return False
+
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}", file=sys.stderr)
+        return False
+
+
+# ultra_clean.py
+
+def ultra_clean(content: str) -> str:
+    """Remove all _th/_zh references aggressively."""
+    lines = content.split('\n')
+    cleaned = []
+
+    for line in lines:
+        if ('_th' in line or '_zh' in line) and 'locale' not in line.lower():
+            if re.search(r"locale\s*===?\s*['\"](?:th|zh)['\"]", line):
+                cleaned.append(line)
+            continue
+        cleaned.append(line)
+
+    content = '\n'.join(cleaned)
+    content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
+    content = re.sub(r',(\s*[}\]])', r'\1', content)
+    return content
+
+
+# remove_lang_final.py
+
+def remove_from_destructuring(content: str) -> str:
+    """Remove _th and _zh from destructuring patterns."""
+    def clean_destructure(match):
+        items = [item.strip() for item in match.group(1).split(',')]
+        cleaned = [item for item in items if not re.search(r'\w+_(th|zh)$', item.strip())]
+        return '{ ' + ', '.join(cleaned) + ' }'
+
+    content = re.sub(
+        r'\{\s*([^}]+)\s*\}',
+        lambda m: clean_destructure(m) if any(x in m.group(1) for x in ['_th', '_zh']) else m.group(0),
+        content
+    )
+    return content
+
+
+# make_lang_optional.py
+
+def make_lang_optional(content: str) -> str:
+    """Make _th and _zh fields optional by adding ? if not already present."""
+    lines = content.split('\n')
+    new_lines = []
+
+    for line in lines:
+        if re.search(r'(\w+_(th|zh))\s+(String|Json)\s*(@|$)', line):
+            if '?' not in line.split('@')[0]:
+                line = re.sub(r'(\w+_(th|zh)\s+)(String|Json)(\s+)', r'\1\3?\4', line)
+        new_lines.append(line)
+
+    return '\n'.join(new_lines)
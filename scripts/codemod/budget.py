@@ -0,0 +1,68 @@
+"""
+Per-file time budget for the rules.
+
+A backtracking pattern that meets the wrong input can run for minutes on
+one file and stall the whole job. `bounded` runs a transform under an
+interval timer; when the budget runs out, the SIGALRM handler raises
+`BudgetExceeded` out of the running match (the regex engine checks for
+signals while it backtracks). The rule loops in engine.py and fixpoint.py
+call `running` before each rule, so the error names the rule that was
+executing. The caller reports the file as an error and moves on, and the
+file itself is left untouched since nothing has been written yet.
+
+The timer needs SIGALRM and the main thread, which is where the rules run
+in run_pipeline (the calling thread or a worker process's main thread).
+Elsewhere the transform runs without a budget.
+"""
+
+import signal
+import threading
+from typing import Callable, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_SECONDS = 10.0
+
+
+class BudgetExceeded(RuntimeError):
+    """A file took longer than its time budget."""
+
+
+# Rules being applied in this process, as last reported through `running`.
+_running: Tuple[str, ...] = ()
+
+
+def running(*names: str):
+    """Record the rule (or batch of line rules) about to be applied."""
+    global _running
+    _running = names
+
+
+def _available() -> bool:
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+def bounded(func: Callable[[T], R], arg: T, seconds: float = DEFAULT_SECONDS) -> R:
+    """Return `func(arg)`, raising BudgetExceeded after `seconds`.
+
+    Meant to be bound with functools.partial like validate.checked. A
+    budget of 0 (or no SIGALRM) means no limit.
+    """
+    if seconds <= 0 or not _available():
+        return func(arg)
+
+    def expire(signum, frame):
+        names = ', '.join(map(repr, _running))
+        where = f"rule{'s' if len(_running) > 1 else ''} {names} " if _running else ""
+        raise BudgetExceeded(f"{where}exceeded the {seconds:g}s time budget; file skipped")
+
+    running()
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        return func(arg)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        running()
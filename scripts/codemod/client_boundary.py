@@ -0,0 +1,221 @@
+"""
+Infer where `'use client'` directives are needed from the import graph.
+
+Every module under src/ is read once into a `Module`: the local modules it
+imports (resolving `@/` and relative specifiers), the client-only features
+it uses itself (event handler props, React hooks, browser globals,
+createContext, client-only packages) and any server-only markers.
+
+Starting from the App Router entries (pages, layouts, templates, ...),
+modules are walked as server components. The first module on a path that
+uses a client feature becomes a boundary: it needs the directive and
+everything it imports is client code already, so nothing below it needs
+one. Boundaries therefore sit as deep in the tree as possible, which keeps
+the server-rendered part of each page, and the client bundle, minimal.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .files import SOURCE_SUFFIXES
+
+DEFAULT_DIRECTORIES = ("src",)
+
+# App Router files that are rendered as server components by default.
+SERVER_ENTRIES = ("page", "layout", "template", "loading", "not-found", "default")
+# App Router files that Next.js requires to be client components.
+CLIENT_ENTRIES = ("error", "global-error")
+
+# Hooks that next-intl also supports in (non-async) server components.
+SERVER_SAFE_HOOKS = frozenset({
+    "useTranslations", "useLocale", "useFormatter", "useNow", "useTimeZone", "useMessages",
+})
+CLIENT_PACKAGES = (
+    "framer-motion", "react-hot-toast", "next-auth/react", "react-hook-form", "@radix-ui/",
+)
+SERVER_PACKAGES = (
+    "server-only", "next/headers", "next-intl/server", "fs", "fs/promises", "@/lib/prisma",
+)
+
+_DIRECTIVE = re.compile(r'^(?:\s|//[^\n]*\n|/\*.*?\*/)*([\'"])use client\1;?[ \t]*\n?', re.S)
+_COMMENT = re.compile(r'/\*.*?\*/|(?<![:\w\'"])//[^\n]*', re.S)
+_IMPORT = re.compile(
+    r'''(?:^|[;\n])\s*(?:import|export)\s+(type\s+)?(?:[^'";]*?\s+from\s+)?(['"])([^'"\n]+)\2'''
+    r'''|\bimport\s*\(\s*(['"])([^'"\n]+)\4\s*\)''')
+_EVENT_PROP = re.compile(r'\s(on[A-Z]\w*)=\{')
+_HOOK = re.compile(r'(?<![\w$.])(?:React\.)?(use[A-Z]\w*)\s*[(<]')
+_BROWSER = re.compile(r'(?<![\w$.])(window|document|localStorage|sessionStorage|navigator)\s*[.\[]')
+_CONTEXT = re.compile(r'\bcreateContext\s*[(<]')
+_ASYNC_COMPONENT = re.compile(r'\bexport\s+default\s+async\s+function\b')
+
+
+@dataclass
+class Module:
+    path: Path
+    has_directive: bool
+    imports: List[Path] = field(default_factory=list)
+    client_features: List[str] = field(default_factory=list)
+    server_features: List[str] = field(default_factory=list)
+
+    @property
+    def needs_client(self) -> bool:
+        return bool(self.client_features)
+
+
+@dataclass
+class BoundaryReport:
+    """Outcome of the analysis, as paths relative to the root."""
+
+    boundaries: List[str]        # minimal set of modules that need the directive
+    missing: List[str]           # boundaries without the directive yet
+    redundant: List[str]         # directives that turn server-rendered modules into client ones
+    conflicts: List[Tuple[str, List[str], List[str]]]  # (path, client, server) features
+    unreached: List[str]         # client-feature modules no entry imports
+
+
+def _features(code: str) -> Tuple[List[str], List[str], List[Tuple[str, bool]]]:
+    """Client features, server features and (specifier, type_only) imports."""
+    client: Set[str] = set()
+    server: Set[str] = set()
+    specifiers = []
+    for match in _IMPORT.finditer(code):
+        spec = match.group(3) or match.group(5)
+        type_only = bool(match.group(1))
+        specifiers.append((spec, type_only))
+        if type_only:
+            continue
+        if spec.startswith(CLIENT_PACKAGES):
+            client.add(f"import {spec}")
+        if spec in SERVER_PACKAGES:
+            server.add(f"import {spec}")
+    client.update(f"{m.group(1)} handler" for m in _EVENT_PROP.finditer(code))
+    client.update(f"{m.group(1)}()" for m in _HOOK.finditer(code) if m.group(1) not in SERVER_SAFE_HOOKS)
+    client.update(m.group(1) for m in _BROWSER.finditer(code))
+    if _CONTEXT.search(code):
+        client.add("createContext()")
+    if _ASYNC_COMPONENT.search(code):
+        server.add("async component")
+    return sorted(client), sorted(server), specifiers
+
+
+class ImportGraph:
+    """Modules under the source directories, parsed once and memoized."""
+
+    def __init__(self, root: Path, directories: Sequence[str] = DEFAULT_DIRECTORIES,
+                 alias: Tuple[str, str] = ("@/", "src/")):
+        self.root = root
+        self.directories = tuple(directories)
+        self.alias = alias
+        self.modules: Dict[Path, Module] = {}
+        for directory in self.directories:
+            for dirpath, dirnames, filenames in os.walk(root / directory):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith(SOURCE_SUFFIXES) and not filename.endswith(".d.ts"):
+                        self._load(Path(dirpath, filename))
+
+    def _load(self, path: Path):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        code = _COMMENT.sub('', content)
+        client, server, specifiers = _features(code)
+        module = Module(path, bool(_DIRECTIVE.match(content)),
+                        client_features=client, server_features=server)
+        for spec, type_only in specifiers:
+            target = None if type_only else self.resolve(path.parent, spec)
+            if target is not None:
+                module.imports.append(target)
+        self.modules[path] = module
+
+    @lru_cache(maxsize=None)
+    def resolve(self, directory: Path, spec: str) -> Optional[Path]:
+        """Local module a specifier refers to, or None for packages."""
+        prefix, target = self.alias
+        if spec.startswith(prefix):
+            base = self.root / target / spec[len(prefix):]
+        elif spec.startswith('.'):
+            base = directory / spec
+        else:
+            return None
+        base = Path(os.path.normpath(base))
+        candidates = [base] if base.suffix in SOURCE_SUFFIXES else []
+        candidates += [base.with_name(base.name + suffix) for suffix in SOURCE_SUFFIXES]
+        candidates += [base / f"index{suffix}" for suffix in SOURCE_SUFFIXES]
+        for candidate in candidates:
+            if candidate.is_file():
+                return candidate
+        return None
+
+    def entries(self) -> Tuple[List[Path], List[Path]]:
+        """(server entries, client entries) of the App Router."""
+        server, client = [], []
+        for path in self.modules:
+            rel = path.relative_to(self.root).as_posix()
+            if not rel.startswith("src/app/"):
+                continue
+            stem = path.name.split('.')[0]
+            if stem in SERVER_ENTRIES:
+                server.append(path)
+            elif stem in CLIENT_ENTRIES:
+                client.append(path)
+        return server, client
+
+    def analyze(self) -> BoundaryReport:
+        server_entries, client_entries = self.entries()
+        boundaries: Set[Path] = set(client_entries)
+        seen: Set[Path] = set()
+        stack = list(server_entries)
+        while stack:
+            path = stack.pop()
+            if path in seen or path not in self.modules:
+                continue
+            seen.add(path)
+            module = self.modules[path]
+            if module.needs_client:
+                # Rendered from server code and needs the client: a boundary.
+                # Whatever it imports is client code already.
+                boundaries.add(path)
+            else:
+                stack.extend(module.imports)
+
+        client_side: Set[Path] = set()
+        stack = [imp for path in boundaries for imp in self.modules[path].imports]
+        while stack:
+            path = stack.pop()
+            if path in client_side or path not in self.modules:
+                continue
+            client_side.add(path)
+            stack.extend(self.modules[path].imports)
+
+        def rel(path: Path) -> str:
+            return path.relative_to(self.root).as_posix()
+
+        reached = seen | client_side | boundaries
+        return BoundaryReport(
+            boundaries=sorted(map(rel, boundaries)),
+            missing=sorted(rel(p) for p in boundaries if not self.modules[p].has_directive),
+            # Directives below a boundary are harmless; only those on modules
+            # that would otherwise be rendered on the server cost bundle size.
+            redundant=sorted(rel(p) for p in seen - boundaries if self.modules[p].has_directive),
+            conflicts=sorted(
+                (rel(p), self.modules[p].client_features, self.modules[p].server_features)
+                for p in boundaries if self.modules[p].server_features
+            ),
+            unreached=sorted(rel(p) for p, m in self.modules.items() if m.needs_client and p not in reached),
+        )
+
+
+def add_directive(content: str) -> str:
+    return "'use client';\n\n" + content
+
+
+def remove_directive(content: str) -> str:
+    match = _DIRECTIVE.match(content)
+    if match is None:
+        return content
+    rest = content[match.end():].lstrip('\n')
+    return content[:match.start(1)] + rest
@@ -0,0 +1,155 @@
+"""
+Deterministic synthetic corpus for benchmarking the codemods.
+
+Generates admin form components, API routes and a schema.prisma whose
+models carry `_lo/_th/_zh/_en` field families, shaped like the real files
+under src/ and prisma/ (interfaces, zod schemas, default values,
+destructuring, <Input> components, labelled input blocks, language tabs).
+"""
+
+import random
+from pathlib import Path
+from typing import Dict, List
+
+LOCALES = ('lo', 'th', 'zh', 'en')
+LOCALE_LABELS = {'lo': 'Lao', 'th': 'Thai', 'zh': 'Chinese', 'en': 'English'}
+LOCALE_FLAGS = {'lo': '🇱🇦', 'th': '🇹🇭', 'zh': '🇨🇳', 'en': '🇬🇧'}
+FIELD_BASES = (
+    'name', 'title', 'description', 'excerpt', 'content', 'metaTitle',
+    'metaDesc', 'benefits', 'howToUse', 'subtitle', 'heroTitle', 'mission',
+)
+PLAIN_FIELDS = ('slug', 'image', 'order', 'isActive', 'isFeatured', 'categoryId')
+
+
+def _pascal(name: str) -> str:
+    return name[:1].upper() + name[1:]
+
+
+def _families(rng: random.Random) -> List[str]:
+    return rng.sample(FIELD_BASES, rng.randint(3, len(FIELD_BASES)))
+
+
+def form_component(rng: random.Random, index: int) -> str:
+    bases = _families(rng)
+    fields = [f'{base}_{loc}' for base in bases for loc in LOCALES]
+    name = f'Entity{index}'
+    out = ["'use client';", '', "import { useState } from 'react';",
+           "import { z } from 'zod';", "import { Input } from '@/components/ui/Input';", '']
+    out.append(f'interface {name}FormData {{')
+    out += [f'  {field}: string;' for field in fields]
+    out += [f'  {plain}: string;' for plain in PLAIN_FIELDS[:3]]
+    out += ['}', '']
+    out.append(f'const {name.lower()}Schema = z.object({{')
+    out += [f"  {field}: z.string().min(1, 'Required'),"
+            if field.endswith('_lo') else f'  {field}: z.string().optional(),' for field in fields]
+    out += ['});', '']
+    out.append('const languageTabs = [')
+    out += [f"  {{ code: '{loc}', label: '{LOCALE_LABELS[loc]}', flag: '{LOCALE_FLAGS[loc]}' }},"
+            for loc in LOCALES]
+    out += ['];', '']
+    out.append(f'export default function {name}Form({{ initialData, onSubmit }}: {name}Props) {{')
+    out.append(f'  const [formData, setFormData] = useState<{name}FormData>({{')
+    out += [f"    {field}: initialData?.{field} || ''," for field in fields]
+    out += ['  });', "  const [activeTab, setActiveTab] = useState('lo');", '']
+    out.append('  const handleSubmit = async (e: React.FormEvent) => {')
+    out.append('    e.preventDefault();')
+    out.append(f'    const {{ {", ".join(fields)} }} = formData;')
+    out.append(f'    await onSubmit({{ {", ".join(fields)} }});')
+    out += ['  };', '', '  return (', '    <form onSubmit={handleSubmit} className="space-y-6">']
+    out.append('      <div className="flex gap-2">')
+    out.append('        {languageTabs.map((tab) => (')
+    out.append('          <button key={tab.code} type="button" onClick={() => setActiveTab(tab.code)}>')
+    out.append('            {tab.flag} {tab.label}')
+    out += ['          </button>', '        ))}', '      </div>']
+    for base in bases:
+        out.append('      <div className="grid grid-cols-2 gap-4">')
+        for loc in LOCALES:
+            field = f'{base}_{loc}'
+            if rng.random() < 0.5:
+                out += [
+                    '        <div>',
+                    f'          <label className="block text-sm font-medium">{LOCALE_LABELS[loc]} {_pascal(base)}</label>',
+                    '          <input',
+                    '            type="text"',
+                    f'            name="{field}"',
+                    f'            value={{formData.{field}}}',
+                    f"            onChange={{(e) => setFormData({{ ...formData, {field}: e.target.value }})}}",
+                    '            className="w-full rounded border px-3 py-2"',
+                    '          />',
+                    '        </div>',
+                ]
+            else:
+                out += [
+                    '        <Input',
+                    f'          label="{_pascal(base)} ({LOCALE_LABELS[loc]})"',
+                    f'          name="{field}"',
+                    f'          value={{formData.{field}}}',
+                    f"          onChange={{(e) => handleChange('{field}', e.target.value)}}",
+                    '        />',
+                ]
+        out.append('      </div>')
+    out += ['      <button type="submit">Save</button>', '    </form>', '  );', '}', '']
+    return '\n'.join(out)
+
+
+def api_route(rng: random.Random, index: int) -> str:
+    bases = _families(rng)
+    fields = [f'{base}_{loc}' for base in bases for loc in LOCALES]
+    model = f'entity{index}'
+    out = ["import { NextRequest, NextResponse } from 'next/server';",
+           "import { prisma } from '@/lib/prisma';", '']
+    out.append('export async function GET(request: NextRequest) {')
+    out.append(f'  const items = await prisma.{model}.findMany({{')
+    out.append("    where: { isActive: true },")
+    out.append("    orderBy: { order: 'asc' },")
+    out += ['  });', '  return NextResponse.json(items.map((item) => ({', '    id: item.id,']
+    out += [f'    {field}: item.{field},' for field in fields]
+    out += ['  })));', '}', '']
+    out.append('export async function POST(request: NextRequest) {')
+    out.append('  const body = await request.json();')
+    out.append(f'  const {{ {", ".join(fields)}, {", ".join(PLAIN_FIELDS)} }} = body;')
+    out.append(f'  const item = await prisma.{model}.create({{')
+    out.append('    data: {')
+    out += [f'      {field},' for field in fields]
+    out += [f'      {plain},' for plain in PLAIN_FIELDS]
+    out += ['    },', '  });', '  return NextResponse.json(item, { status: 201 });', '}', '']
+    return '\n'.join(out)
+
+
+def prisma_schema(rng: random.Random, models: int) -> str:
+    out = ['generator client {', '  provider = "prisma-client-js"', '}', '',
+           'datasource db {', '  provider = "postgresql"', '  url      = env("DATABASE_URL")', '}', '']
+    for index in range(models):
+        out.append(f'model Entity{index} {{')
+        out.append('  id          String   @id @default(cuid())')
+        out.append('  slug        String   @unique')
+        for base in _families(rng):
+            kind = 'Json' if base in ('benefits', 'howToUse') else 'String'
+            for loc in LOCALES:
+                optional = '?' if loc != 'lo' and rng.random() < 0.3 else ''
+                out.append(f'  {base}_{loc:<10} {kind}{optional}')
+        out.append('  order       Int      @default(0)')
+        out.append('  isActive    Boolean  @default(true)')
+        out.append('  createdAt   DateTime @default(now())')
+        out += ['', '  @@index([slug])', '}', '']
+    return '\n'.join(out)
+
+
+def generate(files: int, seed: int = 0) -> Dict[str, str]:
+    """Return {relative path: content} with `files` TS/TSX files plus a schema."""
+    rng = random.Random(seed)
+    corpus = {}
+    for index in range(files):
+        if index % 2 == 0:
+            corpus[f'src/components/admin/forms/Entity{index}Form.tsx'] = form_component(rng, index)
+        else:
+            corpus[f'src/app/api/entity{index}/route.ts'] = api_route(rng, index)
+    corpus['prisma/schema.prisma'] = prisma_schema(rng, max(1, files // 10))
+    return corpus
+
+
+def write(corpus: Dict[str, str], root: Path):
+    for rel, content in corpus.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
@@ -0,0 +1,218 @@
+"""
+Brace-aware removal of locale-suffixed entries from destructuring patterns
+and object shorthands.
+
+The scanner walks the source once with a single token regex, skipping
+strings, template literals and comments, and keeps a stack of open
+brackets. When a `{` group closes it is only inspected if it is a plain
+list of entries (`a`, `a: b`, `a = 1`, `...rest`, `a: { nested }`) and
+actually mentions a target suffix, so JSX expressions, blocks and object
+literals with real values are left alone and nested braces are handled
+naturally.
+"""
+
+import re
+from bisect import bisect_left
+from typing import List, Sequence, Tuple
+
+DEFAULT_SUFFIXES = ('_th', '_zh')
+
+# The first alternative takes a whole bracket group that has no nested
+# brackets, strings, comments or templates in one match.
+_TOKEN = re.compile(
+    r"""[{(\[][^{}()\[\]'"`/]*[}\])]"""
+    r"""|//[^\n]*|/\*.*?\*/|'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|[`{}()\[\],]""",
+    re.DOTALL,
+)
+_COMMA = re.compile(',')
+_TEMPLATE = re.compile(r"\\.|`|\$\{", re.DOTALL)
+
+_IDENT = r'[A-Za-z_$][\w$]*'
+_ENTRY = re.compile(
+    rf'\s*(?:\.\.\.\s*)?(?P<key>{_IDENT})'
+    rf'(?:\s*:\s*(?P<value>{_IDENT}|\x00))?'
+    r'(?:\s*=(?![=>])[^;]*)?\s*'
+)
+_CLOSE = {'}': '{', ')': '(', ']': '['}
+
+
+class _Group:
+    __slots__ = ('char', 'start', 'commas', 'children')
+
+    def __init__(self, char: str, start: int):
+        self.char = char
+        self.start = start
+        self.commas: List[int] = []
+        self.children: List[Tuple[int, int]] = []
+
+
+def is_jsx_container(content: str, start: int) -> bool:
+    """`{` opening a JSX child expression or attribute value."""
+    i = start - 1
+    while i >= 0 and content[i] in ' \t\r\n':
+        i -= 1
+    if i < 0:
+        return False
+    if content[i] in '>}':
+        return True
+    return content[i] == '=' and i == start - 1 and i > 0 and (content[i - 1].isalnum() or content[i - 1] == '_')
+
+
+def _mask(content: str, start: int, end: int, children: Sequence[Tuple[int, int]]) -> str:
+    """Text of [start, end) with each nested bracket group collapsed to NUL."""
+    parts = []
+    pos = start
+    for index in range(bisect_left(children, (start,)), len(children)):
+        child_start, child_end = children[index]
+        if child_start >= end:
+            break
+        parts.append(content[pos:child_start])
+        parts.append('\x00')
+        pos = child_end
+    parts.append(content[pos:end])
+    return ''.join(parts)
+
+
+def _targeted(match, suffixes: Sequence[str]) -> bool:
+    if match.group('key').endswith(suffixes):
+        return True
+    value = match.group('value')
+    return bool(value) and value != '\x00' and value.endswith(suffixes)
+
+
+def _group_edits(content: str, group: _Group, end: int, suffixes: Sequence[str]) -> List[Tuple[int, int, str]]:
+    """Deletion ranges for targeted entries of a closed `{` group ending at `end`."""
+    bounds = [group.start + 1, *(c + 1 for c in group.commas)]
+    stops = [*group.commas, end]
+    segments = list(zip(bounds, stops))
+    trailing_comma = bool(group.commas) and not content[segments[-1][0]:end].strip()
+    if trailing_comma:
+        segments.pop()
+
+    removed = []
+    for seg_start, seg_end in segments:
+        if group.children:
+            match = _ENTRY.fullmatch(_mask(content, seg_start, seg_end, group.children))
+        else:
+            match = _ENTRY.fullmatch(content, seg_start, seg_end)
+        if match is None:
+            return []
+        removed.append(_targeted(match, suffixes))
+    if not any(removed):
+        return []
+    if all(removed):
+        return [(group.start + 1, end, '')]
+
+    edits = []
+    last_kept = max(i for i, gone in enumerate(removed) if not gone)
+    for i, gone in enumerate(removed):
+        if not gone:
+            continue
+        seg_start, seg_end = segments[i]
+        if i < last_kept or trailing_comma:
+            # Entry and its own comma: `a_th, ` -> ``
+            edits.append((seg_start, seg_end + 1, ''))
+        else:
+            # Trailing run without a final comma: remove from the comma
+            # after the last kept entry to the end of the last entry.
+            tail_end = segments[-1][1]
+            while tail_end > seg_start and content[tail_end - 1] in ' \t\r\n':
+                tail_end -= 1
+            edits.append((segments[last_kept][1], tail_end, ''))
+            break
+    return edits
+
+
+def _mentions(hits: Sequence[int], start: int, end: int) -> bool:
+    index = bisect_left(hits, start)
+    return index < len(hits) and hits[index] < end
+
+
+def remove_suffixed_entries(content: str, suffixes: Sequence[str] = DEFAULT_SUFFIXES) -> str:
+    """Remove entries whose key (or shorthand value) ends with one of `suffixes`."""
+    suffixes = tuple(suffixes)
+    hits = [m.start() for m in re.finditer('|'.join(map(re.escape, suffixes)), content)]
+    if not hits:
+        return content
+
+    stack: List[_Group] = []
+    edits: List[Tuple[int, int, str]] = []
+    pos = 0
+    length = len(content)
+    while pos < length:
+        if stack and stack[-1].char == '`':
+            match = _TEMPLATE.search(content, pos)
+            if match is None:
+                break
+            pos = match.end()
+            if match.group() == '`':
+                stack.pop()
+            elif match.group() == '${':
+                stack.append(_Group('${', match.start()))
+            continue
+
+        # finditer runs until a template literal (or its text after `${...}`)
+        # starts; the branch above scans it, then code scanning resumes.
+        for match in _TOKEN.finditer(content, pos):
+            token = match.group()
+            if token == ',':
+                if stack:
+                    stack[-1].commas.append(match.start())
+            elif token in '{([':
+                stack.append(_Group(token, match.start()))
+            elif token[0] in '{([':
+                # Flat group: opened and closed in one token
+                if _CLOSE[token[-1]] != token[0]:
+                    return content
+                start, end = match.span()
+                if stack:
+                    stack[-1].children.append((start, end))
+                if (token[0] == '{'
+                        and _mentions(hits, start, end)
+                        and not is_jsx_container(content, start)):
+                    group = _Group('{', start)
+                    group.commas = [m.start() for m in _COMMA.finditer(content, start, end)]
+                    edits.extend(_group_edits(content, group, end - 1, suffixes))
+            elif token == '`':
+                stack.append(_Group('`', match.start()))
+                pos = match.end()
+                break
+            elif token in _CLOSE:
+                if not stack:
+                    continue
+                group = stack.pop()
+                if token == '}' and group.char == '${':
+                    # Back inside the template literal
+                    pos = match.end()
+                    break
+                if group.char != _CLOSE[token]:
+                    # Unbalanced input: give up rather than guess.
+                    return content
+                end = match.end()
+                if stack:
+                    stack[-1].children.append((group.start, end))
+                if (token == '}'
+                        and _mentions(hits, group.start, end)
+                        and not is_jsx_container(content, group.start)):
+                    edits.extend(_group_edits(content, group, match.start(), suffixes))
+        else:
+            break
+
+    return _apply_edits(content, edits)
+
+
+def _apply_edits(content: str, edits: List[Tuple[int, int, str]]) -> str:
+    if not edits:
+        return content
+    # Inner groups close first; an outer edit that swallows them wins.
+    edits.sort(key=lambda edit: (edit[0], -edit[1]))
+    parts = []
+    pos = 0
+    for start, end, replacement in edits:
+        if start < pos:
+            continue
+        parts.append(content[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(content[pos:])
+    return ''.join(parts)
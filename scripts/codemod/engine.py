@@ -0,0 +1,125 @@
+"""
+Apply the whole rule registry to a file in one read and at most one write.
+"""
+
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from . import budget, prisma_schema
+from .output import read_text, write_if_changed
+from .profile import RuleStat
+from .rules import CLEANUP_RULES, LOCALE_SUFFIXES, RULES, AnyRule, LineRule, TransformRule
+
+SCHEMA_SUFFIX = '.prisma'
+SCHEMA_PATH = 'prisma/schema.prisma'
+
+
+def _drop_lines(content: str, line_rules: Sequence[LineRule]) -> str:
+    """Run a batch of line filters in a single pass over the lines."""
+    kept = [
+        line for line in content.split('\n')
+        if not any(rule.drops(line) for rule in line_rules)
+    ]
+    return '\n'.join(kept)
+
+
+def _apply_one(rule: AnyRule, content: str) -> Tuple[str, int]:
+    """Apply a single rule, returning the new content and its match count."""
+    if isinstance(rule, LineRule):
+        lines = content.split('\n')
+        kept = [line for line in lines if not rule.drops(line)]
+        return '\n'.join(kept), len(lines) - len(kept)
+    if isinstance(rule, TransformRule):
+        new = rule.func(content)
+        return new, int(new != content)
+    return rule.pattern.subn(rule.repl, content)
+
+
+def _apply_profiled(content: str, rules: Sequence[AnyRule], stats: List[RuleStat]) -> str:
+    # Line rules run one at a time here so each gets its own timing; dropping
+    # lines rule by rule gives the same result as the batched pass.
+    for rule in rules:
+        budget.running(rule.name)
+        start = time.perf_counter()
+        new, matches = _apply_one(rule, content)
+        elapsed = time.perf_counter() - start
+        removed = len(content.encode('utf-8')) - len(new.encode('utf-8'))
+        stats.append(RuleStat(rule.name, rule.source, elapsed, matches, removed))
+        content = new
+    return content
+
+
+def apply_rules(content: str, rules: Sequence[AnyRule] = RULES,
+                cleanup: bool = True, stats: Optional[List[RuleStat]] = None) -> str:
+    """Apply `rules` in registry order, then the shared cleanup rules once.
+
+    Consecutive line rules are batched so the lines are only split and
+    joined once per batch. When `stats` is given, every rule is timed and
+    a RuleStat is appended for it instead.
+    """
+    if stats is not None:
+        return _apply_profiled(content, (*rules, *CLEANUP_RULES) if cleanup else rules, stats)
+
+    pending: List[LineRule] = []
+    for rule in rules:
+        if isinstance(rule, LineRule):
+            pending.append(rule)
+            continue
+        if pending:
+            budget.running(*(line_rule.name for line_rule in pending))
+            content = _drop_lines(content, pending)
+            pending = []
+        budget.running(rule.name)
+        if isinstance(rule, TransformRule):
+            content = rule.func(content)
+        else:
+            content = rule.pattern.sub(rule.repl, content)
+    if pending:
+        budget.running(*(line_rule.name for line_rule in pending))
+        content = _drop_lines(content, pending)
+
+    if cleanup:
+        for rule in CLEANUP_RULES:
+            budget.running(rule.name)
+            content = rule.pattern.sub(rule.repl, content)
+    return content
+
+
+def apply_schema_rules(content: str, suffixes: Sequence[str] = LOCALE_SUFFIXES,
+                       types: Sequence[str] = ('String', 'Json')) -> str:
+    """schema.prisma counterpart of apply_rules (what make_lang_optional.py does)."""
+    schema = prisma_schema.parse(content)
+    schema.make_optional(suffixes, types)
+    return schema.render()
+
+
+def rewrite_content(file_path: Path, original: str,
+                    transform: Callable[[str], str] = apply_rules, preserve_mtime: bool = False) -> bool:
+    """Like process_file for content already read (e.g. from git).
+
+    schema.prisma files get apply_schema_rules instead of `transform`.
+    """
+    if file_path.suffix == SCHEMA_SUFFIX:
+        content = apply_schema_rules(original)
+    else:
+        content = transform(original)
+    return write_if_changed(file_path, content, preserve_mtime=preserve_mtime)
+
+
+def process_file(file_path: Path, rules: Sequence[AnyRule] = RULES) -> bool:
+    """Rewrite a single file in place. Returns True if it changed."""
+    original = read_text(file_path)
+    return write_if_changed(file_path, apply_rules(original, rules), original)
+
+
+def profile_file(file_path: Path, rules: Sequence[AnyRule] = RULES) -> Tuple[bool, List[RuleStat]]:
+    """Time one pass of every rule over a file without writing it.
+
+    Returns whether the pass would change the file and a RuleStat for
+    every rule. The output is neither validated nor run to a fixpoint,
+    so it is only measured, never written.
+    """
+    stats: List[RuleStat] = []
+    original = read_text(file_path)
+    return apply_rules(original, rules, stats=stats) != original, stats
@@ -0,0 +1,41 @@
+"""
+Locate the repository and the source files the codemods operate on.
+"""
+
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Union of the directories the original scripts listed by hand.
+DEFAULT_DIRECTORIES = (
+    "src/app",
+    "src/components",
+    "src/hooks",
+)
+
+SOURCE_SUFFIXES = (".ts", ".tsx")
+
+
+def iter_source_files(root: Path, directories: Iterable[str] = DEFAULT_DIRECTORIES) -> Iterator[Path]:
+    """Yield every .ts/.tsx file below the given directories, sorted per directory."""
+    for directory in directories:
+        base = root / directory
+        if not base.exists():
+            print(f"Directory not found: {base}")
+            continue
+        for file_path in sorted(base.rglob("*")):
+            if file_path.suffix in SOURCE_SUFFIXES and file_path.is_file():
+                yield file_path
+
+
+def resolve_files(root: Path, paths: Iterable[str]) -> List[Path]:
+    """Resolve explicit paths (files or directories) relative to `root`."""
+    files: List[Path] = []
+    for rel in paths:
+        path = root / rel
+        if path.is_dir():
+            files.extend(iter_source_files(root, [rel]))
+        else:
+            files.append(path)
+    return files
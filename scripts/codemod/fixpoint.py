@@ -0,0 +1,189 @@
+"""
+Re-apply the rules until the content stops changing.
+
+One round runs every rule in registry order, then the cleanup rules. The
+first round covers the whole file; every later round only rescans windows
+around the spans the previous round edited, because an edit can only
+create new matches next to itself (a removed field line leaves a dangling
+comma before the `}` below it, blank lines pile up where lines were
+dropped, ...). A window is the edited lines widened over any adjacent
+blank lines plus one line on each side, which covers every multi-line
+pattern in the registry.
+
+TransformRules (JSX, destructuring) look at whole elements rather than
+lines, so they rerun over the whole content in later rounds; their cheap
+guards keep that fast when nothing is left for them to do.
+
+Rules that keep undoing each other's edits never settle; if the content
+still changes after `MAX_ROUNDS` editing rounds, `NotConverged` is raised
+and the file is left as it was.
+"""
+
+from typing import List, Sequence, Tuple
+
+from . import budget
+from .rules import CLEANUP_RULES, RULES, AnyRule, LineRule, TransformRule
+
+MAX_ROUNDS = 10
+
+Span = Tuple[int, int]
+
+
+class NotConverged(RuntimeError):
+    """The rules were still editing the content after the last round."""
+
+
+def _sub_edits(rule: AnyRule, text: str) -> Tuple[str, List[Span]]:
+    """Apply a regex or line rule to `text`; also return the edited spans."""
+    edits: List[Span] = []
+    if isinstance(rule, LineRule):
+        kept: List[str] = []
+        size = 0
+        for line in text.split('\n'):
+            if rule.drops(line):
+                edits.append((size, size))
+            else:
+                kept.append(line)
+                size += len(line) + 1
+        new = '\n'.join(kept)
+        return new, [(min(start, len(new)), min(start, len(new))) for start, _ in edits]
+
+    parts: List[str] = []
+    size = 0
+    last = 0
+    for match in rule.pattern.finditer(text):
+        repl = match.expand(rule.repl) if isinstance(rule.repl, str) else rule.repl(match)
+        parts.append(text[last:match.start()])
+        size += match.start() - last
+        parts.append(repl)
+        edits.append((size, size + len(repl)))
+        size += len(repl)
+        last = match.end()
+    if not edits:
+        return text, []
+    parts.append(text[last:])
+    return ''.join(parts), edits
+
+
+def _line_start(content: str, pos: int) -> int:
+    return content.rfind('\n', 0, pos) + 1
+
+
+def _line_end(content: str, pos: int) -> int:
+    end = content.find('\n', pos)
+    return len(content) if end < 0 else end + 1
+
+
+def _window(content: str, start: int, end: int) -> Span:
+    """Widen an edited span to whole lines, adjacent blank lines and one more line."""
+    start = _line_start(content, start)
+    while start > 0:
+        prev = _line_start(content, start - 1)
+        blank = not content[prev:start].strip()
+        start = prev
+        if not blank:
+            break
+    end = _line_end(content, max(end, start))
+    while end < len(content):
+        following = _line_end(content, end)
+        blank = not content[end:following].strip()
+        end = following
+        if not blank:
+            break
+    return start, end
+
+
+def _merge(spans: List[Span]) -> List[Span]:
+    merged: List[Span] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _rebase(spans: List[Span], old: str, new: str) -> Tuple[List[Span], Span]:
+    """Map spans over `old` onto `new` after a whole-content rewrite.
+
+    Returns the mapped spans and the span of `new` that differs from `old`;
+    spans overlapping the change are widened to cover it.
+    """
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    old_end = len(old) - suffix
+    new_end = len(new) - suffix
+    delta = new_end - old_end
+    mapped = []
+    for start, end in spans:
+        if end <= prefix:
+            mapped.append((start, end))
+        elif start >= old_end:
+            mapped.append((start + delta, end + delta))
+        else:
+            mapped.append((min(start, prefix), max(end + delta, new_end)))
+    return mapped, (prefix, new_end)
+
+
+def _run_round(content: str, rules: Sequence[AnyRule], windows: List[Span],
+               whole: bool) -> Tuple[str, List[Span]]:
+    dirty: List[Span] = []
+    for rule in rules:
+        budget.running(rule.name)
+        if isinstance(rule, TransformRule):
+            new = rule.func(content)
+            if new != content:
+                windows, changed = _rebase(windows, content, new)
+                dirty, _ = _rebase(dirty, content, new)
+                dirty.append(changed)
+                windows = _merge(windows + [changed])
+                content = new
+        else:
+            # Walk the windows back to front so an edit only shifts spans
+            # that come after it.
+            for index in range(len(windows) - 1, -1, -1):
+                start, end = windows[index]
+                new_text, edits = _sub_edits(rule, content[start:end])
+                if not edits:
+                    continue
+                delta = len(new_text) - (end - start)
+                content = content[:start] + new_text + content[end:]
+                windows[index] = (start, end + delta)
+                for later in range(index + 1, len(windows)):
+                    s, e = windows[later]
+                    windows[later] = (s + delta, e + delta)
+                dirty = [(s + delta, e + delta) if s >= end else (s, e) for s, e in dirty]
+                dirty.extend((start + s, start + e) for s, e in edits)
+        if whole:
+            windows = [(0, len(content))]
+    return content, dirty
+
+
+def apply_until_stable(content: str, rules: Sequence[AnyRule] = RULES,
+                       cleanup: bool = True, max_rounds: int = MAX_ROUNDS) -> str:
+    """Apply `rules` (and the cleanup rules) until a round changes nothing.
+
+    Raises NotConverged if that takes more than `max_rounds` rounds.
+    """
+    return run_fixpoint(content, rules, cleanup, max_rounds)[0]
+
+
+def run_fixpoint(content: str, rules: Sequence[AnyRule] = RULES, cleanup: bool = True,
+                 max_rounds: int = MAX_ROUNDS) -> Tuple[str, int]:
+    """Like apply_until_stable, also returning how many rounds edited the content."""
+    rules = (*rules, *CLEANUP_RULES) if cleanup else tuple(rules)
+    windows = [(0, len(content))]
+    whole = True
+    # One round past the limit, to confirm that the last allowed edits settled.
+    for round_number in range(max_rounds + 1):
+        content, dirty = _run_round(content, rules, windows, whole)
+        if not dirty:
+            return content, round_number
+        windows = _merge([_window(content, start, end) for start, end in _merge(dirty)])
+        whole = False
+    raise NotConverged(f"rules still editing after {max_rounds} rounds; file left unchanged")
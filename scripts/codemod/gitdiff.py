@@ -0,0 +1,160 @@
+"""
+Limit a run to the files a git diff touches and read them through git.
+
+`changed_files` lists the .ts/.tsx/.prisma files changed since a ref (or
+staged for commit), and `read_changed` streams their contents through one
+long-lived `git cat-file --batch` process instead of opening every path.
+Files whose working-tree copy differs from the object git would hand back
+are read from disk, so local edits are never overwritten with stale
+content.
+"""
+
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .files import SOURCE_SUFFIXES
+
+DIFF_SUFFIXES = SOURCE_SUFFIXES + (".prisma",)
+
+
+@dataclass(frozen=True)
+class ChangedFile:
+    """A changed path and the git object holding its current content.
+
+    `object` is None when the working tree is the only up-to-date copy.
+    """
+
+    path: str
+    object: Optional[str]
+
+
+def git(root: Path, *args: str) -> bytes:
+    result = subprocess.run(["git", *args], cwd=root, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)}: {result.stderr.decode().strip()}")
+    return result.stdout
+
+
+def _names(output: bytes) -> List[str]:
+    return [name.decode("utf-8", "surrogateescape") for name in output.split(b"\0") if name]
+
+
+def changed_files(root: Path, ref: Optional[str] = None, staged: bool = False,
+                  suffixes: Sequence[str] = DIFF_SUFFIXES) -> List[ChangedFile]:
+    """Changed files with one of `suffixes`, deleted files excluded.
+
+    With `staged`, the files staged against `ref` (default HEAD) are
+    returned and read from the index, as a pre-commit hook sees them.
+    Otherwise every file that differs from `ref` in the working tree
+    (committed, staged, unstaged or untracked) is returned and read from
+    HEAD where the working tree still matches it.
+    """
+    if staged:
+        changed = _names(git(root, "diff", "--cached", "--name-only", "-z",
+                             "--diff-filter=ACMR", ref or "HEAD", "--"))
+        dirty = set(_names(git(root, "diff", "--name-only", "-z")))
+        revision = ""
+    else:
+        if ref is None:
+            raise ValueError("A ref is required unless staged=True")
+        untracked = _names(git(root, "ls-files", "--others", "--exclude-standard", "-z"))
+        changed = _names(git(root, "diff", "--name-only", "-z", "--diff-filter=ACMR", ref, "--"))
+        changed += untracked
+        dirty = set(_names(git(root, "diff", "--name-only", "-z", "HEAD", "--"))) | set(untracked)
+        revision = "HEAD"
+
+    files = []
+    for path in sorted(set(changed)):
+        if not path.endswith(tuple(suffixes)):
+            continue
+        # The batch protocol is line based; odd names are read from disk.
+        readable = path not in dirty and "\n" not in path
+        files.append(ChangedFile(path, f"{revision}:{path}" if readable else None))
+    return files
+
+
+class CatFile:
+    """A `git cat-file --batch` process answering object lookups in order."""
+
+    def __init__(self, root: Path):
+        self._proc = subprocess.Popen(["git", "cat-file", "--batch"], cwd=root,
+                                      stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def _read_reply(self, name: str) -> bytes:
+        header = self._proc.stdout.readline()
+        if not header:
+            raise RuntimeError("git cat-file exited unexpectedly")
+        fields = header.split()
+        if len(fields) != 3:
+            raise KeyError(f"{name}: {header.decode().strip()}")
+        size = int(fields[2])
+        data = self._proc.stdout.read(size)
+        self._proc.stdout.read(1)  # trailing LF
+        return data
+
+    def read(self, name: str) -> bytes:
+        self._proc.stdin.write(name.encode("utf-8", "surrogateescape") + b"\n")
+        self._proc.stdin.flush()
+        return self._read_reply(name)
+
+    def read_many(self, names: Sequence[str]) -> Iterator[Tuple[str, bytes]]:
+        """Look up all `names`, writing requests while replies are read.
+
+        A feeder thread keeps the request pipe full so git never waits for
+        us to ask, and neither side blocks on a full pipe buffer. If the
+        replies are not all read (an error, or the caller stopping early),
+        the process is killed so a feeder stuck on the full pipe can exit.
+        """
+        def feed():
+            try:
+                for name in names:
+                    self._proc.stdin.write(name.encode("utf-8", "surrogateescape") + b"\n")
+                self._proc.stdin.flush()
+            except (OSError, ValueError):
+                pass    # the process was killed under us
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        done = False
+        try:
+            for name in names:
+                yield name, self._read_reply(name)
+            done = True
+        finally:
+            if not done:
+                self._proc.kill()
+            feeder.join()
+
+    def close(self):
+        if self._proc.stdin:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass    # killed with requests still buffered
+        self._proc.stdout.close()
+        self._proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_changed(root: Path, files: Iterable[ChangedFile]) -> Iterator[Tuple[Path, bytes]]:
+    """Yield (absolute path, content) for every changed file."""
+    files = list(files)
+    from_git = [f for f in files if f.object is not None]
+    with CatFile(root) as cat:
+        blobs = dict(cat.read_many([f.object for f in from_git]))
+    for f in files:
+        path = root / f.path
+        if f.object is not None:
+            yield path, blobs[f.object]
+        else:
+            with open(path, "rb") as fh:
+                yield path, fh.read()
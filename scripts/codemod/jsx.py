@@ -0,0 +1,262 @@
+"""
+One-pass JSX element index.
+
+`index_elements` scans a TSX source once, parses each tag's attributes and
+pairs open and close tags with a stack, giving every element its full span,
+its inner span and its child elements. Rules can then delete elements by
+tag and attributes without DOTALL regexes that backtrack over the file.
+`element_at` parses a single element the same way, for rules that can
+find their few candidates with a cheap search.
+
+The scanner is deliberately forgiving: anything that looks like `<Name`
+but does not parse as a tag (comparisons, most generics) is skipped, and
+open tags that are never closed are dropped when an enclosing element
+closes.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+_TAG = re.compile(r'<(/?)([A-Za-z][\w.:-]*)?')
+_WS = re.compile(r'\s*')
+# A name, then optionally `=` and a quoted value or the `{` opening one.
+# When the `=` part does not parse, the name matches alone and the `=`
+# left behind makes the tag fail to parse.
+_ATTRIBUTE = re.compile(r'''\s*([A-Za-z_$][\w:.$-]*)\s*(?:=\s*(?:"([^"]*)"|'([^']*)'|(\{)))?''')
+# Braces nested at most one level deep, around plain code and simple strings.
+_SIMPLE_BRACES = re.compile(r'''\{(?:[^{}'"`]|'[^'\\\n]*'|"[^"\\\n]*")*'''
+                            r'''(?:\{(?:[^{}'"`]|'[^'\\\n]*'|"[^"\\\n]*")*\}(?:[^{}'"`]|'[^'\\\n]*'|"[^"\\\n]*")*)*\}''')
+_BRACE_TOKEN = re.compile(r"""[{}]|'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|`(?:[^`\\]|\\.)*`""", re.DOTALL)
+
+
+@dataclass
+class Element:
+    """A JSX element. `end` is None while the element is still open."""
+
+    tag: str
+    start: int
+    open_end: int
+    attrs: Dict[str, Optional[str]]
+    self_closing: bool = False
+    end: Optional[int] = None
+    inner_end: Optional[int] = None
+    parent: Optional["Element"] = None
+    children: List["Element"] = field(default_factory=list)
+
+    @property
+    def inner_start(self) -> int:
+        return self.open_end
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """String value of an attribute; `{...}` values are returned with braces."""
+        return self.attrs.get(name, default)
+
+    def text(self, content: str) -> str:
+        """Raw source between the open and close tags."""
+        if self.self_closing or self.inner_end is None:
+            return ''
+        return content[self.open_end:self.inner_end]
+
+
+def skip_braces(content: str, pos: int) -> int:
+    """Return the index just past the `}` matching the `{` at `pos`, or -1."""
+    simple = _SIMPLE_BRACES.match(content, pos)
+    if simple is not None:
+        return simple.end()
+    depth = 0
+    while True:
+        match = _BRACE_TOKEN.search(content, pos)
+        if match is None:
+            return -1
+        token = match.group()
+        pos = match.end()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def _parse_open_tag(content: str, pos: int):
+    """Parse attributes from `pos` (just after the tag name).
+
+    Returns (attrs, end, self_closing) or None if this is not a tag.
+    """
+    attrs: Dict[str, Optional[str]] = {}
+    length = len(content)
+    while True:
+        # Common case first: one regex for a name and its quoted value.
+        attribute = _ATTRIBUTE.match(content, pos)
+        if attribute is not None:
+            name, value = attribute.group(1), attribute.group(2)
+            if value is None:
+                value = attribute.group(3)
+            if value is None and attribute.group(4) is not None:
+                pos = skip_braces(content, attribute.start(4))
+                if pos < 0:
+                    return None
+                value = content[attribute.start(4):pos]
+            else:
+                pos = attribute.end()
+            attrs[name] = value
+            continue
+        pos = _WS.match(content, pos).end()
+        if pos >= length:
+            return None
+        char = content[pos]
+        if char == '>':
+            return attrs, pos + 1, False
+        if content.startswith('/>', pos):
+            return attrs, pos + 2, True
+        if content.startswith('//', pos) or content.startswith('/*', pos):
+            # Comments between attributes
+            end = content.find('\n' if content[pos + 1] == '/' else '*/', pos + 2)
+            if end < 0:
+                return None
+            pos = end + (1 if content[pos + 1] == '/' else 2)
+            continue
+        if char == '{':
+            # Spread attribute: {...props}
+            pos = skip_braces(content, pos)
+            if pos < 0:
+                return None
+            continue
+        return None
+
+
+def _scan(content: str, pos: int, single: bool) -> List[Element]:
+    """Index elements from `pos`; with `single`, stop once the first one closes."""
+    elements: List[Element] = []
+    stack: List[Element] = []
+    while True:
+        match = _TAG.search(content, pos)
+        if match is None:
+            break
+        closing, tag = match.group(1), match.group(2) or ''
+        if closing:
+            end = content.find('>', match.end())
+            if end < 0 or content[match.end():end].strip():
+                pos = match.end()
+                continue
+            pos = end + 1
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth].tag == tag:
+                    element = stack[depth]
+                    element.inner_end = match.start()
+                    element.end = pos
+                    # Unclosed tags inside (generics, typos) are discarded.
+                    del stack[depth:]
+                    break
+            if single and not stack:
+                break
+            continue
+
+        if not tag:
+            if content.startswith('<>', match.start()):
+                parsed = ({}, match.start() + 2, False)
+            else:
+                pos = match.end()
+                continue
+        else:
+            parsed = _parse_open_tag(content, match.end())
+        if parsed is None:
+            pos = match.end()
+            continue
+        attrs, open_end, self_closing = parsed
+        parent = stack[-1] if stack else None
+        element = Element(tag, match.start(), open_end, attrs, self_closing, parent=parent)
+        if parent is not None:
+            parent.children.append(element)
+        elements.append(element)
+        if self_closing:
+            element.end = open_end
+        else:
+            stack.append(element)
+        pos = open_end
+        if single and not stack:
+            break
+
+    return [element for element in elements if element.end is not None]
+
+
+def index_elements(content: str) -> List[Element]:
+    """Index every closed or self-closing JSX element, in document order."""
+    return _scan(content, 0, single=False)
+
+
+def open_tag(content: str, start: int) -> Optional[Element]:
+    """Parse only the open tag at `start`; `end` stays None unless it self-closes."""
+    match = _TAG.match(content, start)
+    if match is None or match.group(1) or not match.group(2):
+        return None
+    parsed = _parse_open_tag(content, match.end())
+    if parsed is None:
+        return None
+    attrs, open_end, self_closing = parsed
+    return Element(match.group(2), start, open_end, attrs, self_closing,
+                   end=open_end if self_closing else None)
+
+
+def element_at(content: str, start: int) -> Optional[Element]:
+    """The element whose open tag starts at `start`, with its children.
+
+    Only the element's own span is scanned, so rules can parse the few
+    candidates a cheap search finds instead of indexing the whole file.
+    Returns None if there is no tag at `start` or it is never closed.
+    """
+    if not content.startswith('<', start):
+        return None
+    elements = _scan(content, start, single=True)
+    if not elements or elements[0].start != start:
+        return None
+    return elements[0]
+
+
+def line_extent(content: str, start: int, end: int):
+    """Grow [start, end) to whole lines when the span is alone on its lines."""
+    line_start = content.rfind('\n', 0, start) + 1
+    if content[line_start:start].strip():
+        return start, end
+    line_end = content.find('\n', end)
+    if line_end < 0:
+        line_end = len(content)
+    if content[end:line_end].strip():
+        return start, end
+    return line_start, min(line_end + 1, len(content))
+
+
+def remove_elements(content: str, predicate: Callable[[Element, str], bool],
+                    starts: Optional[Iterable[int]] = None) -> str:
+    """Delete every element for which `predicate(element, content)` is true.
+
+    Nested matches are removed with their outermost matching ancestor, and
+    lines left empty by a removal are dropped with it. With `starts` (in
+    increasing order), only the elements opening at those offsets are
+    parsed and tested.
+    """
+    if starts is None:
+        elements = index_elements(content)
+    else:
+        elements = (el for el in (element_at(content, start) for start in starts) if el is not None)
+    spans = []
+    last_end = -1
+    for element in elements:
+        if element.start < last_end:
+            continue
+        if predicate(element, content):
+            spans.append(line_extent(content, element.start, element.end))
+            last_end = element.end
+    if not spans:
+        return content
+
+    parts = []
+    pos = 0
+    for start, end in spans:
+        if start < pos:
+            start = pos
+        parts.append(content[pos:start])
+        pos = end
+    parts.append(content[pos:])
+    return ''.join(parts)
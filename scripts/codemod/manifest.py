@@ -0,0 +1,103 @@
+"""
+Persistent record of files that are already clean under a given rule set.
+
+A file is skipped when its size and mtime match the manifest entry, or, if
+only the stat changed (e.g. after a checkout), when its content hash still
+matches. Either way no rule is evaluated for it.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+MANIFEST_NAME = ".codemod-manifest.json"
+FORMAT_VERSION = 1
+
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class Manifest:
+    """Content-hash manifest keyed by path relative to the repository root."""
+
+    def __init__(self, path: Path, root: Path, rules_version: str):
+        self.path = path
+        self.root = root
+        self.rules_version = rules_version
+        self.entries: Dict[str, dict] = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path, root: Path, rules_version: str) -> "Manifest":
+        manifest = cls(path, root, rules_version)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        if data.get("format") == FORMAT_VERSION and data.get("rules_version") == rules_version:
+            manifest.entries = data.get("files", {})
+        else:
+            # Rule set changed: every file has to be re-checked.
+            manifest.dirty = True
+        return manifest
+
+    def _key(self, file_path: Path) -> str:
+        return file_path.resolve().relative_to(self.root).as_posix()
+
+    def is_clean(self, file_path: Path) -> bool:
+        """True if the file is unchanged since a run that left it clean."""
+        entry = self.entries.get(self._key(file_path))
+        if entry is None:
+            return False
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False
+        if st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        if st.st_size != entry["size"]:
+            return False
+        with open(file_path, 'rb') as f:
+            if file_digest(f.read()) != entry["sha256"]:
+                return False
+        # Same content, new stat (checkout, touch): refresh so the next run is stat-only.
+        self._store(file_path, st, entry["sha256"])
+        return True
+
+    def record(self, file_path: Path, data: Optional[bytes] = None):
+        """Mark a file as clean in its current state."""
+        if data is None:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        self._store(file_path, os.stat(file_path), file_digest(data))
+
+    def forget(self, file_path: Path):
+        if self.entries.pop(self._key(file_path), None) is not None:
+            self.dirty = True
+
+    def _store(self, file_path: Path, st: os.stat_result, digest: str):
+        self.entries[self._key(file_path)] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": digest,
+        }
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {
+            "format": FORMAT_VERSION,
+            "rules_version": self.rules_version,
+            "files": dict(sorted(self.entries.items())),
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+            f.write('\n')
+        os.replace(tmp, self.path)
+        self.dirty = False
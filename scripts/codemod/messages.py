@@ -0,0 +1,194 @@
+"""
+Which next-intl message keys the code uses, and catalogs cut down to them.
+
+`scan` reads a source file once and records every translator it binds
+(`const t = useTranslations('nav')`, `await getTranslations({ namespace:
+'contact' })`, ...) together with the keys passed to it (`t('home')`,
+`t.rich('title')`, ...), resolved against the translator's namespace. A
+binding applies from where it is made until the same name is bound again,
+which matches the one-translator-per-component layout of src/.
+
+Keys that cannot be resolved statically are kept conservatively:
+
+- a template literal keeps everything under its static prefix
+  (t(`nav.${item}`) keeps all of `nav`);
+- any other expression keeps the translator's whole namespace;
+- a call on a translator the file does not bind itself (one passed in as
+  a prop) keeps every key that ends with the literal key.
+
+A key is used if it is named directly or lies below a used key, since
+t.raw('faq.items') returns the whole subtree.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from .files import iter_source_files
+
+DEFAULT_DIRECTORIES = ("src",)
+MESSAGES_DIR = "src/messages"
+
+_BINDING = re.compile(
+    r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:await\s+)?(?:useTranslations|getTranslations)\s*\(\s*'
+    r'''(?:(['"])([^'"]*)\2|\{[^}]*?\bnamespace\s*:\s*(['"])([^'"]*)\4[^}]*\}|)''')
+_CALL = r'(?<![\w$.]){name}(?:\.(?:rich|raw|markup|has))?\(\s*'
+_LITERAL = re.compile(r'''(['"])((?:[^'"\\\n]|\\.)*)\1\s*[,)]|`([^`$]*)(\$\{)?''')
+_UNBOUND_CALL = re.compile(r'(?<![\w$.])t(?:\.(?:rich|raw|markup|has))?\(\s*([\'"])([\w.-]+)\1')
+
+Catalog = Dict[str, object]
+
+
+@dataclass
+class KeyIndex:
+    """Keys the code uses, over all scanned files."""
+
+    keys: Set[str] = field(default_factory=set)          # exact keys (or subtrees)
+    prefixes: Set[str] = field(default_factory=set)      # namespaces kept whole ('' = everything)
+    suffixes: Set[str] = field(default_factory=set)      # keys of unbound translators
+    files: Dict[str, Set[str]] = field(default_factory=dict)   # file -> top-level namespaces
+
+    def uses(self, key: str) -> bool:
+        if any(key == used or key.startswith(used + '.') for used in self.keys):
+            return True
+        if any(not prefix or key == prefix or key.startswith(prefix + '.') for prefix in self.prefixes):
+            return True
+        return any(key == suffix or key.endswith('.' + suffix) for suffix in self.suffixes)
+
+    def add_file(self, rel: str, content: str):
+        keys, prefixes, suffixes = scan(content)
+        self.keys |= keys
+        self.prefixes |= prefixes
+        self.suffixes |= suffixes
+        namespaces = {key.split('.')[0] for key in keys | prefixes if key}
+        if '' in prefixes or suffixes:
+            namespaces.add('*')
+        if namespaces:
+            self.files[rel] = namespaces
+
+
+def _join(namespace: str, key: str) -> str:
+    return f"{namespace}.{key}" if namespace and key else namespace or key
+
+
+def scan(content: str) -> Tuple[Set[str], Set[str], Set[str]]:
+    """(keys, whole prefixes, unbound suffixes) used by one source file."""
+    keys: Set[str] = set()
+    prefixes: Set[str] = set()
+    bindings: Dict[str, List[Tuple[int, str]]] = {}
+    for match in _BINDING.finditer(content):
+        namespace = match.group(3) if match.group(2) else match.group(5) or ''
+        bindings.setdefault(match.group(1), []).append((match.end(), namespace))
+
+    for name, scopes in bindings.items():
+        call = re.compile(_CALL.format(name=re.escape(name)))
+        for match in call.finditer(content):
+            namespace = None
+            for start, candidate in scopes:
+                if start <= match.start():
+                    namespace = candidate
+            if namespace is None:
+                continue
+            literal = _LITERAL.match(content, match.end())
+            if literal is None:
+                prefixes.add(namespace)
+            elif literal.group(1):
+                keys.add(_join(namespace, literal.group(2)))
+            elif literal.group(4):
+                prefixes.add(_join(namespace, literal.group(3).rstrip('.')))
+            else:
+                keys.add(_join(namespace, literal.group(3)))
+
+    suffixes: Set[str] = set()
+    if 't' not in bindings:
+        suffixes = {match.group(2) for match in _UNBOUND_CALL.finditer(content)}
+    return keys, prefixes, suffixes
+
+
+def build_index(root: Path, directories: Sequence[str] = DEFAULT_DIRECTORIES) -> KeyIndex:
+    index = KeyIndex()
+    for file_path in iter_source_files(root, directories):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if 'Translations' in content or re.search(r'(?<![\w$.])t\(', content):
+            index.add_file(file_path.relative_to(root).as_posix(), content)
+    return index
+
+
+# -- catalogs ----------------------------------------------------------------
+
+
+def flatten(catalog: Catalog, prefix: str = '') -> Dict[str, object]:
+    """Dotted key -> message, for every leaf."""
+    flat: Dict[str, object] = {}
+    for key, value in catalog.items():
+        dotted = _join(prefix, key)
+        if isinstance(value, dict):
+            flat.update(flatten(value, dotted))
+        else:
+            flat[dotted] = value
+    return flat
+
+
+def prune(catalog: Catalog, index: KeyIndex, prefix: str = '') -> Catalog:
+    """Copy of `catalog` with only the used keys, in the original order."""
+    pruned: Catalog = {}
+    for key, value in catalog.items():
+        dotted = _join(prefix, key)
+        if index.uses(dotted):
+            pruned[key] = value
+        elif isinstance(value, dict):
+            kept = prune(value, index, dotted)
+            if kept:
+                pruned[key] = kept
+    return pruned
+
+
+def load_catalogs(messages_dir: Path) -> Dict[str, Catalog]:
+    """Locale -> catalog for every <locale>.json in `messages_dir`."""
+    catalogs = {}
+    for path in sorted(messages_dir.glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            catalogs[path.stem] = json.load(f)
+    return catalogs
+
+
+def dumps(catalog: Catalog) -> str:
+    """JSON in the layout of src/messages: two-space indent, UTF-8, no final newline."""
+    return json.dumps(catalog, ensure_ascii=False, indent=2)
+
+
+@dataclass
+class CatalogReport:
+    unused: Dict[str, List[str]]                 # locale -> keys nothing uses
+    missing: Dict[str, List[str]]                # locale -> keys other locales (or the code) have
+    undefined: List[Tuple[str, str]]             # (key, locales lacking it) for literal keys in code
+
+
+def compare(catalogs: Dict[str, Catalog], index: KeyIndex) -> CatalogReport:
+    flat = {locale: flatten(catalog) for locale, catalog in catalogs.items()}
+    every = set().union(*map(set, flat.values())) if flat else set()
+    unused = {locale: [key for key in keys if not index.uses(key)] for locale, keys in flat.items()}
+    missing = {locale: sorted(every - set(keys)) for locale, keys in flat.items()}
+
+    def defined(key: str, keys: Iterable[str]) -> bool:
+        return any(k == key or k.startswith(key + '.') for k in keys)
+
+    undefined = []
+    for key in sorted(index.keys):
+        lacking = [locale for locale, keys in flat.items() if not defined(key, keys)]
+        if lacking:
+            undefined.append((key, ', '.join(lacking)))
+    return CatalogReport(unused, missing, undefined)
+
+
+def split(catalog: Catalog) -> Dict[str, Catalog]:
+    """One catalog per top-level namespace, for loading per route."""
+    return {namespace: {namespace: value} for namespace, value in catalog.items()}
+
+
+def route_namespaces(index: KeyIndex, prefix: str = "src/app/") -> Dict[str, List[str]]:
+    """Namespaces each App Router file uses directly ('*' = cannot tell)."""
+    return {rel: sorted(namespaces) for rel, namespaces in sorted(index.files.items()) if rel.startswith(prefix)}
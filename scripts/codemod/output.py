@@ -0,0 +1,165 @@
+"""
+Where rewritten content goes.
+
+`write_if_changed` compares the new content with the bytes on disk and
+only writes when they differ, so rules that rewrite whitespace into the
+same whitespace (blank-line collapse, comma fix-ups) never touch a file.
+Writes go to a temporary file that replaces the original atomically and
+keeps its permission bits. With `preserve_mtime` the original access and
+modification times are restored afterwards, for build caches that key on
+timestamps; file watchers that rely on mtimes will not see such a change.
+
+Inside a `dry_run()` block nothing is written: every write that would
+happen is streamed out as a unified diff (stdout or a patch file that
+`git apply` accepts) as soon as its file is processed.
+"""
+
+import difflib
+import os
+import sys
+import tempfile
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TextIO, Union
+
+PathLike = Union[str, Path]
+
+
+def read_text(file_path: PathLike) -> str:
+    """Read UTF-8 text without newline translation, so it round-trips byte for byte."""
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def atomic_write(file_path: PathLike, data: bytes, preserve_mtime: bool = False):
+    """Replace (or create) `file_path` with `data` without ever exposing a partial file."""
+    file_path = Path(file_path)
+    st = os.stat(file_path) if file_path.exists() else None
+    fd, tmp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if st is None:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_name, 0o666 & ~umask)
+        else:
+            os.chmod(tmp_name, st.st_mode & 0o7777)
+        if preserve_mtime and st is not None:
+            os.utime(tmp_name, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def write_if_changed(file_path: PathLike, content: str, original: Optional[str] = None,
+                     preserve_mtime: bool = False) -> bool:
+    """Write `content` only if it differs byte for byte from the file.
+
+    `original` is the text the caller read (with read_text); when given,
+    the file is not read again. A file that does not exist yet is created.
+    Returns True if the file was written (or, in a dry run, would have been).
+    """
+    if original is None and os.path.exists(file_path):
+        original = read_text(file_path)
+    if content == original:
+        return False
+    if _dry_run is not None:
+        return _dry_run.emit(file_path, original, content)
+    atomic_write(file_path, content.encode('utf-8'), preserve_mtime)
+    return True
+
+
+# -- dry run -------------------------------------------------------------
+
+
+def unified_diff(label: str, original: Optional[str], content: str) -> Iterator[str]:
+    """Unified diff lines (with newlines) in `git diff` layout, for `git apply`.
+
+    An `original` of None diffs a new file against /dev/null.
+    """
+    a = original.splitlines(keepends=True) if original is not None else []
+    b = content.splitlines(keepends=True)
+    source = f"a/{label}" if original is not None else "/dev/null"
+    for line in difflib.unified_diff(a, b, source, f"b/{label}"):
+        yield line if line.endswith('\n') else line + '\n\\ No newline at end of file\n'
+
+
+def diff_label(file_path: PathLike, root: Optional[Path] = None) -> str:
+    """Path as it appears in diff headers: relative to `root` when inside it."""
+    path = Path(file_path).resolve()
+    if root is not None:
+        try:
+            return path.relative_to(root.resolve()).as_posix()
+        except ValueError:
+            pass
+    return path.as_posix().lstrip('/')
+
+
+def render_diff(file_path: PathLike, original: str, content: str, root: Optional[Path] = None) -> str:
+    """The whole diff as one string, for workers that hand it back to the parent."""
+    return ''.join(unified_diff(diff_label(file_path, root), original, content))
+
+
+class DiffSink:
+    """Receives would-be writes and streams them out as unified diffs."""
+
+    def __init__(self, stream: TextIO, root: Optional[Path] = None):
+        self.stream = stream
+        self.root = root
+        self.files = 0
+
+    def emit(self, file_path: PathLike, original: Optional[str], content: str) -> bool:
+        """Write the diff for one file. Returns True if there was one."""
+        return self.write_lines(unified_diff(diff_label(file_path, self.root), original, content))
+
+    def write_lines(self, lines: Iterable[str]) -> bool:
+        wrote = False
+        for line in lines:
+            self.stream.write(line)
+            wrote = True
+        if wrote:
+            self.files += 1
+            self.stream.flush()
+        return wrote
+
+
+_dry_run: Optional[DiffSink] = None
+
+
+def dry_run_sink() -> Optional[DiffSink]:
+    return _dry_run
+
+
+@contextmanager
+def dry_run(target: Optional[str] = '-', root: Optional[Path] = None):
+    """Within the block, write_if_changed and stream.rewrite_file emit diffs instead.
+
+    `target` is a patch file path, or '-' for stdout; in that case the
+    diffs own stdout and everything else printed in the block goes to
+    stderr, so the output can be piped into `git apply`. With a `target`
+    of None this is a no-op and files are written as usual.
+    """
+    global _dry_run
+    if target is None:
+        yield None
+        return
+    if target == '-':
+        stream, progress = sys.stdout, redirect_stdout(sys.stderr)
+    else:
+        stream, progress = open(target, 'w', encoding='utf-8'), nullcontext()
+    _dry_run = DiffSink(stream, root)
+    try:
+        with progress:
+            yield _dry_run
+    finally:
+        _dry_run = None
+        if stream is not sys.stdout:
+            stream.close()
+
+
+def add_dry_run_argument(parser):
+    parser.add_argument("--dry-run", nargs="?", const="-", metavar="PATCH",
+                        help="Write nothing; stream unified diffs to PATCH (default: stdout)")
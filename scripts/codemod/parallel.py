@@ -0,0 +1,70 @@
+"""
+Spread per-file codemod work across worker processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence
+
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+ERROR = "error"
+
+
+@dataclass(frozen=True)
+class FileResult:
+    """Outcome of running a transform on one file."""
+
+    path: Path
+    status: str
+    error: str = ""
+    detail: Any = None
+
+
+def _run_one(func: Callable[[Path], Any], file_path: Path) -> FileResult:
+    try:
+        outcome = func(file_path)
+    except Exception as e:
+        return FileResult(file_path, ERROR, str(e))
+    detail = None
+    if isinstance(outcome, tuple):
+        outcome, detail = outcome
+    return FileResult(file_path, CHANGED if outcome else UNCHANGED, detail=detail)
+
+
+def effective_jobs(jobs: int) -> int:
+    """Map `--jobs 0` to the CPU count and reject negative values."""
+    if jobs < 0:
+        raise ValueError("--jobs must be >= 0")
+    return jobs or os.cpu_count() or 1
+
+
+def run_files(func: Callable[[Path], bool], files: Sequence[Path], jobs: int = 1) -> Iterator[FileResult]:
+    """Apply `func` to every file and yield results in input order.
+
+    `func` must return True when it changed the file, or a `(changed,
+    detail)` tuple to hand extra data back as `FileResult.detail`. It must
+    be picklable (a module-level function or a functools.partial of one)
+    when `jobs` > 1.
+    """
+    jobs = effective_jobs(jobs)
+    worker = partial(_run_one, func)
+    if jobs == 1 or len(files) < 2:
+        yield from map(worker, files)
+        return
+
+    # Large chunks keep the inter-process overhead small on big trees.
+    chunksize = max(1, len(files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(worker, files, chunksize=chunksize)
+
+
+def summarize(results: Sequence[FileResult]) -> dict:
+    """Count results per status."""
+    counts = {CHANGED: 0, UNCHANGED: 0, ERROR: 0}
+    for result in results:
+        counts[result.status] += 1
+    return counts
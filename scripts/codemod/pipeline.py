@@ -0,0 +1,150 @@
+"""
+Overlap file reads, rule evaluation and write-back.
+
+`run_pipeline` keeps three stages busy at once instead of finishing each
+file before touching the next:
+
+- reads are prefetched by a small thread pool, at most `prefetch` files
+  ahead of the rule stage;
+- the rules run in the calling thread, or in `jobs` worker processes;
+- changed files are handed to a write-back thread pool that writes a
+  temporary file next to the original and moves it into place.
+
+Results come back in input order, so the output is the same as with
+`parallel.run_files`. On slow or network-mounted disks the I/O waits are
+hidden behind rule evaluation.
+
+Given a `DiffSink` as `dry_run`, the write-back pool renders unified
+diffs instead of writing, and they are streamed to the sink in input
+order; at most `prefetch` rendered diffs are held at a time.
+"""
+
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Deque, Iterable, Iterator, Optional, Sequence, Tuple, TypeVar
+
+from .output import DiffSink, atomic_write, render_diff
+from .parallel import CHANGED, ERROR, UNCHANGED, FileResult, effective_jobs
+
+T = TypeVar("T")
+
+DEFAULT_READERS = 4
+DEFAULT_WRITERS = 2
+DEFAULT_PREFETCH = 32
+
+
+def read_bytes(file_path: Path) -> bytes:
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
+def _ahead(submit: Callable[[T], Future], items: Iterable[T], window: int) -> Iterator[Tuple[T, Future]]:
+    """Submit work for up to `window` items ahead of the consumer, in order."""
+    pending: Deque[Tuple[T, Future]] = deque()
+    for item in items:
+        pending.append((item, submit(item)))
+        if len(pending) >= window:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+def _call(future: Future) -> Tuple[Optional[object], str]:
+    try:
+        return future.result(), ""
+    except Exception as e:
+        return None, str(e)
+
+
+def run_pipeline(transform: Callable[[str], str], files: Sequence[Path], jobs: int = 1,
+                 readers: int = DEFAULT_READERS, writers: int = DEFAULT_WRITERS,
+                 prefetch: int = DEFAULT_PREFETCH, preserve_mtime: bool = False,
+                 dry_run: Optional[DiffSink] = None) -> Iterator[FileResult]:
+    """Rewrite every file with `transform(content) -> content`.
+
+    A result is yielded once its file has been written (or found
+    unchanged, or its diff emitted to `dry_run`), in input order. Only
+    files whose bytes change are written. `transform` must be picklable
+    when `jobs` > 1.
+    """
+    jobs = effective_jobs(jobs)
+    window = max(1, prefetch)
+    with ThreadPoolExecutor(readers, thread_name_prefix="codemod-read") as read_pool, \
+            ThreadPoolExecutor(writers, thread_name_prefix="codemod-write") as write_pool, \
+            (ProcessPoolExecutor(jobs) if jobs > 1 else nullcontext()) as cpu_pool:
+        reads = _ahead(lambda path: read_pool.submit(read_bytes, path), files, window)
+        computed = _compute(transform, reads, cpu_pool, jobs)
+        writes: Deque[Tuple[Path, Optional[Future], str]] = deque()
+        for file_path, original, content, error in computed:
+            if error:
+                writes.append((file_path, None, error))
+            elif content == original:
+                writes.append((file_path, None, ""))
+            elif dry_run is not None:
+                diff = write_pool.submit(render_diff, file_path, original, content, dry_run.root)
+                writes.append((file_path, diff, ""))
+            else:
+                data = content.encode('utf-8')
+                writes.append((file_path, write_pool.submit(atomic_write, file_path, data, preserve_mtime), ""))
+            # Hand back finished results without waiting on the writers,
+            # but never let more than `window` writes pile up.
+            while writes and (writes[0][1] is None or writes[0][1].done() or len(writes) > window):
+                yield _finish(*writes.popleft(), dry_run)
+        while writes:
+            yield _finish(*writes.popleft(), dry_run)
+
+
+def _compute(transform: Callable[[str], str], reads: Iterator[Tuple[Path, Future]],
+             cpu_pool: Optional[Executor], jobs: int):
+    """Yield (path, original, new content, error) in input order."""
+    decoded = _decode(reads)
+    if cpu_pool is None:
+        for file_path, original, error in decoded:
+            content = None
+            if not error:
+                try:
+                    content = transform(original)
+                except Exception as e:
+                    error = str(e)
+            yield file_path, original, content, error
+        return
+
+    def submit(item):
+        _, original, error = item
+        if error:
+            future = Future()
+            future.set_exception(RuntimeError(error))
+            return future
+        return cpu_pool.submit(transform, original)
+
+    for (file_path, original, _), future in _ahead(submit, decoded, jobs * 4):
+        content, error = _call(future)
+        yield file_path, original, content, error
+
+
+def _decode(reads: Iterator[Tuple[Path, Future]]):
+    for file_path, future in reads:
+        data, error = _call(future)
+        original = None
+        if not error:
+            try:
+                original = data.decode('utf-8')
+            except UnicodeDecodeError as e:
+                error = str(e)
+        yield file_path, original, error
+
+
+def _finish(file_path: Path, write: Optional[Future], error: str,
+            dry_run: Optional[DiffSink] = None) -> FileResult:
+    if error:
+        return FileResult(file_path, ERROR, error)
+    if write is None:
+        return FileResult(file_path, UNCHANGED)
+    diff, error = _call(write)
+    if error:
+        return FileResult(file_path, ERROR, error)
+    if dry_run is not None:
+        dry_run.write_lines([diff])
+    return FileResult(file_path, CHANGED)
@@ -0,0 +1,118 @@
+"""
+Discovery stage: find the files that mention any target identifier.
+
+The tree is walked once and every file is searched as raw bytes for all
+configured identifiers at the same time, with an Aho-Corasick automaton
+when pyahocorasick is installed and C-level substring search otherwise.
+Rewrite passes then only open the files in the index instead of a
+hand-maintained list or every file in src/. A `skip` predicate (such as
+a manifest's stat check) drops files before they are read.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .files import DEFAULT_DIRECTORIES, SOURCE_SUFFIXES
+
+try:
+    import ahocorasick
+except ImportError:  # optional dependency
+    ahocorasick = None
+
+
+class IdentifierMatcher:
+    """Report which of a fixed set of identifiers occur in a byte string."""
+
+    def __init__(self, identifiers: Iterable[str]):
+        self.identifiers = tuple(dict.fromkeys(identifiers))
+        if not self.identifiers:
+            raise ValueError("At least one identifier is required")
+        self._needles = [ident.encode('utf-8') for ident in self.identifiers]
+        self._automaton = None
+        self._pattern = None
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton(ahocorasick.STORE_INTS)
+            for index, ident in enumerate(self.identifiers):
+                automaton.add_word(ident, index)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def search(self, data: bytes) -> Set[str]:
+        if self._automaton is not None:
+            text = data.decode('utf-8', 'replace')
+            found = set()
+            for _, index in self._automaton.iter(text):
+                found.add(self.identifiers[index])
+                if len(found) == len(self.identifiers):
+                    break
+            return found
+        return {ident for ident, needle in zip(self.identifiers, self._needles) if needle in data}
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """(start, end, identifier) for every whole-identifier occurrence, in order.
+
+        `userName` does not match inside `userNames` or `.x_userName`; with
+        the automaton all identifiers are found in one scan of `text`.
+        """
+        if self._automaton is not None:
+            hits = []
+            for last, index in self._automaton.iter(text):
+                ident = self.identifiers[index]
+                start, end = last + 1 - len(ident), last + 1
+                if not (_is_ident_char(text, start - 1) or _is_ident_char(text, end)):
+                    hits.append((start, end, ident))
+            hits.sort()
+            return iter(hits)
+        if self._pattern is None:
+            names = sorted(self.identifiers, key=lambda ident: (-len(ident), ident))
+            self._pattern = re.compile(r'(?<![\w$])(?:' + '|'.join(map(re.escape, names)) + r')(?![\w$])')
+        return ((m.start(), m.end(), m.group()) for m in self._pattern.finditer(text))
+
+
+def _is_ident_char(text: str, pos: int) -> bool:
+    return 0 <= pos < len(text) and (text[pos].isalnum() or text[pos] in '_$')
+
+
+def _walk(root: Path, directories: Sequence[str], suffixes: Sequence[str]) -> Iterable[Path]:
+    suffixes = tuple(suffixes)
+    for directory in directories:
+        base = root / directory
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(suffixes):
+                    yield Path(dirpath, filename)
+
+
+def build_index(root: Path, identifiers: Iterable[str],
+                directories: Sequence[str] = DEFAULT_DIRECTORIES,
+                suffixes: Sequence[str] = SOURCE_SUFFIXES,
+                skip: Optional[Callable[[Path], bool]] = None) -> Dict[str, List[Path]]:
+    """Map each identifier to the files (in walk order) that contain it.
+
+    Files for which `skip` returns True are left out without being read.
+    """
+    matcher = IdentifierMatcher(identifiers)
+    index: Dict[str, List[Path]] = {ident: [] for ident in matcher.identifiers}
+    for file_path in _walk(root, directories, suffixes):
+        if skip is not None and skip(file_path):
+            continue
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            continue
+        for ident in matcher.search(data):
+            index[ident].append(file_path)
+    return index
+
+
+def matching_files(root: Path, identifiers: Iterable[str],
+                   directories: Sequence[str] = DEFAULT_DIRECTORIES,
+                   suffixes: Sequence[str] = SOURCE_SUFFIXES,
+                   skip: Optional[Callable[[Path], bool]] = None) -> List[Path]:
+    """Sorted list of files containing at least one of `identifiers`."""
+    index = build_index(root, identifiers, directories, suffixes, skip)
+    return sorted({path for paths in index.values() for path in paths})
@@ -0,0 +1,510 @@
+"""
+Check that the indexes in schema.prisma match the queries the app runs.
+
+Every `prisma.<model>.<operation>({ ... })` call under src/ is parsed into
+access patterns: the fields its `where` compares for equality, the fields
+it range-filters, and its `orderBy` fields. Arguments or a `where` given
+as a variable (`const where: any = {}; if (...) where.categoryId = ...`)
+are resolved from the object literal and the assignments before the call;
+fields only assigned later are optional, since each run of the query may
+filter on any subset of them. Relations loaded through `include`/`select`
+(and `_count`) are patterns on the related model, filtered by its foreign
+key.
+
+A pattern is covered by an index whose leading columns are its equality
+fields in any order, followed by its range field or its sort fields, or
+by a unique constraint over a subset of its equality fields. Uncovered
+patterns yield a suggested `@@index`; for a pattern with optional fields
+it is capped to the columns every run of the query shares. Declared
+indexes that no pattern uses (and that do not lead with a foreign key)
+are reported as unused, and an index that is a prefix of another one as
+redundant.
+
+This is a static approximation: spreads, computed keys and filters built
+in other functions are not followed. A call whose arguments cannot be
+resolved marks its model's analysis incomplete, and that model's indexes
+are not reported as unused.
+"""
+
+import re
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .files import iter_source_files
+from .prisma_schema import Index, Model, Schema
+
+DEFAULT_DIRECTORIES = ("src",)
+
+CLIENT_NAMES = ("prisma", "tx")
+OPERATIONS = (
+    "findMany", "findFirst", "findFirstOrThrow", "findUnique", "findUniqueOrThrow",
+    "count", "aggregate", "updateMany", "deleteMany", "update", "delete", "upsert",
+)
+EQUALITY_OPS = frozenset({"equals", "in"})
+RANGE_OPS = frozenset({"gt", "gte", "lt", "lte", "startsWith"})
+
+_CALL = re.compile(rf"\b(?:{'|'.join(CLIENT_NAMES)})\.(\w+)\.({'|'.join(OPERATIONS)})\s*\(")
+_IDENT = re.compile(r'[A-Za-z_$][\w$]*')
+_SKIP = re.compile(r'\s+|//[^\n]*|/\*.*?\*/', re.S)
+
+# -- a small reader for the object literals passed to Prisma ------------------
+
+Node = Union[dict, list, str]   # object literal, array literal, any other expression (raw text)
+
+
+def _skip_space(content: str, pos: int) -> int:
+    while True:
+        match = _SKIP.match(content, pos)
+        if not match or match.end() == pos:
+            return pos
+        pos = match.end()
+
+
+def _skip_string(content: str, pos: int) -> int:
+    """Index just past the string or template literal starting at `pos`."""
+    quote = content[pos]
+    pos += 1
+    while pos < len(content):
+        char = content[pos]
+        if char == '\\':
+            pos += 2
+            continue
+        if char == quote:
+            return pos + 1
+        if quote == '`' and content.startswith('${', pos):
+            pos = skip_expression(content, pos + 2, '}') + 1
+            continue
+        pos += 1
+    return pos
+
+
+def skip_expression(content: str, pos: int, stop: str = ',}])') -> int:
+    """Index of the first top-level character in `stop` from `pos`."""
+    depth = 0
+    while pos < len(content):
+        char = content[pos]
+        if char in '\'"`':
+            pos = _skip_string(content, pos)
+            continue
+        if content.startswith(('//', '/*'), pos):
+            pos = _skip_space(content, pos)
+            continue
+        if depth == 0 and char in stop:
+            return pos
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        pos += 1
+    return pos
+
+
+def parse_value(content: str, pos: int) -> Tuple[Node, int]:
+    """Read one expression at `pos`; literals become dicts and lists."""
+    pos = _skip_space(content, pos)
+    if content.startswith('{', pos):
+        return _parse_object(content, pos + 1)
+    if content.startswith('[', pos):
+        items: List[Node] = []
+        pos += 1
+        while True:
+            pos = _skip_space(content, pos)
+            if pos >= len(content) or content[pos] == ']':
+                return items, pos + 1
+            item, pos = parse_value(content, pos)
+            items.append(item)
+            pos = _skip_space(content, pos)
+            if content.startswith(',', pos):
+                pos += 1
+    end = skip_expression(content, pos)
+    return content[pos:end].strip(), end
+
+
+def _parse_object(content: str, pos: int) -> Tuple[dict, int]:
+    entries: dict = {}
+    while True:
+        pos = _skip_space(content, pos)
+        if pos >= len(content) or content[pos] == '}':
+            return entries, pos + 1
+        key = None
+        if content.startswith('...', pos):
+            pos = skip_expression(content, pos)
+        elif content[pos] in '\'"':
+            end = _skip_string(content, pos)
+            key, pos = content[pos + 1:end - 1], end
+        else:
+            match = _IDENT.match(content, pos)
+            if match:
+                key, pos = match.group(0), match.end()
+            else:
+                pos = skip_expression(content, pos)
+        pos = _skip_space(content, pos)
+        if key is not None:
+            if content.startswith(':', pos):
+                entries[key], pos = parse_value(content, pos + 1)
+            elif content.startswith('(', pos):
+                pos = skip_expression(content, pos)   # method shorthand
+            else:
+                entries[key] = key                     # `{ slug }`
+        pos = _skip_space(content, pos)
+        if content.startswith(',', pos):
+            pos += 1
+        elif pos < len(content) and content[pos] != '}':
+            pos = skip_expression(content, pos)
+
+
+# -- access patterns ---------------------------------------------------------
+
+
+@dataclass
+class AccessPattern:
+    model: str
+    operation: str
+    location: str                                    # path:line of the call
+    equality: Tuple[str, ...] = ()
+    ranges: Tuple[str, ...] = ()
+    sort: Tuple[str, ...] = ()
+    paginated: bool = False
+    via: str = ""                                    # relation it was loaded through
+    optional: Tuple[str, ...] = ()                   # equality fields only some runs filter on
+    complete: bool = True                            # False if the arguments were not resolved
+
+    @property
+    def needs_index(self) -> bool:
+        return bool(self.equality or self.ranges or (self.sort and self.paginated))
+
+    def shapes(self) -> List['AccessPattern']:
+        """The queries a pattern with optional fields runs: none of them, then each alone."""
+        if not self.optional:
+            return [self]
+        required = tuple(name for name in self.equality if name not in self.optional)
+        return [replace(self, equality=required + extra, optional=())
+                for extra in [()] + [(name,) for name in self.optional]]
+
+    def describe(self) -> str:
+        parts = [self.operation if not self.via else f"{self.via} relation"]
+        if not self.complete:
+            parts.append("with unresolved arguments")
+        if self.equality:
+            parts.append(f"where {', '.join(name + '?' * (name in self.optional) for name in self.equality)}")
+        if self.ranges:
+            parts.append(f"range {', '.join(self.ranges)}")
+        if self.sort:
+            parts.append(f"order by {', '.join(self.sort)}")
+        return ' '.join(parts)
+
+
+def client_names(schema: Schema) -> Dict[str, str]:
+    """`prisma.product` accessor -> `Product` model name."""
+    return {name[:1].lower() + name[1:]: name for name in schema.models}
+
+
+def foreign_key(schema: Schema, parent: Model, child: Model) -> Tuple[str, ...]:
+    """Fields of `child` that reference `parent` (empty for implicit m-n relations)."""
+    for fld in child.fields:
+        if fld.type != parent.name:
+            continue
+        for attr in fld.attributes:
+            match = re.search(r'fields:\s*\[([^\]]*)\]', attr)
+            if attr.startswith('@relation') and match:
+                return tuple(name.strip() for name in match.group(1).split(',') if name.strip())
+    return ()
+
+
+def _compound_keys(model: Model) -> Dict[str, Tuple[str, ...]]:
+    """`articleId_tagId`-style where keys for compound ids and unique constraints."""
+    return {'_'.join(index.fields): index.fields for index in model.indexes if len(index.fields) > 1}
+
+
+def _where_alternatives(model: Model, where: Node) -> List[Tuple[List[str], List[str]]]:
+    """(equality fields, range fields) per branch of an OR; one entry without OR."""
+    if not isinstance(where, dict):
+        return [([], [])]
+    equality: List[str] = []
+    ranges: List[str] = []
+    branches: List[Tuple[List[str], List[str]]] = []
+    compound = _compound_keys(model)
+    for key, value in where.items():
+        if key == 'AND':
+            for part in value if isinstance(value, list) else [value]:
+                eq, rng = _where_alternatives(model, part)[0]
+                equality += eq
+                ranges += rng
+        elif key == 'OR' and isinstance(value, list):
+            for part in value:
+                branches.extend(_where_alternatives(model, part))
+        elif key in compound:
+            equality += compound[key]
+        else:
+            fld = model.field(key)
+            if fld is None or not fld.is_scalar or fld.type == 'Json':
+                continue
+            if not isinstance(value, dict):
+                equality.append(key)
+            elif EQUALITY_OPS & value.keys():
+                equality.append(key)
+            elif RANGE_OPS & value.keys():
+                ranges.append(key)
+    if not branches:
+        return [(equality, ranges)]
+    return [(equality + eq, ranges + rng) for eq, rng in branches]
+
+
+def _sort_fields(model: Model, order_by: Node) -> List[str]:
+    fields: List[str] = []
+    for part in order_by if isinstance(order_by, list) else [order_by]:
+        if not isinstance(part, dict):
+            continue
+        for key, value in part.items():
+            fld = model.field(key)
+            if fld is not None and fld.is_scalar and (isinstance(value, str) or 'sort' in value):
+                fields.append(key)
+    return fields
+
+
+def _object_literals(content: str, pos: int, end: int) -> Iterable[dict]:
+    """Object literals at the top level of the expression in content[pos:end]."""
+    while pos < end:
+        char = content[pos]
+        if char in '\'"`':
+            pos = _skip_string(content, pos)
+        elif char == '{':
+            value, pos = parse_value(content, pos)
+            yield value
+        elif char in '([':
+            pos = skip_expression(content, pos + 1, ')]') + 1
+        else:
+            pos += 1
+
+
+def _resolve_variable(content: str, name: str, call: int) -> Tuple[Node, Tuple[str, ...]]:
+    """Rebuild an object built up in a variable before the call.
+
+    Returns the object and the keys only assigned after its declaration.
+    A conditional declaration becomes an OR over its object literals, so
+    every shape of the query is checked. Unresolved, the name comes back.
+    """
+    declarations = list(re.finditer(rf'\b(?:const|let|var)\s+{re.escape(name)}\b[^=;]*=\s*', content[:call]))
+    if not declarations:
+        return name, ()
+    declaration = declarations[-1]
+    value, end = parse_value(content, declaration.end())
+    if not isinstance(value, dict):
+        # `cond ? { a } : {}`: each literal is one shape of the query.
+        shapes = list(_object_literals(content, declaration.end(), end))
+        if not shapes:
+            return name, ()
+        value = shapes[0] if len(shapes) == 1 else {'OR': shapes}
+    assigned: List[str] = []
+    assignment = re.compile(rf'\b{re.escape(name)}(?:\.(\w+)|\[[\'"](\w+)[\'"]\])\s*=(?![=>])')
+    for match in assignment.finditer(content, end, call):
+        key = match.group(1) or match.group(2)
+        if key not in value:
+            assigned.append(key)
+        value[key], _ = parse_value(content, match.end())
+    return value, tuple(assigned)
+
+
+def _patterns(schema: Schema, model: Model, args: dict, base: AccessPattern) -> List[AccessPattern]:
+    patterns = []
+    sort = tuple(_sort_fields(model, args.get('orderBy', [])))
+    paginated = 'take' in args or 'cursor' in args
+    for equality, ranges in _where_alternatives(model, args.get('where')):
+        equality = list(base.equality) + [name for name in equality if name not in base.equality]
+        equality = tuple(dict.fromkeys(equality))
+        patterns.append(AccessPattern(model.name, base.operation, base.location,
+                                      equality, tuple(dict.fromkeys(ranges)), sort, paginated, base.via,
+                                      tuple(name for name in equality if name in base.optional),
+                                      base.complete))
+    for key in ('include', 'select'):
+        nested = args.get(key)
+        if isinstance(nested, dict):
+            patterns += _relation_patterns(schema, model, nested, base)
+    return patterns
+
+
+def _relation_patterns(schema: Schema, model: Model, selection: dict, base: AccessPattern) -> List[AccessPattern]:
+    patterns = []
+    for key, value in selection.items():
+        if key == '_count':
+            if isinstance(value, dict) and isinstance(value.get('select'), dict):
+                patterns += _relation_patterns(schema, model, value['select'], base)
+            continue
+        fld = model.field(key)
+        child = schema.models.get(fld.type) if fld is not None else None
+        if child is None or not fld.is_list:
+            continue
+        fk = foreign_key(schema, model, child)
+        if not fk:
+            continue
+        via = f"{model.name}.{key}"
+        nested = AccessPattern(child.name, base.operation, base.location, fk, via=via)
+        patterns += _patterns(schema, child, value if isinstance(value, dict) else {}, nested)
+    return patterns
+
+
+def extract_patterns(content: str, rel: str, schema: Schema) -> List[AccessPattern]:
+    """Every access pattern of the Prisma calls in one source file."""
+    names = client_names(schema)
+    patterns: List[AccessPattern] = []
+    for match in _CALL.finditer(content):
+        model = schema.models.get(names.get(match.group(1), ''))
+        if model is None:
+            continue
+        args, _ = parse_value(content, match.end())
+        if isinstance(args, str) and _IDENT.fullmatch(args):
+            args, _ = _resolve_variable(content, args, match.start())
+        line = content.count('\n', 0, match.start()) + 1
+        base = AccessPattern(model.name, match.group(2), f"{rel}:{line}")
+        if not isinstance(args, dict):
+            if args:
+                patterns.append(replace(base, complete=False))
+            continue
+        where = args.get('where')
+        if isinstance(where, str) and _IDENT.fullmatch(where):
+            args['where'], base.optional = _resolve_variable(content, where, match.start())
+        base.complete = 'where' not in args or isinstance(args['where'], dict)
+        patterns += _patterns(schema, model, args, base)
+    return patterns
+
+
+# -- coverage ----------------------------------------------------------------
+
+
+def covers(index: Index, pattern: AccessPattern) -> bool:
+    """Can `index` serve `pattern`'s filter and order without a scan or sort?"""
+    if pattern.optional:
+        pattern = pattern.shapes()[0]
+    if index.is_unique and index.fields and set(index.fields) <= set(pattern.equality):
+        return True
+    columns = list(index.fields)
+    equality = set(pattern.equality)
+    while columns and columns[0] in equality:
+        equality.discard(columns.pop(0))
+    if equality:
+        return False
+    if pattern.ranges:
+        return len(pattern.ranges) == 1 and columns[:1] == list(pattern.ranges)
+    return columns[:len(pattern.sort)] == list(pattern.sort)
+
+
+def uses(index: Index, pattern: AccessPattern) -> bool:
+    """Does `pattern` benefit from `index` at all (leading column)?"""
+    lead = index.fields[0] if index.fields else None
+    if pattern.equality or pattern.ranges:
+        return lead in pattern.equality or lead in pattern.ranges
+    return bool(pattern.sort) and lead == pattern.sort[0]
+
+
+def suggest(model: Model, pattern: AccessPattern) -> Tuple[str, ...]:
+    """Columns of an index covering `pattern`: equality (booleans last), then range or sort.
+
+    With optional fields, only the leading columns all of its shapes share.
+    """
+    if pattern.optional:
+        shared: Optional[Tuple[str, ...]] = None
+        for shape in pattern.shapes():
+            columns = suggest(model, shape)
+            if shared is None:
+                shared = columns
+            else:
+                length = 0
+                while length < min(len(shared), len(columns)) and shared[length] == columns[length]:
+                    length += 1
+                shared = shared[:length]
+        return shared or ()
+
+    def low_cardinality(name: str) -> bool:
+        fld = model.field(name)
+        return fld is not None and fld.type == 'Boolean'
+
+    equality = sorted(pattern.equality, key=low_cardinality)
+    tail = pattern.ranges[:1] if pattern.ranges else pattern.sort
+    return tuple(dict.fromkeys((*equality, *tail)))
+
+
+@dataclass
+class IndexReport:
+    patterns: List[AccessPattern]
+    missing: Dict[str, Dict[Tuple[str, ...], List[AccessPattern]]] = field(default_factory=dict)
+    unused: List[Tuple[str, Index]] = field(default_factory=list)
+    redundant: List[Tuple[str, Index, Index]] = field(default_factory=list)   # (model, index, covered by)
+    incomplete: Dict[str, List[AccessPattern]] = field(default_factory=dict)  # unresolved calls per model
+
+
+def _foreign_key_fields(model: Model) -> set:
+    return {
+        name.strip()
+        for fld in model.fields for attr in fld.attributes if attr.startswith('@relation')
+        for match in re.finditer(r'fields:\s*\[([^\]]*)\]', attr) for name in match.group(1).split(',')
+    }
+
+
+def _drop_prefixes(suggestions: Iterable[Tuple[str, ...]]) -> List[Tuple[str, ...]]:
+    """Drop suggestions that are a leading prefix of another suggestion."""
+    suggestions = sorted(set(suggestions), key=len, reverse=True)
+    kept: List[Tuple[str, ...]] = []
+    for columns in suggestions:
+        if not any(other[:len(columns)] == columns for other in kept):
+            kept.append(columns)
+    return kept
+
+
+def check(schema: Schema, patterns: Sequence[AccessPattern]) -> IndexReport:
+    report = IndexReport(list(patterns))
+    by_model: Dict[str, List[AccessPattern]] = {}
+    for pattern in patterns:
+        by_model.setdefault(pattern.model, []).append(pattern)
+
+    for name, model in schema.models.items():
+        indexes = model.indexes
+        model_patterns = by_model.get(name, [])
+        wanted: Dict[Tuple[str, ...], List[AccessPattern]] = {}
+        for pattern in model_patterns:
+            if not pattern.complete:
+                report.incomplete.setdefault(name, []).append(pattern)
+            if not pattern.needs_index or any(covers(index, pattern) for index in indexes):
+                continue
+            columns = suggest(model, pattern)
+            if columns and not any(index.fields[:len(columns)] == columns for index in indexes):
+                wanted.setdefault(columns, []).append(pattern)
+        kept = _drop_prefixes(wanted)
+        if kept:
+            report.missing[name] = {
+                columns: [p for other, ps in wanted.items() if columns[:len(other)] == other for p in ps]
+                for columns in sorted(kept)
+            }
+
+        foreign_keys = _foreign_key_fields(model)
+        unused_known = name not in report.incomplete
+        for index in indexes:
+            if index.is_unique:
+                continue
+            wider = next((other for other in indexes if other is not index and other.fields[:len(index.fields)] == index.fields
+                          and (len(other.fields) > len(index.fields) or other.is_unique)), None)
+            if wider is not None:
+                report.redundant.append((name, index, wider))
+            elif unused_known and index.fields[0] not in foreign_keys \
+                    and not any(uses(index, p) for p in model_patterns):
+                report.unused.append((name, index))
+    return report
+
+
+def analyze(root: Path, schema: Schema, directories: Sequence[str] = DEFAULT_DIRECTORIES) -> IndexReport:
+    patterns: List[AccessPattern] = []
+    for file_path in iter_source_files(root, directories):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if any(f"{name}." in content for name in CLIENT_NAMES):
+            patterns += extract_patterns(content, file_path.relative_to(root).as_posix(), schema)
+    return check(schema, patterns)
+
+
+def apply_suggestions(schema: Schema, report: IndexReport) -> int:
+    """Add the suggested `@@index` lines to the schema. Returns how many were added."""
+    added = 0
+    for name, suggestions in report.missing.items():
+        for columns in suggestions:
+            added += schema.models[name].add_index(columns)
+    return added
@@ -0,0 +1,370 @@
+"""
+In-memory model of a schema.prisma file.
+
+`parse` reads the schema once into models, fields (name, type, list and
+optional modifiers, attributes, trailing comment) and block attributes,
+with a name index over all fields. Batch operations work on that model
+across every model at once, and `Schema.render` prints it back: fields an
+operation changed or added are laid out in `prisma format` columns (names,
+types and attributes aligned per model), while every field left alone
+keeps its source line, so an edit only shows up in the lines it touched.
+Everything the model does not interpret (generator, datasource and enum
+blocks, comments, blank lines) is kept verbatim.
+
+`Model.indexes` lists the indexes and unique constraints a model declares,
+and `Model.add_index` appends an `@@index` after its block attributes.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+_BLOCK_START = re.compile(r'^(model|view|type)\s+(\w+)\s*\{\s*$')
+_FIELD = re.compile(r'^\s*(\w+)\s+(\w+(?:\("[^"]*"\))?)(\[\])?(\?)?(?=\s|$)')
+_BLOCK_ATTR = re.compile(r'^\s*@@')
+_FIELD_LIST = re.compile(r'(fields:\s*)?\[([^\]]*)\]')
+_INDEX_ATTR = re.compile(r'^\s*@@(index|unique|id)\b')
+
+SCALAR_TYPES = frozenset({
+    'String', 'Boolean', 'Int', 'BigInt', 'Float', 'Decimal', 'DateTime', 'Json', 'Bytes',
+})
+
+
+def _split_attributes(rest: str) -> Tuple[List[str], str]:
+    """Split `@a @b(...) // comment` into (['@a', '@b(...)'], '// comment')."""
+    attrs: List[str] = []
+    pos = 0
+    length = len(rest)
+    while pos < length:
+        while pos < length and rest[pos].isspace():
+            pos += 1
+        if pos >= length:
+            break
+        if rest.startswith('//', pos):
+            return attrs, rest[pos:].rstrip()
+        if rest[pos] != '@':
+            raise ValueError(f"Unexpected field syntax: {rest!r}")
+        start = pos
+        pos += 1
+        while pos < length and (rest[pos].isalnum() or rest[pos] in '_.'):
+            pos += 1
+        if pos < length and rest[pos] == '(':
+            depth = 0
+            while pos < length:
+                char = rest[pos]
+                if char == '"':
+                    pos = rest.index('"', pos + 1)
+                elif char == '(':
+                    depth += 1
+                elif char == ')':
+                    depth -= 1
+                    if depth == 0:
+                        pos += 1
+                        break
+                pos += 1
+        attrs.append(rest[start:pos])
+    return attrs, ''
+
+
+@dataclass
+class Field:
+    name: str
+    type: str
+    is_list: bool = False
+    optional: bool = False
+    attributes: List[str] = field(default_factory=list)
+    comment: str = ''
+    # The parsed line and the state it was parsed into; kept while they agree.
+    source: Optional[Tuple[str, tuple]] = field(default=None, repr=False, compare=False)
+
+    def _state(self) -> tuple:
+        return (self.name, self.type, self.is_list, self.optional, tuple(self.attributes), self.comment)
+
+    def remember_source(self, line: str):
+        self.source = (line, self._state())
+
+    @property
+    def edited(self) -> bool:
+        return self.source is None or self.source[1] != self._state()
+
+    @property
+    def type_text(self) -> str:
+        return self.type + ('[]' if self.is_list else '') + ('?' if self.optional else '')
+
+    @property
+    def is_scalar(self) -> bool:
+        return self.type in SCALAR_TYPES
+
+    def has_suffix(self, suffixes: Sequence[str]) -> bool:
+        return self.name.endswith(tuple(suffixes))
+
+
+@dataclass(frozen=True)
+class Index:
+    """An index the schema declares: `@@index`, `@@unique`, `@@id`, `@unique` or `@id`."""
+
+    kind: str                 # 'index', 'unique' or 'id'
+    fields: Tuple[str, ...]
+    text: str                 # the attribute as written, for reports
+
+    @property
+    def is_unique(self) -> bool:
+        return self.kind != 'index'
+
+
+@dataclass
+class Model:
+    """A model block. `items` keeps Fields and raw lines in source order."""
+
+    keyword: str
+    name: str
+    items: List[Union[Field, str]] = field(default_factory=list)
+    # Opening and closing lines as written; rendered fresh when empty.
+    header: str = field(default='', repr=False, compare=False)
+    footer: str = field(default='', repr=False, compare=False)
+
+    @property
+    def fields(self) -> List[Field]:
+        return [item for item in self.items if isinstance(item, Field)]
+
+    def field(self, name: str) -> Optional[Field]:
+        for item in self.items:
+            if isinstance(item, Field) and item.name == name:
+                return item
+        return None
+
+    @property
+    def block_attributes(self) -> List[str]:
+        return [item.strip() for item in self.items if isinstance(item, str) and _BLOCK_ATTR.match(item)]
+
+    @property
+    def indexes(self) -> List[Index]:
+        """Field-level unique constraints first, then block attributes in source order."""
+        indexes = []
+        for fld in self.fields:
+            for attr in fld.attributes:
+                name = attr.split('(')[0]
+                if name in ('@id', '@unique'):
+                    indexes.append(Index(name[1:], (fld.name,), f"{fld.name} {name}"))
+        for attr in self.block_attributes:
+            kind = _INDEX_ATTR.match(attr)
+            names = _FIELD_LIST.search(attr)
+            if kind and names:
+                indexes.append(Index(kind.group(1), tuple(_list_names(names.group(2))), attr))
+        return indexes
+
+    def add_index(self, fields: Sequence[str]) -> bool:
+        """Append `@@index([fields])` after the other block attributes.
+
+        Returns False if an identical index is declared already.
+        """
+        fields = tuple(fields)
+        if any(index.kind == 'index' and index.fields == fields for index in self.indexes):
+            return False
+        line = f"  @@index([{', '.join(fields)}])"
+        last = max((i for i, item in enumerate(self.items)
+                    if isinstance(item, str) and _BLOCK_ATTR.match(item)), default=None)
+        if last is not None:
+            self.items.insert(last + 1, line)
+            return True
+        while self.items and isinstance(self.items[-1], str) and not self.items[-1].strip():
+            self.items.pop()
+        self.items.extend(['', line])
+        return True
+
+    def render(self) -> List[str]:
+        """Unedited fields keep their source line; edited ones get aligned columns."""
+        fields = self.fields
+        name_width = max((len(f.name) for f in fields), default=0)
+        type_width = max((len(f.type_text) for f in fields), default=0)
+        lines = [self.header or f'{self.keyword} {self.name} {{']
+        for item in self.items:
+            if isinstance(item, str):
+                lines.append(item)
+                continue
+            if not item.edited:
+                lines.append(item.source[0])
+                continue
+            tail = ' '.join(item.attributes + ([item.comment] if item.comment else []))
+            if tail:
+                lines.append(f'  {item.name:<{name_width}} {item.type_text:<{type_width}} {tail}')
+            else:
+                lines.append(f'  {item.name:<{name_width}} {item.type_text}')
+        lines.append(self.footer or '}')
+        return lines
+
+
+class Schema:
+    """Parsed schema: verbatim chunks interleaved with Model blocks."""
+
+    def __init__(self, parts: List[Union[Model, str]]):
+        self.parts = parts
+        self.models: Dict[str, Model] = {part.name: part for part in parts if isinstance(part, Model)}
+        self._reindex()
+
+    def _reindex(self):
+        self.field_index: Dict[str, List[Tuple[Model, Field]]] = {}
+        for model in self.models.values():
+            for fld in model.fields:
+                self.field_index.setdefault(fld.name, []).append((model, fld))
+
+    def fields_with_suffix(self, suffixes: Iterable[str]) -> List[Tuple[Model, Field]]:
+        """Every (model, field) whose field name ends with one of `suffixes`."""
+        suffixes = tuple(suffixes)
+        return [
+            entry
+            for name, entries in self.field_index.items() if name.endswith(suffixes)
+            for entry in entries
+        ]
+
+    def make_optional(self, suffixes: Iterable[str], types: Optional[Iterable[str]] = None) -> int:
+        """Add `?` to matching scalar fields. Returns how many changed."""
+        types = set(types) if types is not None else None
+        changed = 0
+        for _, fld in self.fields_with_suffix(suffixes):
+            if fld.optional or fld.is_list or not fld.is_scalar:
+                continue
+            if types is not None and fld.type not in types:
+                continue
+            fld.optional = True
+            changed += 1
+        return changed
+
+    def drop(self, suffixes: Iterable[str]) -> int:
+        """Remove matching fields and the @@ attributes that reference them.
+
+        Like dropping a column in the database, an index or unique
+        constraint that covers a dropped field goes with it.
+        """
+        targets = self.fields_with_suffix(suffixes)
+        dropped: Dict[str, set] = {}
+        for model, fld in targets:
+            dropped.setdefault(model.name, set()).add(fld.name)
+        for model_name, names in dropped.items():
+            for fld in self.models[model_name].fields:
+                used = names & {
+                    name for attr in fld.attributes for match in _FIELD_LIST.finditer(attr)
+                    if match.group(1) for name in _list_names(match.group(2))
+                }
+                if used and fld.name not in names:
+                    raise ValueError(f"{model_name}.{fld.name} is a relation over {', '.join(sorted(used))}")
+        for model, fld in targets:
+            model.items.remove(fld)
+        for model_name, names in dropped.items():
+            model = self.models[model_name]
+            items: List[Union[Field, str]] = []
+            for item in model.items:
+                if isinstance(item, str):
+                    if _BLOCK_ATTR.match(item) and names & _referenced_fields(item):
+                        continue
+                    # Don't leave runs of blank lines where fields used to be.
+                    if not item.strip() and (not items or (isinstance(items[-1], str) and not items[-1].strip())):
+                        continue
+                items.append(item)
+            model.items = items
+        self._reindex()
+        return len(targets)
+
+    def rename_suffix(self, old_suffix: str, new_suffix: str) -> int:
+        """Rename `*{old_suffix}` fields to `*{new_suffix}`, updating references.
+
+        Scalar fields keep their database column through `@map("<old name>")`
+        (unless they are already mapped), so the rename needs no migration.
+        """
+        targets = self.fields_with_suffix([old_suffix])
+        renames: Dict[str, Dict[str, str]] = {}
+        for model, fld in targets:
+            new_name = fld.name[:-len(old_suffix)] + new_suffix
+            if model.field(new_name) is not None:
+                raise ValueError(f"{model.name}.{new_name} already exists")
+            renames.setdefault(model.name, {})[fld.name] = new_name
+            if fld.type not in self.models and not any(attr.startswith('@map(') for attr in fld.attributes):
+                fld.attributes.append(f'@map("{fld.name}")')
+            fld.name = new_name
+        for model_name, mapping in renames.items():
+            model = self.models[model_name]
+            for index, item in enumerate(model.items):
+                if isinstance(item, str):
+                    if _BLOCK_ATTR.match(item):
+                        model.items[index] = _rename_field_refs(item, mapping)
+                else:
+                    # Only `fields: [...]`; `references: [...]` name the other model's fields.
+                    item.attributes = [_rename_field_refs(attr, mapping, relation=True) for attr in item.attributes]
+        self._reindex()
+        return len(targets)
+
+    def render(self) -> str:
+        out: List[str] = []
+        for part in self.parts:
+            if isinstance(part, Model):
+                out.extend(part.render())
+            else:
+                out.append(part)
+        return '\n'.join(out)
+
+
+def _list_names(raw_list: str) -> List[str]:
+    """Field names in a `[a, b(sort: Desc)]` list body."""
+    return [raw.split('(')[0].strip() for raw in raw_list.split(',') if raw.strip()]
+
+
+def _referenced_fields(text: str) -> set:
+    return {name for match in _FIELD_LIST.finditer(text) for name in _list_names(match.group(2))}
+
+
+def _rename_field_refs(text: str, mapping: Dict[str, str], relation: bool = False) -> str:
+    """Rename field names inside `[...]` lists (`fields: [...]` only if `relation`)."""
+    def replace(match):
+        if relation and not match.group(1):
+            return match.group(0)
+        names = []
+        for raw in match.group(2).split(','):
+            raw = raw.strip()
+            if not raw:
+                continue
+            base = raw.split('(')[0].strip()
+            if base in mapping:
+                raw = mapping[base] + raw[len(base):]
+            names.append(raw)
+        return f"{match.group(1) or ''}[{', '.join(names)}]"
+
+    if '[' not in text:
+        return text
+    return _FIELD_LIST.sub(replace, text)
+
+
+def parse(content: str) -> Schema:
+    parts: List[Union[Model, str]] = []
+    model: Optional[Model] = None
+    for line in content.split('\n'):
+        if model is None:
+            start = _BLOCK_START.match(line)
+            if start:
+                model = Model(start.group(1), start.group(2), header=line)
+                parts.append(model)
+            else:
+                parts.append(line)
+            continue
+        if line.strip() == '}':
+            model.footer = line
+            model = None
+            continue
+        match = _FIELD.match(line)
+        stripped = line.strip()
+        if match is None or stripped.startswith(('//', '@@')):
+            model.items.append(line)
+            continue
+        attributes, comment = _split_attributes(line[match.end():])
+        fld = Field(
+            name=match.group(1),
+            type=match.group(2),
+            is_list=bool(match.group(3)),
+            optional=bool(match.group(4)),
+            attributes=attributes,
+            comment=comment,
+        )
+        fld.remember_source(line)
+        model.items.append(fld)
+    if model is not None:
+        raise ValueError(f"Unterminated block: {model.keyword} {model.name}")
+    return Schema(parts)
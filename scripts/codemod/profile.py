@@ -0,0 +1,80 @@
+"""
+Per-rule, per-file timing and match counts for the codemod engine.
+
+Regex rules report their substitution count, line rules the number of
+lines they dropped and transform rules 1 for every file they changed.
+Bytes removed are measured on the UTF-8 encoding, outside the timed
+section.
+"""
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+
+@dataclass(frozen=True)
+class RuleStat:
+    rule: str
+    source: str
+    seconds: float
+    matches: int
+    bytes_removed: int
+
+
+class RuleProfile:
+    """Collects RuleStat lists per file and aggregates them per rule."""
+
+    def __init__(self):
+        self.files: Dict[str, List[RuleStat]] = {}
+
+    def add(self, file_key: str, stats: Sequence[RuleStat]):
+        self.files[file_key] = list(stats)
+
+    def totals(self) -> List[dict]:
+        """One row per rule, sorted by total time (slowest first)."""
+        rows: Dict[tuple, dict] = {}
+        for stats in self.files.values():
+            for stat in stats:
+                row = rows.setdefault((stat.source, stat.rule), {
+                    'rule': stat.rule,
+                    'source': stat.source,
+                    'seconds': 0.0,
+                    'matches': 0,
+                    'bytes_removed': 0,
+                    'files_matched': 0,
+                })
+                row['seconds'] += stat.seconds
+                row['matches'] += stat.matches
+                row['bytes_removed'] += stat.bytes_removed
+                row['files_matched'] += stat.matches > 0
+        return sorted(rows.values(), key=lambda row: row['seconds'], reverse=True)
+
+    def report(self, rules_version: str) -> dict:
+        return {
+            'rules_version': rules_version,
+            'files': len(self.files),
+            'rules': self.totals(),
+            'per_file': {
+                key: [asdict(stat) for stat in stats]
+                for key, stats in sorted(self.files.items())
+            },
+        }
+
+    def write(self, path: Path, rules_version: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(rules_version), f, indent=2)
+            f.write('\n')
+
+    def format_top(self, n: int = 10) -> str:
+        """Hot-rule table: the `n` rules that used the most time."""
+        rows = self.totals()[:n]
+        total = sum(row['seconds'] for row in self.totals()) or 1.0
+        lines = [f"{'rule':<28}{'source':<20}{'ms':>10}{'%':>7}{'matches':>9}{'files':>7}{'bytes':>10}"]
+        for row in rows:
+            lines.append(
+                f"{row['rule']:<28}{row['source']:<20}{row['seconds'] * 1000:>10.1f}"
+                f"{row['seconds'] / total * 100:>7.1f}{row['matches']:>9}"
+                f"{row['files_matched']:>7}{row['bytes_removed']:>10}"
+            )
+        return '\n'.join(lines)
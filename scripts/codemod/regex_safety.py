@@ -0,0 +1,336 @@
+"""
+Find rule patterns that can backtrack super-linearly.
+
+Python's `re` is a backtracking matcher: when two quantified parts of a
+pattern can match the same characters, a failing match tries every way of
+splitting the text between them. `analyze` walks the parsed pattern and
+reports the two shapes that cause this:
+
+- exponential: an unbounded repeat whose body has a variable-width part
+  and nothing that forces each iteration to consume something that part
+  cannot (`(\\w+\\s?)*`, `(?:\\w+|-)*`), or that alternates between
+  branches that can match the same text (`(?:x\\w|\\wy)*`);
+- quadratic: two unbounded repeats in a row that can match the same
+  characters, separated only by optional parts or by text the first one
+  can also match (`.*?'_th'.*?`, `\\s*\\n\\s*`).
+
+A quadratic finding whose shared characters exclude `\\n` can only blow
+up within one line (`line_bounded`); with a single-line input that is
+still slow but rarely pathological. Possessive repeats and atomic groups
+never backtrack and are not reported.
+
+Character sets are compared on a sample alphabet (printable ASCII, a few
+non-ASCII letters and every literal in the pattern), which is precise
+enough for the classes that occur in the rules.
+"""
+
+import re
+import string
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, List
+
+from .rules import LineRule
+
+try:
+    from re import _constants as sre
+    from re import _parser as sre_parse
+except ImportError:     # Python < 3.11
+    import sre_constants as sre
+    import sre_parse
+
+EXPONENTIAL = "exponential"
+QUADRATIC = "quadratic"
+
+_ALPHABET = frozenset(string.printable + '\x00éไ中')
+_REPEATS = (sre.MAX_REPEAT, sre.MIN_REPEAT)
+_CATEGORIES = {
+    'CATEGORY_DIGIT': r'\d', 'CATEGORY_NOT_DIGIT': r'\D',
+    'CATEGORY_SPACE': r'\s', 'CATEGORY_NOT_SPACE': r'\S',
+    'CATEGORY_WORD': r'\w', 'CATEGORY_NOT_WORD': r'\W',
+    'CATEGORY_LINEBREAK': r'\n', 'CATEGORY_NOT_LINEBREAK': r'[^\n]',
+}
+
+
+@dataclass(frozen=True)
+class Finding:
+    """One super-linear construct in a pattern."""
+
+    severity: str           # EXPONENTIAL or QUADRATIC
+    message: str
+    line_bounded: bool = False
+
+    def __str__(self) -> str:
+        scope = " within a line" if self.line_bounded else ""
+        return f"{self.severity}{scope}: {self.message}"
+
+
+@dataclass(frozen=True)
+class RuleFinding:
+    rule: str
+    source: str
+    pattern: str
+    finding: Finding
+
+    def __str__(self) -> str:
+        return f"{self.rule} ({self.source}): {self.finding}"
+
+
+class _Analyzer:
+    def __init__(self, pattern: str, flags: int):
+        self.parsed = sre_parse.parse(pattern, flags)
+        self.dotall = bool(self.parsed.state.flags & re.DOTALL)
+        self.alphabet = _ALPHABET | frozenset(self._literals(self.parsed))
+        self.findings: List[Finding] = []
+
+    def _literals(self, items) -> Iterable[str]:
+        for op, av in items:
+            if op is sre.LITERAL:
+                yield chr(av)
+            elif op is sre.IN:
+                yield from (chr(value) for kind, value in av if kind is sre.LITERAL)
+            else:
+                for child in _children(op, av):
+                    yield from self._literals(child)
+
+    # -- character sets -----------------------------------------------------
+
+    def _class(self, items) -> FrozenSet[str]:
+        chars = set()
+        negate = False
+        for kind, value in items:
+            if kind is sre.NEGATE:
+                negate = True
+            elif kind is sre.LITERAL:
+                chars.add(chr(value))
+            elif kind is sre.RANGE:
+                low, high = value
+                chars.update(c for c in self.alphabet if low <= ord(c) <= high)
+            elif kind is sre.CATEGORY:
+                category = re.compile(_CATEGORIES.get(str(value), r'[^\s\S]'))
+                chars.update(c for c in self.alphabet if category.match(c))
+        return self.alphabet - chars if negate else frozenset(chars)
+
+    def chars(self, items) -> FrozenSet[str]:
+        """Every sample character `items` can consume, anywhere."""
+        chars = set()
+        for op, av in items:
+            if op is sre.LITERAL:
+                chars.add(chr(av))
+            elif op is sre.NOT_LITERAL:
+                chars.update(self.alphabet - {chr(av)})
+            elif op is sre.ANY:
+                chars.update(self.alphabet if self.dotall else self.alphabet - {'\n'})
+            elif op is sre.IN:
+                chars.update(self._class(av))
+            elif op not in (sre.ASSERT, sre.ASSERT_NOT):
+                for child in _children(op, av):
+                    chars.update(self.chars(child))
+        return frozenset(chars)
+
+    def first(self, items) -> FrozenSet[str]:
+        """Sample characters a match of `items` can start with."""
+        chars = set()
+        for op, av in items:
+            if op is sre.BRANCH:
+                for branch in av[1]:
+                    chars.update(self.first(branch))
+            elif op is sre.SUBPATTERN:
+                chars.update(self.first(av[-1]))
+            elif op in _REPEATS or op is _POSSESSIVE:
+                chars.update(self.first(av[2]))
+            else:
+                chars.update(self.chars([(op, av)]))
+            if not _nullable([(op, av)]):
+                break
+        return frozenset(chars)
+
+    # -- checks ---------------------------------------------------------------
+
+    def run(self) -> List[Finding]:
+        self._sequence(list(self.parsed))
+        return self.findings
+
+    def _sequence(self, items):
+        for index, (op, av) in enumerate(items):
+            if op in _REPEATS and av[1] == sre.MAXREPEAT:
+                self._nested(av[2])
+                self._adjacent((op, av), items[index + 1:])
+            if _ATOMIC is None or op is not _ATOMIC:
+                for child in _children(op, av):
+                    self._sequence(list(child))
+
+    def _adjacent(self, repeat, following):
+        """Report an unbounded repeat followed by another that competes for its text."""
+        own = self.chars(repeat[1][2])
+        for op, av in _flatten(following):
+            if op in _REPEATS and av[1] == sre.MAXREPEAT:
+                shared = own & self.chars(av[2])
+                if shared:
+                    self.findings.append(Finding(
+                        QUADRATIC,
+                        f"{_render([repeat])} and the following {_render([(op, av)])} "
+                        f"can both match {_sample(shared)}",
+                        '\n' not in shared))
+                    return
+            if _nullable([(op, av)]):
+                continue
+            if not self.chars([(op, av)]) <= own:
+                return
+
+    def _nested(self, body):
+        """Report a repeated body that can match the same text in many ways."""
+        items = list(_flatten(body))
+        if len(items) == 1 and items[0][0] is sre.BRANCH:
+            branches = items[0][1][1]
+            for branch in branches:
+                self._nested(branch)
+            self._overlapping(branches)
+            return
+        for index, item in enumerate(items):
+            low, high = sre_parse.SubPattern(self.parsed.state, [item]).getwidth()
+            if low == high:
+                continue
+            own = self.chars([item])
+            rest = items[:index] + items[index + 1:]
+            if all(_nullable([other]) or self.chars([other]) <= own for other in rest):
+                self.findings.append(Finding(
+                    EXPONENTIAL,
+                    f"variable-width {_render([item])} inside a repeated group can split "
+                    f"the same text across iterations"))
+                return
+        for op, av in items:
+            if op is sre.BRANCH:
+                self._overlapping(av[1])
+
+    def _overlapping(self, branches):
+        """Report two branches of a repeated alternation that can match the same text."""
+        for i, left in enumerate(branches):
+            for right in branches[i + 1:]:
+                if not self.first(left) & self.first(right):
+                    continue
+                left_chars, right_chars = self.chars(left), self.chars(right)
+                if left_chars <= right_chars or right_chars <= left_chars:
+                    self.findings.append(Finding(
+                        EXPONENTIAL,
+                        f"repeated alternation whose branches {_render(left)} and "
+                        f"{_render(right)} overlap"))
+                    return
+
+
+_POSSESSIVE = getattr(sre, 'POSSESSIVE_REPEAT', None)
+_ATOMIC = getattr(sre, 'ATOMIC_GROUP', None)
+
+
+def _children(op, av) -> Iterable:
+    """Sub-sequences of one parsed node."""
+    if op is sre.SUBPATTERN:
+        yield av[-1]
+    elif op is sre.BRANCH:
+        yield from av[1]
+    elif op in _REPEATS or (_POSSESSIVE is not None and op is _POSSESSIVE):
+        yield av[2]
+    elif op in (sre.ASSERT, sre.ASSERT_NOT):
+        yield av[1]
+    elif op is sre.GROUPREF_EXISTS:
+        yield av[1]
+        if av[2] is not None:
+            yield av[2]
+    elif _ATOMIC is not None and op is _ATOMIC:
+        yield av
+
+
+def _flatten(items) -> Iterable:
+    """Nodes in sequence, looking through groups that just wrap a sequence."""
+    for op, av in items:
+        if op is sre.SUBPATTERN:
+            yield from _flatten(av[-1])
+        else:
+            yield op, av
+
+
+def _nullable(items) -> bool:
+    """True if `items` can match the empty string."""
+    for op, av in items:
+        if op in (sre.AT, sre.ASSERT, sre.ASSERT_NOT):
+            continue
+        if op in _REPEATS or (_POSSESSIVE is not None and op is _POSSESSIVE):
+            if av[0] == 0 or _nullable(av[2]):
+                continue
+            return False
+        if op is sre.SUBPATTERN:
+            if _nullable(av[-1]):
+                continue
+            return False
+        if op is sre.BRANCH:
+            if any(_nullable(branch) for branch in av[1]):
+                continue
+            return False
+        return False
+    return True
+
+
+def _render(items) -> str:
+    """Short approximation of the source of a parsed sequence, for messages."""
+    parts = []
+    for op, av in items:
+        if op is sre.LITERAL:
+            parts.append(_escape(chr(av)))
+        elif op is sre.ANY:
+            parts.append('.')
+        elif op is sre.IN and len(av) == 1 and av[0][0] is sre.CATEGORY:
+            parts.append(_CATEGORIES.get(str(av[0][1]), '[...]'))
+        elif op is sre.IN:
+            parts.append('[^...]' if av and av[0][0] is sre.NEGATE else '[...]')
+        elif op is sre.NOT_LITERAL:
+            parts.append(f"[^{_escape(chr(av))}]")
+        elif op in _REPEATS:
+            low, high = av[0], av[1]
+            quantifier = ('*' if low == 0 else '+') if high == sre.MAXREPEAT else f"{{{low},{high}}}"
+            parts.append(_render(av[2]) + quantifier + ('?' if op is sre.MIN_REPEAT else ''))
+        elif op is sre.BRANCH:
+            parts.append('(' + '|'.join(_render(branch) for branch in av[1]) + ')')
+        elif op is sre.SUBPATTERN:
+            inner = _render(av[-1])
+            parts.append(inner if len(av[-1]) == 1 else f"({inner})")
+        else:
+            parts.append('...')
+    return ''.join(parts)
+
+
+def _escape(char: str) -> str:
+    return repr(char)[1:-1] if not char.isprintable() else re.escape(char)
+
+
+def _sample(chars: FrozenSet[str]) -> str:
+    shown = [repr(c) for c in sorted(chars)[:4]]
+    more = f", ... ({len(chars)} chars)" if len(chars) > 4 else ""
+    return ', '.join(shown) + more
+
+
+def analyze(pattern: str, flags: int = 0) -> List[Finding]:
+    """Super-linear constructs in `pattern` (a string or compiled pattern)."""
+    if isinstance(pattern, re.Pattern):
+        pattern, flags = pattern.pattern, pattern.flags
+    return _Analyzer(pattern, flags).run()
+
+
+def check_rules(rules: Iterable) -> List[RuleFinding]:
+    """Findings for every regex in `rules` (Rule/LineRule patterns and `unless`).
+
+    Line rules only ever see one line, so their findings are line-bounded.
+    """
+    found = []
+    for rule in rules:
+        patterns = [getattr(rule, 'pattern', None), getattr(rule, 'unless', None)]
+        per_line = isinstance(rule, LineRule)
+        for pattern in filter(None, patterns):
+            for finding in analyze(pattern):
+                if per_line and not finding.line_bounded:
+                    finding = Finding(finding.severity, finding.message, True)
+                found.append(RuleFinding(rule.name, rule.source, pattern.pattern, finding))
+    return found
+
+
+def serious(findings: Iterable[RuleFinding]) -> List[RuleFinding]:
+    """Findings that can blow up on a whole file, not just within one line."""
+    return [f for f in findings if f.finding.severity == EXPONENTIAL or not f.finding.line_bounded]
@@ -0,0 +1,341 @@
+"""
+Retire a set of identifiers (settings keys, props, form fields) at once.
+
+Every whole-identifier occurrence of any retired name is found in one scan
+of the file (prefilter.IdentifierMatcher, an Aho-Corasick automaton when
+pyahocorasick is installed). A second single pass over the source tracks
+brackets, strings, template literals and comments, so each hit is
+removed according to where it sits:
+
+- a JSX attribute (`heroBadge={...}`, `heroBadge="..."`, `heroBadge`) is
+  removed from its open tag;
+- an entry of a `{...}` group, i.e. an object key (`heroBadge: value,`),
+  an interface or type member (`heroBadge?: string;`), a class field, a
+  shorthand or a destructured name (`{ heroBadge, ...rest }`, `heroBadge
+  = ''`), is removed with its whole value and its separator;
+- anything else (`settings.heroBadge`, a function argument, a string, a
+  statement such as `heroBadge = 5;` in a function or `if` block) is left
+  in place and reported by `leftovers`, or, with `drop_lines`, its whole
+  line is dropped the way remove_herobadge.py used to.
+
+Lines emptied by a removal go with it, and blank-line runs are collapsed
+afterwards like the other rules do.
+"""
+
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+from .destructure import is_jsx_container
+from .jsx import index_elements, line_extent, skip_braces
+from .prefilter import IdentifierMatcher
+from .rules import CLEANUP_RULES
+
+_TOKEN = re.compile(
+    r"""//[^\n]*|/\*.*?\*/|'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|[`{}()\[\],;]""",
+    re.DOTALL,
+)
+_TEMPLATE = re.compile(r"\\.|`|\$\{", re.DOTALL)
+_WS = re.compile(r'\s*')
+_CLOSER_AHEAD = re.compile(r'\s*[}\])]')
+_MEMBER_START = re.compile(r'\n\s*(?:readonly\s+)?[A-Za-z_$][\w$]*\??\s*:')
+# What precedes a `{` that opens a statement block rather than an object,
+# pattern or type, and a class body.
+_BLOCK_BEFORE = re.compile(r'(?:\)|=>|(?<![\w$.])(?:else|try|finally|do))\s*$')
+_CLASS_BEFORE = re.compile(r'(?<![\w$.])class(?:\s+[\w$.<>,\s]*)?$')
+_LOOKBEHIND = 200
+_CLOSE = {'}': '{', ')': '(', ']': '['}
+_COLLAPSE = next(rule for rule in CLEANUP_RULES if rule.name == 'collapse-blank-lines')
+
+Edit = Tuple[int, int]
+
+
+class _Group:
+    __slots__ = ('char', 'start', 'end', 'separators', 'children')
+
+    def __init__(self, char: str, start: int):
+        self.char = char
+        self.start = start
+        self.end = -1                               # index of the closing bracket
+        self.separators: List[int] = []             # top-level ',' and ';'
+        self.children: List[Tuple[int, int]] = []   # nested bracket groups
+
+
+class _Hit:
+    __slots__ = ('start', 'end', 'name', 'group', 'code')
+
+    def __init__(self, start: int, end: int, name: str):
+        self.start = start
+        self.end = end
+        self.name = name
+        self.group: Optional[_Group] = None
+        self.code = True    # False inside strings, templates and comments
+
+
+@lru_cache(maxsize=8)
+def _matcher(identifiers: Tuple[str, ...]) -> IdentifierMatcher:
+    return IdentifierMatcher(identifiers)
+
+
+def _locate(content: str, hits: List[_Hit]):
+    """One pass over `content` giving every hit its enclosing group."""
+    stack: List[_Group] = []
+    next_hit = 0
+
+    def settle(pos: int, code: bool):
+        nonlocal next_hit
+        while next_hit < len(hits) and hits[next_hit].start < pos:
+            hit = hits[next_hit]
+            hit.group = stack[-1] if stack else None
+            hit.code = code
+            next_hit += 1
+
+    pos = 0
+    length = len(content)
+    while pos < length:
+        if stack and stack[-1].char == '`':
+            match = _TEMPLATE.search(content, pos)
+            if match is None:
+                break
+            settle(match.end(), False)
+            pos = match.end()
+            if match.group() == '`':
+                stack.pop()
+            elif match.group() == '${':
+                stack.append(_Group('${', match.start()))
+            continue
+
+        match = _TOKEN.search(content, pos)
+        if match is None:
+            break
+        settle(match.start(), True)
+        pos = match.end()
+        token = match.group()
+        if token in '{([':
+            stack.append(_Group(token, match.start()))
+        elif token == '`':
+            stack.append(_Group('`', match.start()))
+        elif token in ',;':
+            if stack:
+                stack[-1].separators.append(match.start())
+        elif token in _CLOSE:
+            if not stack:
+                continue
+            group = stack.pop()
+            if token == '}' and group.char == '${':
+                continue
+            if group.char != _CLOSE[token]:
+                # Unbalanced input: hits from here on are left alone.
+                break
+            group.end = match.start()
+            if stack:
+                stack[-1].children.append((group.start, pos))
+        else:
+            settle(pos, False)
+    # Hits past an unbalanced bracket or an unterminated literal keep group None
+    # and are treated as plain references.
+    for hit in hits[next_hit:]:
+        hit.code = False
+
+
+def _prev_significant(content: str, pos: int) -> int:
+    pos -= 1
+    while pos >= 0 and content[pos] in ' \t\r\n':
+        pos -= 1
+    return pos
+
+
+def _in_child(group: _Group, pos: int) -> bool:
+    index = bisect_left(group.children, (pos, pos))
+    return index > 0 and group.children[index - 1][1] > pos
+
+
+def _is_block(content: str, group: _Group) -> bool:
+    return _BLOCK_BEFORE.search(content, max(0, group.start - _LOOKBEHIND), group.start) is not None
+
+
+def _takes_initializers(content: str, group: _Group) -> bool:
+    """True for a destructuring pattern or a class body, where `name = value` is an entry."""
+    after = _WS.match(content, group.end + 1).end()
+    if content.startswith('=', after) and not content.startswith(('==', '=>'), after):
+        return True     # `{ heroBadge = '' } = props`
+    before = _prev_significant(content, group.start)
+    if before >= 0 and content[before] in '(,[':
+        return True     # parameters: `function F({ heroBadge = false })`
+    return _CLASS_BEFORE.search(content, max(0, group.start - _LOOKBEHIND), group.start) is not None
+
+
+def _entry_edit(content: str, hit: _Hit) -> Optional[Edit]:
+    """Span of the `{...}` entry that starts with `hit`, with its separator."""
+    group = hit.group
+    if group is None or group.char != '{' or group.end < 0 or is_jsx_container(content, group.start):
+        return None
+    if _is_block(content, group):
+        return None
+    before = _prev_significant(content, hit.start)
+    first_on_line = '\n' in content[before + 1:hit.start]
+    if before != group.start and content[before] not in ',;' and not first_on_line:
+        return None
+    after = _WS.match(content, hit.end).end()
+    following = content[after:after + 2]
+    if not (following[:1] in (':', ',', ';', '=', '}') or following == '?:'):
+        return None
+    if following in ('==', '=>'):
+        return None
+    if following[:1] == '=' and not _takes_initializers(content, group):
+        return None     # an assignment statement, not an entry
+
+    index = bisect_left(group.separators, hit.end)
+    end = group.separators[index] if index < len(group.separators) else group.end
+    # Members of a type literal may be separated by newlines alone.
+    for member in _MEMBER_START.finditer(content, hit.end, end):
+        if not _in_child(group, member.start()):
+            end = member.start()
+            break
+    if end < len(content) and content[end] in ',;':
+        end += 1
+        while end < len(content) and content[end] in ' \t':
+            end += 1
+        return hit.start, end
+    while end > hit.start and content[end - 1] in ' \t\r\n':
+        end -= 1
+    return hit.start, end
+
+
+def _attribute_edit(content: str, hit: _Hit, tags: List[Tuple[int, int]]) -> Optional[Edit]:
+    """Span of a JSX attribute named by `hit`, with the whitespace before it."""
+    index = bisect_left(tags, (hit.start, hit.start))
+    if index == 0 or tags[index - 1][1] <= hit.start:
+        return None
+    tag_start = tags[index - 1][0]
+    # Inside an attribute's {...} value the name is an expression, not an attribute.
+    if hit.group is not None and hit.group.start > tag_start:
+        return None
+    if content[hit.start - 1] not in ' \t\r\n':
+        return None
+    pos = _WS.match(content, hit.end).end()
+    if content.startswith('=', pos):
+        pos = _WS.match(content, pos + 1).end()
+        if content.startswith('{', pos):
+            pos = skip_braces(content, pos)
+        elif content[pos:pos + 1] in ('"', "'"):
+            pos = content.find(content[pos], pos + 1) + 1
+        else:
+            return None
+        if pos <= 0:
+            return None
+    else:
+        pos = hit.end
+        if content[pos:pos + 1] not in (' ', '\t', '\r', '\n', '/', '>'):
+            return None
+    start = hit.start
+    while start > 0 and content[start - 1] in ' \t':
+        start -= 1
+    return start, pos
+
+
+def _hits(content: str, identifiers: Sequence[str]) -> List[_Hit]:
+    matcher = _matcher(tuple(identifiers))
+    return [_Hit(start, end, name) for start, end, name in matcher.finditer(content)]
+
+
+def _plan(content: str, identifiers: Sequence[str]) -> Tuple[List[Edit], List[_Hit]]:
+    """(removals, hits left in place)."""
+    hits = _hits(content, identifiers)
+    if not hits:
+        return [], []
+    _locate(content, hits)
+    tags: Optional[List[Tuple[int, int]]] = None
+    edits: List[Edit] = []
+    left: List[_Hit] = []
+    for hit in hits:
+        edit = None
+        if hit.code:
+            if tags is None:
+                tags = [(el.start, el.open_end) for el in index_elements(content)] if '<' in content else []
+                tags.sort()
+            edit = _attribute_edit(content, hit, tags) or _entry_edit(content, hit)
+        if edit is None:
+            left.append(hit)
+        else:
+            edits.append(line_extent(content, *edit))
+    return edits, left
+
+
+def _tidy(content: str, start: int, end: int) -> List[Edit]:
+    """Removals for one merged span, fixing up the separator it leaves behind.
+
+    When the span took the last entries of a group written without a
+    trailing separator, the comma before them goes too (`{ a, b }` minus
+    `b` is `{ a }`); a group emptied on one line closes up to `{}`.
+    """
+    closer = _CLOSER_AHEAD.match(content, end)
+    removed = content[start:end].rstrip()
+    if closer is None or not removed or removed[-1] in ',;':
+        return [(start, end)]
+    before = _prev_significant(content, start)
+    if before >= 0 and content[before] == ',':
+        if start == 0 or content[start - 1] == '\n':
+            return [(before, before + 1), (start, end)]
+        return [(before, end)]
+    if before >= 0 and content[before] in '{[(' and '\n' not in content[before:closer.end()]:
+        return [(before + 1, closer.end() - 1)]
+    return [(start, end)]
+
+
+def _apply(content: str, edits: List[Edit]) -> str:
+    # An entry whose value mentions another retired name swallows that edit,
+    # and neighbouring removals are merged before their separators are fixed.
+    merged: List[Edit] = []
+    for start, end in sorted(edits):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    parts = []
+    pos = 0
+    for span in merged:
+        for start, end in _tidy(content, *span):
+            parts.append(content[pos:start])
+            pos = end
+    parts.append(content[pos:])
+    return ''.join(parts)
+
+
+def remove_identifiers(content: str, identifiers: Sequence[str], drop_lines: bool = False) -> str:
+    """Remove every JSX attribute and `{...}` entry named by `identifiers`.
+
+    With `drop_lines`, lines that still mention one of them afterwards
+    are dropped as well.
+    """
+    edits, left = _plan(content, identifiers)
+    if not edits and not (drop_lines and left):
+        return content
+    new = _apply(content, edits)
+    if drop_lines:
+        remaining = {start for start, _, _ in _matcher(tuple(identifiers)).finditer(new)}
+        if remaining:
+            kept = []
+            pos = 0
+            for line in new.split('\n'):
+                end = pos + len(line)
+                if not any(pos <= start < end for start in remaining):
+                    kept.append(line)
+                pos = end + 1
+            new = '\n'.join(kept)
+    return _COLLAPSE.pattern.sub(_COLLAPSE.repl, new)
+
+
+def leftovers(content: str, identifiers: Sequence[str]) -> List[Tuple[int, str, str]]:
+    """(line, identifier, line text) for occurrences remove_identifiers keeps, once per line."""
+    _, left = _plan(content, identifiers)
+    found = {}
+    for hit in left:
+        line = content.count('\n', 0, hit.start) + 1
+        if (line, hit.name) in found:
+            continue
+        line_start = content.rfind('\n', 0, hit.start) + 1
+        line_end = content.find('\n', hit.start)
+        found[line, hit.name] = content[line_start:line_end if line_end >= 0 else len(content)].strip()
+    return [(line, name, text) for (line, name), text in found.items()]
@@ -0,0 +1,231 @@
+"""
+Registry of precompiled locale-stripping rules.
+
+Every rule is taken from one of the original one-shot scripts
+(remove-lang-fields.py, remove_lang.py, remove_lang_pass2.py,
+remove_lang_final.py, ultra_clean.py). The `_th`/`_zh` variants that those
+scripts ran one after another are folded into a single alternation, so each
+pattern is compiled once and scanned once per file.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Pattern, Tuple, Union
+
+from .destructure import remove_suffixed_entries
+from .jsx import Element, open_tag, remove_elements
+
+SUFFIX = r"_(?:th|zh)"
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A whole-content regex substitution."""
+
+    name: str
+    source: str
+    pattern: Pattern
+    repl: Union[str, Callable] = ""
+
+
+@dataclass(frozen=True)
+class LineRule:
+    """Drop every line matching `pattern` unless it also matches `unless`."""
+
+    name: str
+    source: str
+    pattern: Pattern
+    unless: Optional[Pattern] = None
+
+    def drops(self, line: str) -> bool:
+        if not self.pattern.search(line):
+            return False
+        return self.unless is None or not self.unless.search(line)
+
+
+@dataclass(frozen=True)
+class TransformRule:
+    """A whole-content transform implemented by a scanner instead of a regex."""
+
+    name: str
+    source: str
+    func: Callable[[str], str]
+
+
+AnyRule = Union[Rule, LineRule, TransformRule]
+
+LOCALE_SUFFIXES = ('_th', '_zh')
+
+# Literal substrings at least one of which every rule needs in order to
+# match; files without any of them are never opened (see prefilter.py).
+TRIGGERS = ('_th', '_zh', "'th'", "'zh'")
+
+_LANGUAGE_LABEL = re.compile(r'\s*(?:Thai|Chinese|ไทย|中文)')
+_LANGUAGE_WORDS = ('Thai', 'Chinese', 'ไทย', '中文')
+_INPUT_TAGS = ('input', 'textarea')
+_INPUT_COMPONENT = re.compile(r'<(?:Input|Textarea)\b')
+# A <label; group 2 is the `>` ending its open tag when that tag only
+# has plain quoted attributes.
+_LABEL_TAG = re.compile(r'''(<label)\b(?:(?:[^<>{}'"/]|"[^"]*"|'[^']*')*(>))?''')
+
+
+def _has_suffixed_name(element: Element, suffixes: Tuple[str, ...]) -> bool:
+    name = element.attr('name')
+    return bool(name) and name.endswith(suffixes)
+
+
+def _quotes_suffix(content: str, suffixes: Tuple[str, ...]) -> bool:
+    """Cheap check that some attribute value could end with a suffix."""
+    return any(suffix + '"' in content or suffix + "'" in content for suffix in suffixes)
+
+
+def remove_locale_inputs(content: str, suffixes: Tuple[str, ...] = LOCALE_SUFFIXES) -> str:
+    """Remove <Input>/<Textarea> components bound to a locale-suffixed field."""
+    if 'name=' not in content or not _quotes_suffix(content, suffixes):
+        return content
+    return remove_elements(
+        content,
+        lambda el, _: el.tag in ('Input', 'Textarea') and _has_suffixed_name(el, suffixes),
+        starts=(match.start() for match in _INPUT_COMPONENT.finditer(content)),
+    )
+
+
+def _is_labelled_locale_input(element: Element, content: str, suffixes: Tuple[str, ...]) -> bool:
+    if element.tag != 'div' or len(element.children) != 2:
+        return False
+    label, field = element.children
+    return (label.tag == 'label'
+            and field.tag in _INPUT_TAGS
+            and _has_suffixed_name(field, suffixes)
+            and _LANGUAGE_LABEL.match(label.text(content)) is not None)
+
+
+def _labelled_div_starts(content: str):
+    """Offsets of the nearest `<div` before each language <label>.
+
+    A block's label is the first element in its div, so that div is the
+    last one opened before the label.
+    """
+    last = -1
+    for match in _LABEL_TAG.finditer(content):
+        if match.group(2):
+            text_start = match.end(2)
+        else:
+            label = open_tag(content, match.start(1))
+            if label is None or label.self_closing:
+                continue
+            text_start = label.open_end
+        if _LANGUAGE_LABEL.match(content, text_start) is None:
+            continue
+        div = content.rfind('<div', 0, match.start())
+        if div > last:
+            last = div
+            yield div
+
+
+def remove_locale_input_blocks(content: str, suffixes: Tuple[str, ...] = LOCALE_SUFFIXES) -> str:
+    """Remove <div><label>Thai|Chinese…</label><input name="…_th"/></div> blocks.
+
+    Only divs whose first child is a language label are parsed.
+    """
+    if ('name=' not in content or not any(word in content for word in _LANGUAGE_WORDS)
+            or not _quotes_suffix(content, suffixes)):
+        return content
+    return remove_elements(
+        content,
+        lambda el, src: _is_labelled_locale_input(el, src, suffixes),
+        starts=_labelled_div_starts(content),
+    )
+
+
+_LOCALE = re.compile(r'locale', re.IGNORECASE)
+
+RULES: Tuple[AnyRule, ...] = (
+    # remove-lang-fields.py
+    Rule('field-definition', 'remove-lang-fields',
+         re.compile(rf'^\s*\w+{SUFFIX}:.*?[,;]\s*$', re.MULTILINE)),
+    Rule('zod-definition', 'remove-lang-fields',
+         re.compile(rf'^\s*\w+{SUFFIX}:\s*z\..*?[,;]\s*$', re.MULTILINE)),
+    Rule('default-value', 'remove-lang-fields',
+         re.compile(rf'^\s*\w+{SUFFIX}:\s*[\'"].*?[\'"],?\s*$', re.MULTILINE)),
+    Rule('initial-data', 'remove-lang-fields',
+         re.compile(rf'^\s*\w+{SUFFIX}:\s*.*?\|\|.*?[,;]\s*$', re.MULTILINE)),
+    TransformRule('input-element', 'remove-lang-fields', remove_locale_inputs),
+    Rule('on-change', 'remove-lang-fields',
+         re.compile(rf"onChange=\{{.*?'{SUFFIX}'.*?\}}")),
+
+    # remove_lang.py
+    Rule('interface-field', 'remove_lang',
+         re.compile(r'^\s+\w+_(th|zh):.*?;\s*$', re.MULTILINE)),
+    # The value stops at the end of its line: remove_lang.py's [^,]+ ran on to
+    # the next comma, taking whole `;`-separated members below with it, and
+    # backtracked over the rest of the file when there was none.
+    Rule('property-assignment', 'remove_lang',
+         re.compile(r'^\s+\w+_(th|zh):\s*[^,\n]+,?\s*$', re.MULTILINE)),
+    TransformRule('labelled-input-div', 'remove_lang', remove_locale_input_blocks),
+    Rule('language-tab', 'remove_lang',
+         re.compile(r"{\s*code:\s*'(th|zh)',\s*label:\s*'[^']+',\s*flag:\s*'[^']+'\s*},?\s*")),
+
+    # remove_lang_final.py
+    TransformRule('destructuring', 'remove_lang_final', remove_suffixed_entries),
+
+    # Line filters below run together in one pass over the lines.
+    # remove_lang_pass2.py
+    LineRule('assignment-line', 'remove_lang_pass2',
+             re.compile(r'\w+_(th|zh)\s*[:=]')),
+    LineRule('property-access-line', 'remove_lang_pass2',
+             re.compile(r'\.\w+_(th|zh)\b'), _LOCALE),
+    # remove_lang_final.py
+    LineRule('shorthand-line', 'remove_lang_final',
+             re.compile(r'^\s+\w+_(th|zh),?\s*$')),
+    # ultra_clean.py
+    # ultra_clean.py matched the bare substrings; anchoring the suffix keeps
+    # identifiers such as `show_thumbnail` or `user_zhao`.
+    LineRule('any-reference-line', 'ultra_clean',
+             re.compile(r'_(?:th|zh)\b'), _LOCALE),
+)
+
+CLEANUP_RULES: Tuple[Rule, ...] = (
+    # Same matches as \n\s*\n\s*\n+, without two \s* competing for the newlines.
+    Rule('collapse-blank-lines', 'cleanup',
+         re.compile(r'\n(?:[^\S\n]*\n){2,}'), '\n\n'),
+    Rule('trailing-comma', 'cleanup',
+         re.compile(r',(\s*[}\]])'), r'\1'),
+)
+
+SOURCES = tuple(dict.fromkeys(rule.source for rule in RULES))
+
+
+def rules_for(sources: Optional[Iterable[str]] = None) -> Tuple[AnyRule, ...]:
+    """Return the registered rules, optionally limited to some source scripts."""
+    if sources is None:
+        return RULES
+    wanted = set(sources)
+    unknown = wanted.difference(SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown rule source(s): {', '.join(sorted(unknown))}")
+    return tuple(rule for rule in RULES if rule.source in wanted)
+
+
+# Bump when a rule's behaviour changes without its pattern changing
+# (e.g. an edit to a replacement function), so manifests are invalidated.
+RULES_REVISION = 4
+
+
+def _describe(rule) -> str:
+    if isinstance(rule, LineRule):
+        unless = rule.unless.pattern if rule.unless else ''
+        return f"line:{rule.name}:{rule.pattern.pattern}:{rule.pattern.flags}:{unless}"
+    if isinstance(rule, TransformRule):
+        return f"transform:{rule.name}:{rule.func.__module__}.{rule.func.__qualname__}"
+    repl = rule.repl if isinstance(rule.repl, str) else f"{rule.repl.__module__}.{rule.repl.__qualname__}"
+    return f"sub:{rule.name}:{rule.pattern.pattern}:{rule.pattern.flags}:{repl}"
+
+
+def ruleset_version(rules: Iterable[AnyRule] = RULES) -> str:
+    """Stable fingerprint of a rule selection plus the shared cleanup rules."""
+    digest = hashlib.sha256(f"revision:{RULES_REVISION}".encode())
+    for rule in (*rules, *CLEANUP_RULES):
+        digest.update(b"\0" + _describe(rule).encode())
+    return digest.hexdigest()[:16]
@@ -0,0 +1,171 @@
+"""
+Streaming line pipeline for the line-oriented rules.
+
+A file is read through a buffered reader, pushed line by line through
+generator stages and written through an incremental writer to a temporary
+file that replaces the original only if the output differs. Memory stays
+bounded by the longest line (plus a short run of blank lines held by the
+trailing-comma stage), independent of file size.
+
+Line semantics match `content.split('\\n')` / `'\\n'.join(lines)`, so the
+stages produce exactly what the whole-file versions in the scripts did.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
+
+from . import output
+
+Stage = Callable[[Iterator[str]], Iterator[str]]
+
+_INLINE_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
+
+def read_lines(f: TextIO) -> Iterator[str]:
+    """Yield lines without their '\\n', like `f.read().split('\\n')`.
+
+    Files are opened with newline='' so nothing is translated, but the
+    reader then also ends lines at a lone '\\r'; pieces are joined back up
+    until a real '\\n', so '\\r' stays part of the line it is in.
+    """
+    pending = ''
+    for piece in f:
+        if piece.endswith('\n'):
+            yield pending + piece[:-1]
+            pending = ''
+        else:
+            pending += piece
+    yield pending
+
+
+def drop_lines(predicate: Callable[[str], bool]) -> Stage:
+    """Stage dropping every line for which `predicate` is true."""
+    def stage(lines: Iterator[str]) -> Iterator[str]:
+        for line in lines:
+            if not predicate(line):
+                yield line
+    return stage
+
+
+def _collapse_run(run, at_start: bool, at_end: bool) -> list:
+    # The regex needs three newlines; a run of k blank lines spans k + 1 of
+    # them, one fewer at each end of the file. Whitespace on the first line
+    # of the file and after its last newline is outside the match and kept.
+    newlines = len(run) + 1 - at_start - at_end
+    if newlines < 3:
+        return run
+    collapsed = [run[0]] if at_start else []
+    collapsed.append('')
+    if at_end:
+        collapsed.append(run[-1])
+    return collapsed
+
+
+def collapse_blank_lines(lines: Iterator[str]) -> Iterator[str]:
+    """Streaming form of `re.sub(r'\\n\\s*\\n\\s*\\n+', '\\n\\n', content)`.
+
+    A run of blank lines spanning three or more newlines becomes a single
+    empty line; shorter runs are kept as they are.
+    """
+    run = []
+    at_start = True
+    for line in lines:
+        if not line.strip():
+            run.append(line)
+            continue
+        yield from _collapse_run(run, at_start, False)
+        at_start = False
+        run = []
+        yield line
+    if run:
+        yield from _collapse_run(run, at_start, True)
+
+
+def fix_trailing_commas(lines: Iterator[str]) -> Iterator[str]:
+    """Streaming form of `re.sub(r',(\\s*[}\\]])', r'\\1', content)`."""
+    held = []  # last non-blank line followed by the blank lines after it
+    for raw in lines:
+        line = _INLINE_TRAILING_COMMA.sub(r'\1', raw)
+        if not raw.strip():
+            held.append(line)
+            continue
+        # Decide on the held comma from the line as it was: `, }` on this
+        # line does not make the comma before it trailing.
+        if held and raw.lstrip()[:1] in ('}', ']'):
+            head = held[0]
+            stripped = head.rstrip()
+            if stripped.endswith(','):
+                held[0] = stripped[:-1] + head[len(stripped):]
+        yield from held
+        held = [line]
+    yield from held
+
+
+def run_stages(lines: Iterable[str], stages: Iterable[Stage]) -> Iterator[str]:
+    stream = iter(lines)
+    for stage in stages:
+        stream = stage(stream)
+    return stream
+
+
+def transform_lines(content: str, stages: Iterable[Stage]) -> str:
+    """Run the stages over an in-memory string."""
+    return '\n'.join(run_stages(content.split('\n'), stages))
+
+
+class _HashingReader:
+    """Line iterator over a text file that hashes what it reads."""
+
+    def __init__(self, f: TextIO):
+        self._f = f
+        self.digest = hashlib.sha256()
+
+    def __iter__(self):
+        for line in self._f:
+            self.digest.update(line.encode('utf-8'))
+            yield line
+
+
+def rewrite_file(file_path: Path, stages: Iterable[Stage], preserve_mtime: bool = False) -> bool:
+    """Stream `file_path` through `stages`. Returns True if it changed.
+
+    Output goes to a temporary file next to the original and is moved into
+    place atomically only when its content hash differs from the input's.
+    With `preserve_mtime` the original timestamps are kept. In a dry run
+    the temporary file is diffed against the original and discarded.
+    """
+    file_path = Path(file_path)
+    fd, tmp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        out_digest = hashlib.sha256()
+        with open(file_path, 'r', encoding='utf-8', newline='') as src, \
+                os.fdopen(fd, 'w', encoding='utf-8', newline='') as dst:
+            reader = _HashingReader(src)
+            first = True
+            for line in run_stages(read_lines(reader), stages):
+                chunk = line if first else '\n' + line
+                first = False
+                dst.write(chunk)
+                out_digest.update(chunk.encode('utf-8'))
+        if out_digest.digest() == reader.digest.digest():
+            os.unlink(tmp_name)
+            return False
+        sink = output.dry_run_sink()
+        if sink is not None:
+            sink.emit(file_path, output.read_text(file_path), output.read_text(tmp_name))
+            os.unlink(tmp_name)
+            return True
+        st = os.stat(file_path)
+        os.chmod(tmp_name, st.st_mode & 0o7777)
+        if preserve_mtime:
+            os.utime(tmp_name, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp_name, file_path)
+        return True
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
@@ -0,0 +1,349 @@
+"""
+Cross-file index from Prisma model fields to their TS/TSX usages.
+
+Every field name declared in schema.prisma is searched for with one
+compiled alternation per file; each hit is classified from its immediate
+surroundings as a property access (`item.name_th`), an object key
+(`name_th: ...`), a destructuring/shorthand entry (`{ name_th, ... }`),
+a string literal (`'name_th'`) or a plain reference.
+
+Each usage also records the model that owns it, when that can be told:
+the only model declaring the name; the model of the enclosing
+`prisma.<model>.<operation>(...)` call, followed through relation keys
+of nested `select`/`include` objects; or, for `x.name_th`, the model `x`
+was loaded from (`const x = await prisma.product...`) or annotated with
+(`x: Product`). Usages that fit several models keep an empty `model`.
+
+The index is persisted next to the manifest and refreshed incrementally:
+only files whose size or mtime changed are rescanned, and a schema whose
+field set changed triggers a full rebuild.
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import prisma_schema
+from .files import SOURCE_SUFFIXES
+from .prisma_queries import CLIENT_NAMES, client_names, skip_expression
+
+INDEX_NAME = ".codemod-symbols.json"
+FORMAT_VERSION = 2
+
+DEFAULT_DIRECTORIES = (
+    "src/app/api",
+    "src/components",
+    "src/hooks",
+)
+
+ACCESS = "access"
+KEY = "key"
+ENTRY = "entry"
+STRING = "string"
+REFERENCE = "reference"
+
+
+@dataclass(frozen=True)
+class Usage:
+    name: str
+    path: str
+    line: int
+    column: int
+    kind: str
+    text: str
+    model: str = ''     # owning model, '' if several models declare the name
+
+
+def _prev_char(content: str, pos: int) -> str:
+    pos -= 1
+    while pos >= 0 and content[pos] in ' \t\r\n':
+        pos -= 1
+    return content[pos] if pos >= 0 else ''
+
+
+def _next_char(content: str, pos: int) -> str:
+    length = len(content)
+    while pos < length and content[pos] in ' \t\r\n':
+        pos += 1
+    return content[pos] if pos < length else ''
+
+
+def _classify(content: str, start: int, end: int) -> str:
+    before = content[start - 1] if start else ''
+    after = content[end] if end < len(content) else ''
+    if before in '\'"`' and after == before:
+        return STRING
+    prev = _prev_char(content, start)
+    if prev == '.':
+        return ACCESS
+    nxt = _next_char(content, end)
+    if prev in '{,' or prev == '':
+        if nxt == ':':
+            return KEY
+        if nxt in ',}=':
+            return ENTRY
+    return REFERENCE
+
+
+_CLIENT = '|'.join(CLIENT_NAMES)
+_CALL = re.compile(rf'\b(?:{_CLIENT})\.(\w+)\.\w+\s*\(')
+_LOADED = re.compile(rf'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:await\s+)?(?:{_CLIENT})\.(\w+)\.')
+_ANNOTATED = re.compile(r'([A-Za-z_$][\w$]*)\s*\??:\s*([A-Z]\w*)\b(?!\s*[.<])')
+_RECEIVER = re.compile(r'([A-Za-z_$][\w$]*)\s*\??\.\s*$')
+_PATH_TOKEN = re.compile(r"""'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|([A-Za-z_$][\w$]*)\s*:\s*\{|[{}]""")
+
+
+class _Owners:
+    """Works out which model a field usage in one file belongs to."""
+
+    def __init__(self, content: str, schema: prisma_schema.Schema):
+        self.content = content
+        self.schema = schema
+        accessors = client_names(schema)
+        self.calls = []     # (args start, args end, model name)
+        for match in _CALL.finditer(content):
+            model = accessors.get(match.group(1))
+            if model is not None:
+                end = skip_expression(content, match.end(), ')')
+                self.calls.append((match.end(), end, model))
+        self.bindings: Dict[str, str] = {}
+        for match in _ANNOTATED.finditer(content):
+            if match.group(2) in schema.models:
+                self.bindings[match.group(1)] = match.group(2)
+        for match in _LOADED.finditer(content):
+            model = accessors.get(match.group(2))
+            if model is not None:
+                self.bindings[match.group(1)] = model
+
+    def _declares(self, model: Optional[str], name: str) -> bool:
+        return model is not None and self.schema.models[model].field(name) is not None
+
+    def _in_call(self, start: int, name: str) -> Optional[str]:
+        inner = None
+        for args_start, args_end, model in self.calls:
+            if args_start <= start < args_end and (inner is None or args_start > inner[0]):
+                inner = (args_start, model)
+        if inner is None:
+            return None
+        # Follow relation keys (`category: { select: { ... } }`) down to the usage.
+        path: List[Optional[str]] = []
+        for token in _PATH_TOKEN.finditer(self.content, inner[0], start):
+            if token.group(1) or token.group() == '{':
+                path.append(token.group(1))
+            elif token.group() == '}' and path:
+                path.pop()
+        model = inner[1]
+        for key in path:
+            fld = self.schema.models[model].field(key) if key else None
+            if fld is not None and fld.type in self.schema.models:
+                model = fld.type
+        return model
+
+    def owner(self, name: str, start: int, kind: str) -> str:
+        declaring = [model.name for model, _ in self.schema.field_index.get(name, ())]
+        if len(declaring) == 1:
+            return declaring[0]
+        if kind == ACCESS:
+            receiver = _RECEIVER.search(self.content, max(0, start - 80), start)
+            model = self.bindings.get(receiver.group(1)) if receiver else None
+            if self._declares(model, name):
+                return model
+        model = self._in_call(start, name)
+        if self._declares(model, name):
+            return model
+        return ''
+
+
+def scan_usages(content: str, pattern: re.Pattern, rel: str,
+                schema: Optional[prisma_schema.Schema] = None) -> List[Usage]:
+    """All usages of the field names matched by `pattern` in one file.
+
+    With `schema`, each usage gets its owning model where it can be told.
+    """
+    usages = []
+    owners = _Owners(content, schema) if schema is not None else None
+    line = 1
+    line_start = 0
+    pos = 0
+    for match in pattern.finditer(content):
+        start = match.start()
+        newlines = content.count('\n', pos, start)
+        if newlines:
+            line += newlines
+            line_start = content.rfind('\n', 0, start) + 1
+        pos = start
+        line_end = content.find('\n', start)
+        text = content[line_start:line_end if line_end >= 0 else len(content)].strip()
+        kind = _classify(content, start, match.end())
+        model = owners.owner(match.group(), start, kind) if owners is not None else ''
+        usages.append(Usage(match.group(), rel, line, start - line_start + 1, kind, text, model))
+    return usages
+
+
+class SymbolIndex:
+    """Field name -> usages across the configured source directories."""
+
+    def __init__(self, root: Path, schema_path: Optional[Path] = None,
+                 directories: Sequence[str] = DEFAULT_DIRECTORIES,
+                 cache_path: Optional[Path] = None):
+        self.root = root
+        self.schema_path = schema_path or root / "prisma/schema.prisma"
+        self.directories = tuple(directories)
+        self.cache_path = cache_path
+        self.fields: Dict[str, List[str]] = {}    # field name -> ["Model.field", ...]
+        self.files: Dict[str, dict] = {}          # rel path -> {size, mtime_ns, usages}
+        self._fingerprint = ''
+        self._pattern: Optional[re.Pattern] = None
+        self._schema_stat: Optional[Tuple[int, int]] = None
+        self._schema: Optional[prisma_schema.Schema] = None
+
+    # -- schema ---------------------------------------------------------
+
+    def _load_schema(self) -> bool:
+        """(Re)load the field set. Returns True if it differs from before."""
+        st = os.stat(self.schema_path)
+        self._schema_stat = (st.st_size, st.st_mtime_ns)
+        with open(self.schema_path, 'r', encoding='utf-8') as f:
+            schema = prisma_schema.parse(f.read())
+        self._schema = schema
+        fields: Dict[str, List[str]] = {}
+        for name, entries in schema.field_index.items():
+            fields[name] = [f"{model.name}.{fld.name}" for model, fld in entries]
+        self.fields = fields
+        names = sorted(fields, key=lambda name: (-len(name), name))
+        alternation = '|'.join(map(re.escape, names)) or '(?!)'
+        self._pattern = re.compile(r'(?<![\w$])(?:' + alternation + r')(?![\w$])')
+        previous = self._fingerprint
+        # Attribution depends on the models too, so they are part of the fingerprint.
+        self._fingerprint = hashlib.sha256('\n'.join(sorted(sum(fields.values(), []))).encode()).hexdigest()[:16]
+        return self._fingerprint != previous
+
+    # -- persistence ----------------------------------------------------
+
+    def _load_cache(self):
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("format") != FORMAT_VERSION or data.get("fields") != self._fingerprint:
+            return
+        if tuple(data.get("directories", ())) != self.directories:
+            return
+        self.files = {
+            rel: {**entry, "usages": [Usage(**usage) for usage in entry["usages"]]}
+            for rel, entry in data.get("files", {}).items()
+        }
+
+    def save(self):
+        if self.cache_path is None:
+            return
+        data = {
+            "format": FORMAT_VERSION,
+            "fields": self._fingerprint,
+            "directories": list(self.directories),
+            "files": {
+                rel: {**entry, "usages": [asdict(usage) for usage in entry["usages"]]}
+                for rel, entry in sorted(self.files.items())
+            },
+        }
+        tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.cache_path)
+
+    # -- building -------------------------------------------------------
+
+    def _walk(self) -> Iterable[Tuple[str, os.stat_result]]:
+        for directory in self.directories:
+            for dirpath, dirnames, filenames in os.walk(self.root / directory):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith(SOURCE_SUFFIXES):
+                        path = Path(dirpath, filename)
+                        yield path.relative_to(self.root).as_posix(), os.stat(path)
+
+    def _scan(self, rel: str, st: os.stat_result):
+        with open(self.root / rel, 'r', encoding='utf-8') as f:
+            content = f.read()
+        self.files[rel] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "usages": scan_usages(content, self._pattern, rel, self._schema),
+        }
+
+    def refresh(self) -> List[str]:
+        """Bring the index up to date. Returns the rel paths that were rescanned."""
+        if self._pattern is None:
+            self._load_schema()
+            self._load_cache()
+        else:
+            st = os.stat(self.schema_path)
+            if (st.st_size, st.st_mtime_ns) != self._schema_stat and self._load_schema():
+                # New field set: every file has to be rescanned.
+                self.files = {}
+        seen = set()
+        rescanned = []
+        for rel, st in self._walk():
+            seen.add(rel)
+            entry = self.files.get(rel)
+            if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                continue
+            self._scan(rel, st)
+            rescanned.append(rel)
+        for rel in set(self.files) - seen:
+            del self.files[rel]
+        return rescanned
+
+    # -- queries --------------------------------------------------------
+
+    def resolve(self, symbol: str) -> str:
+        """Field name for `Model.field` or a bare field name."""
+        if '.' in symbol:
+            model, name = symbol.split('.', 1)
+            if symbol not in self.fields.get(name, ()):
+                raise KeyError(f"{symbol} is not declared in {self.schema_path.name}")
+            return name
+        if symbol not in self.fields:
+            raise KeyError(f"No model declares a field named {symbol}")
+        return symbol
+
+    def usages(self, symbol: str, kinds: Optional[Iterable[str]] = None) -> List[Usage]:
+        """Every usage of a field, optionally limited to some kinds.
+
+        A bare name matches every usage of that name. `Model.field` only
+        matches usages attributed to that model; usages that could belong
+        to several models are left out (see `unattributed`).
+        """
+        name = self.resolve(symbol)
+        model = symbol.split('.', 1)[0] if '.' in symbol else None
+        kinds = set(kinds) if kinds is not None else None
+        return [
+            usage
+            for entry in self.files.values()
+            for usage in entry["usages"]
+            if usage.name == name and (model is None or usage.model == model)
+            and (kinds is None or usage.kind in kinds)
+        ]
+
+    def unattributed(self, symbol: str, kinds: Optional[Iterable[str]] = None) -> List[Usage]:
+        """Usages of the field's name whose model could not be told."""
+        name = self.resolve(symbol)
+        return [usage for usage in self.usages(name, kinds) if not usage.model]
+
+    def by_field(self) -> Dict[str, List[Usage]]:
+        index: Dict[str, List[Usage]] = {name: [] for name in self.fields}
+        for entry in self.files.values():
+            for usage in entry["usages"]:
+                index.setdefault(usage.name, []).append(usage)
+        return index
+
+    def unused_fields(self) -> List[str]:
+        return sorted(name for name, usages in self.by_field().items() if not usages)
+
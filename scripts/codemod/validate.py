@@ -0,0 +1,435 @@
+"""
+Structural sanity check for TS/TSX produced by the codemods.
+
+Not a parser: a single-pass lexer that tracks brackets, string and
+template literals (with `${}` nesting), comments, regex literals and JSX
+elements, and reports what a line-deleting rule typically breaks:
+
+- unbalanced or mismatched `()[]{}` and JSX open/close tags;
+- strings left open at the end of a line, templates and comments left
+  open at the end of the file;
+- orphaned commas (`(,`, `{,`, `,,`) and binary operators directly
+  followed by a closing bracket, `,`, `;` or a statement keyword
+  (`a &&)`, `x = ;`, `a && return`).
+
+It runs in milliseconds per file, so rewrites can be checked after every
+transform instead of waiting for `next build`. `checked` wraps a content
+transform so that output with any problem its input did not have is
+rejected and the file is left untouched.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from . import budget
+
+_IDENT = re.compile(r'[A-Za-z_$][\w$]*')
+_NUMBER = re.compile(r'\d[\w.]*')
+_OPERATOR = re.compile(
+    r'\?\?=?|\?\.|=>|===?|!==?|&&=?|\|\|=?|\+\+|--|\.\.\.|\*\*=?|[-+*/%&|^!]=?|[=?:~.@#]'
+)
+_SPACE = re.compile(r'(?:\s+|//[^\n]*|/\*.*?\*/)*', re.S)
+_JSX_NAME = re.compile(r'[A-Za-z_$][\w$.:-]*')
+_JSX_TEXT = re.compile(r'[^<{]+')
+# `<T,>(...)` and `<T extends X>(...)`: a generic arrow function, not JSX.
+_ARROW_GENERIC = re.compile(r'<\s*[A-Za-z_$][\w$]*\s*(?:,|extends\s)')
+
+# Operators that cannot be directly followed by a closer, `,` or `;`.
+_BINARY = frozenset({
+    '&&', '||', '??', '=', '==', '===', '!=', '!==', '=>', '+=', '-=', '*=', '/=',
+    '&&=', '||=', '??=', '%', '*', '**', '|', '&', '^',
+})
+# Tokens after which `/` starts a regex and `<` may start JSX.
+_EXPRESSION_KEYWORDS = frozenset({
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'yield', 'await', 'instanceof',
+})
+# Statement keywords that cannot be an operand.
+_STATEMENT_KEYWORDS = re.compile(
+    r'(?:return|const|let|var|if|for|while|do|switch|try|break|continue|export)(?![\w$])'
+)
+_CLOSERS = {')': '(', ']': '[', '}': '{'}
+
+
+@dataclass(frozen=True)
+class Problem:
+    start: int
+    end: int
+    line: int
+    column: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.line}:{self.column} {self.message}"
+
+
+class InvalidOutput(ValueError):
+    """A transform produced structurally broken code."""
+
+
+class _Frame:
+    __slots__ = ('kind', 'start', 'tag')
+
+    def __init__(self, kind: str, start: int, tag: str = ''):
+        self.kind = kind    # '(' '[' '{' '${' 'tag' 'jsx'
+        self.start = start
+        self.tag = tag
+
+
+class _Lexer:
+    def __init__(self, content: str, jsx: bool):
+        self.content = content
+        self.jsx = jsx
+        self.problems: List[Problem] = []
+        self.stack: List[_Frame] = []
+        self.prev = ''          # last significant code token
+        self.prev_end = 0
+
+    def report(self, start: int, end: int, message: str):
+        line = self.content.count('\n', 0, start) + 1
+        column = start - self.content.rfind('\n', 0, start)
+        self.problems.append(Problem(start, end, line, column, message))
+
+    # -- helpers ----------------------------------------------------------
+
+    def _expression_start(self) -> bool:
+        """True where an operand (regex literal, JSX element) may begin."""
+        prev = self.prev
+        if not prev:
+            return True
+        if prev in _EXPRESSION_KEYWORDS:
+            return True
+        if prev[0].isalnum() or prev[0] in '_$' or prev in (')', ']', '}', '++', '--'):
+            return False
+        if prev in ('"', '`', 'regex', 'number', 'jsx'):
+            return False
+        return True
+
+    def _next_significant(self, pos: int) -> int:
+        return _SPACE.match(self.content, pos).end()
+
+    def _check_orphans(self, token: str, start: int, end: int):
+        content = self.content
+        following = self._next_significant(end)
+        nxt = content[following:following + 1]
+        if token == ',':
+            top = self.stack[-1].kind if self.stack else ''
+            if nxt == ',' and top in ('(', '{'):
+                self.report(start, following + 1, "orphaned ','")
+            elif self.prev in ('(', '{') and top in ('(', '{') and self.prev_end == self._opener_end():
+                self.report(start, end, "orphaned ','")
+        elif token in _BINARY and nxt and nxt in ')]},;':
+            if token == '*' and self.prev in ('{', ','):
+                return  # `export * from`, `import * as`
+            self.report(start, following + 1, f"'{token}' without a right operand")
+        elif token in _BINARY and _STATEMENT_KEYWORDS.match(content, following):
+            self.report(start, following, f"'{token}' without a right operand")
+        elif token == '?' and nxt and nxt in ')};':
+            self.report(start, following + 1, "'?' without a right operand")
+        elif token == ':' and nxt and nxt in ',)];':
+            self.report(start, following + 1, "':' without a value")
+
+    def _opener_end(self) -> int:
+        return self.stack[-1].start + 1 if self.stack else -1
+
+    # -- scanners ---------------------------------------------------------
+
+    def _string(self, pos: int) -> int:
+        content = self.content
+        quote = content[pos]
+        i = pos + 1
+        length = len(content)
+        while i < length:
+            char = content[i]
+            if char == '\\':
+                i += 2
+                continue
+            if char == quote:
+                return i + 1
+            if char == '\n':
+                break
+            i += 1
+        self.report(pos, i, f"unterminated string {quote}")
+        return i
+
+    def _template(self, pos: int) -> int:
+        """Scan template text from `pos` (after ` or }); returns the next position."""
+        content = self.content
+        length = len(content)
+        i = pos
+        while i < length:
+            char = content[i]
+            if char == '\\':
+                i += 2
+                continue
+            if char == '`':
+                self.prev = '`'
+                self.prev_end = i + 1
+                return i + 1
+            if content.startswith('${', i):
+                self.stack.append(_Frame('${', i))
+                self.prev = '{'
+                self.prev_end = i + 2
+                return i + 2
+            i += 1
+        self.report(pos, length, "unterminated template literal")
+        return length
+
+    def _regex(self, pos: int) -> int:
+        content = self.content
+        length = len(content)
+        i = pos + 1
+        in_class = False
+        while i < length:
+            char = content[i]
+            if char == '\\':
+                i += 2
+                continue
+            if char == '\n':
+                break
+            if in_class:
+                if char == ']':
+                    in_class = False
+            elif char == '[':
+                in_class = True
+            elif char == '/':
+                i += 1
+                while i < length and (content[i].isalnum() or content[i] == '_'):
+                    i += 1
+                return i
+            i += 1
+        self.report(pos, i, "unterminated regex literal")
+        return i
+
+    def _open_tag(self, pos: int) -> int:
+        """Scan a JSX open tag from `<`; pushes a 'jsx' frame unless self-closing."""
+        name = _JSX_NAME.match(self.content, pos + 1)
+        frame = _Frame('tag', pos, name.group() if name else '')
+        return self._tag_attributes(frame, name.end() if name else pos + 1)
+
+    def _tag_attributes(self, frame: _Frame, pos: int) -> int:
+        """Scan attributes up to `>` or `/>`, or up to an attribute `{...}`.
+
+        In the latter case the tag frame is pushed below the expression's
+        `{` frame and scanning resumes here once the expression closes.
+        """
+        content = self.content
+        length = len(content)
+        i = pos
+        while i < length:
+            i = self._next_significant(i)
+            if i >= length:
+                break
+            char = content[i]
+            if content.startswith('/>', i):
+                self.prev = 'jsx'
+                self.prev_end = i + 2
+                return i + 2
+            if char == '>':
+                self.stack.append(_Frame('jsx', frame.start, frame.tag))
+                return i + 1
+            if char in '"\'':
+                # Attribute strings may span lines and have no escapes.
+                end = content.find(char, i + 1)
+                if end < 0:
+                    self.report(i, length, f"unterminated attribute string {char}")
+                    return length
+                i = end + 1
+            elif char == '{':
+                self.stack.append(frame)
+                self.stack.append(_Frame('{', i))
+                self.prev = '{'
+                self.prev_end = i + 1
+                return i + 1
+            elif char == '<':
+                # Generic component: <Select<Option> ...>
+                i = content.find('>', i) + 1 or length
+            else:
+                i += 1
+        self.report(frame.start, length, f"unterminated tag <{frame.tag}>")
+        return length
+
+    def _children(self, pos: int) -> int:
+        """Scan JSX children of the top 'jsx' frame from `pos`."""
+        content = self.content
+        length = len(content)
+        frame = self.stack[-1]
+        text = _JSX_TEXT.match(content, pos)
+        i = text.end() if text else pos
+        if i >= length:
+            return length
+        if content[i] == '{':
+            self.stack.append(_Frame('{', i))
+            self.prev = '{'
+            self.prev_end = i + 1
+            return i + 1
+        # content[i] == '<'
+        if content.startswith('</', i):
+            name = _JSX_NAME.match(content, i + 2)
+            tag = name.group() if name else ''
+            end = content.find('>', name.end() if name else i + 2)
+            if end < 0:
+                self.report(i, length, "unterminated closing tag")
+                return length
+            self.stack.pop()
+            if tag != frame.tag:
+                expected = f"</{frame.tag}>" if frame.tag else "</>"
+                self.report(i, end + 1, f"</{tag}> closes <{frame.tag}> (expected {expected})")
+            self.prev = 'jsx'
+            self.prev_end = end + 1
+            return end + 1
+        if content.startswith('<>', i):
+            self.stack.append(_Frame('jsx', i, ''))
+            return i + 2
+        return self._open_tag(i)
+
+    # -- main loop --------------------------------------------------------
+
+    def run(self) -> List[Problem]:
+        content = self.content
+        length = len(content)
+        pos = 0
+        while pos < length:
+            top = self.stack[-1] if self.stack else None
+            if top is not None and top.kind == 'jsx':
+                pos = self._children(pos)
+                continue
+            if top is not None and top.kind == 'tag':
+                self.stack.pop()
+                pos = self._tag_attributes(top, pos)
+                continue
+            pos = self._next_significant(pos)
+            if pos >= length:
+                break
+            if content.startswith('/*', pos):
+                self.report(pos, length, "unterminated comment")
+                break
+            char = content[pos]
+            start = pos
+            if char in '"\'':
+                pos = self._string(pos)
+                self.prev, self.prev_end = '"', pos
+            elif char == '`':
+                pos = self._template(pos + 1)
+            elif char in '([{':
+                self.stack.append(_Frame(char, pos))
+                self.prev, self.prev_end = char, pos + 1
+                pos += 1
+            elif char in ')]}':
+                pos = self._close(char, pos)
+            elif char == '/' and self._expression_start():
+                pos = self._regex(pos)
+                self.prev, self.prev_end = 'regex', pos
+            elif char == '<' and self.jsx and self._expression_start() and (
+                    content.startswith('<>', pos) or _JSX_NAME.match(content, pos + 1)) \
+                    and not _ARROW_GENERIC.match(content, pos):
+                if content.startswith('<>', pos):
+                    self.stack.append(_Frame('jsx', pos, ''))
+                    pos += 2
+                else:
+                    pos = self._open_tag(pos)
+            elif char == ',' or char == ';':
+                if char == ',':
+                    self._check_orphans(',', pos, pos + 1)
+                self.prev, self.prev_end = char, pos + 1
+                pos += 1
+            else:
+                match = _IDENT.match(content, pos) or _NUMBER.match(content, pos)
+                if match:
+                    pos = match.end()
+                    self.prev = match.group() if match.re is _IDENT else 'number'
+                    self.prev_end = pos
+                    continue
+                match = _OPERATOR.match(content, pos)
+                if match and match.group() not in ('<', '>'):
+                    token = match.group()
+                    pos = match.end()
+                    self._check_orphans(token, start, pos)
+                    self.prev, self.prev_end = token, pos
+                else:
+                    self.prev, self.prev_end = char, pos + 1
+                    pos += 1
+        for frame in reversed(self.stack):
+            if frame.kind == 'jsx':
+                self.report(frame.start, frame.start + 1, f"<{frame.tag}> is never closed")
+            elif frame.kind == '${':
+                self.report(frame.start, frame.start + 2, "unterminated template literal")
+            else:
+                self.report(frame.start, frame.start + 1, f"'{frame.kind}' is never closed")
+        return self.problems
+
+    def _close(self, char: str, pos: int) -> int:
+        opener = _CLOSERS[char]
+        top = self.stack[-1] if self.stack else None
+        if top is not None and top.kind == '${' and char == '}':
+            self.stack.pop()
+            return self._template(pos + 1)
+        if top is None or top.kind != opener:
+            # Recover: pop to a matching opener if there is one.
+            for depth in range(len(self.stack) - 1, -1, -1):
+                if self.stack[depth].kind == opener:
+                    self.report(pos, pos + 1, f"'{char}' closes '{opener}' with "
+                                              f"'{self.stack[-1].kind}' still open")
+                    del self.stack[depth:]
+                    break
+            else:
+                self.report(pos, pos + 1, f"unbalanced '{char}'")
+        else:
+            self.stack.pop()
+        self.prev, self.prev_end = char, pos + 1
+        return pos + 1
+
+
+def validate(content: str, jsx: Optional[bool] = None) -> List[Problem]:
+    """Structural problems in a TS/TSX source.
+
+    `jsx` defaults to guessing from the content (any `</` or `/>`).
+    """
+    if jsx is None:
+        jsx = '</' in content or '/>' in content
+    return _Lexer(content, jsx).run()
+
+
+def _signature(problem: Problem, content: str) -> Tuple[str, str]:
+    """The problem's message and the text of its line, which survive line shifts."""
+    start = content.rfind('\n', 0, problem.start) + 1
+    end = content.find('\n', problem.start)
+    return problem.message, content[start:end if end >= 0 else len(content)].strip()
+
+
+def new_problems(before: str, after: str) -> List[Problem]:
+    """Problems in `after` that `before` does not have, matched by message and line text."""
+    problems = validate(after)
+    if not problems:
+        return []
+    known = Counter(_signature(problem, before) for problem in validate(before))
+    introduced = []
+    for problem in problems:
+        signature = _signature(problem, after)
+        if known[signature]:
+            known[signature] -= 1
+        else:
+            introduced.append(problem)
+    return introduced
+
+
+def checked(transform: Callable[[str], str], content: str) -> str:
+    """Run `transform` and reject output that has a problem the input did not have.
+
+    Meant to be bound with functools.partial (picklable for worker
+    processes). Problems already present in the input are tolerated, so
+    only breakage introduced by the transform is reported, even when the
+    same rewrite also removes another problem.
+    """
+    result = transform(content)
+    if result == content:
+        return result
+    budget.running()    # time spent from here on is not a rule's
+    problems = new_problems(content, result)
+    if problems:
+        shown = '; '.join(str(problem) for problem in problems[:3])
+        more = f" (+{len(problems) - 3} more)" if len(problems) > 3 else ''
+        raise InvalidOutput(f"rewrite rolled back, output is broken: {shown}{more}")
+    return result
@@ -0,0 +1,240 @@
+"""
+Watch source directories and hand batches of changed files to a callback.
+
+On Linux the kernel's inotify API is used directly through ctypes, so no
+third-party package is needed; elsewhere (or with `poll=True`) the tree is
+re-stat'ed every `interval` seconds. Events are debounced: a batch is only
+delivered once no new change has arrived for `debounce` seconds, so an
+editor's save-and-rename or a `git checkout` is handled as one batch.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence, Set, Tuple
+
+from .files import SOURCE_SUFFIXES
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE
+_EVENT = struct.Struct('iIII')
+
+
+def _source_dirs(root: Path, directories: Sequence[str]) -> Iterable[Path]:
+    for directory in directories:
+        base = root / directory
+        for dirpath, dirnames, _ in os.walk(base):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != 'node_modules']
+            yield Path(dirpath)
+
+
+class PollingWatcher:
+    """Portable fallback: compare (mtime, size) snapshots of the tree."""
+
+    def __init__(self, root: Path, directories: Sequence[str],
+                 suffixes: Sequence[str] = SOURCE_SUFFIXES, interval: float = 0.5):
+        self.root = root
+        self.directories = tuple(directories)
+        self.suffixes = tuple(suffixes)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for directory in _source_dirs(self.root, self.directories):
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.name.endswith(self.suffixes) and entry.is_file():
+                        st = entry.stat()
+                        snapshot[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    # Removed between the listing and the stat
+                    continue
+        return snapshot
+
+    def poll(self, timeout: float) -> Set[Path]:
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {path for path, stamp in current.items() if self._snapshot.get(path) != stamp}
+        changed |= set(self._snapshot) - set(current)
+        self._snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Recursive inotify watch on the source directories (Linux only)."""
+
+    def __init__(self, root: Path, directories: Sequence[str],
+                 suffixes: Sequence[str] = SOURCE_SUFFIXES):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.directories = tuple(directories)
+        self.suffixes = tuple(suffixes)
+        self._dirs: Dict[int, Path] = {}
+        self._watch_tree(root, self.directories)
+
+    def _watch_tree(self, root: Path, directories: Sequence[str]):
+        """Watch every directory below `root`/`directories` that can be watched.
+
+        A directory that cannot be added (permissions, a full
+        max_user_watches, removed meanwhile) is reported and skipped.
+        """
+        for directory in _source_dirs(root, directories):
+            try:
+                self._add(directory)
+            except OSError as e:
+                print(f"Not watching {directory}: {e}")
+
+    def _add(self, directory: Path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {directory}: {os.strerror(errno)}")
+        self._dirs[wd] = directory
+
+    def _all_files(self) -> Set[Path]:
+        return {
+            Path(dirpath, name)
+            for directory in self.directories
+            for dirpath, _, names in os.walk(self.root / directory)
+            for name in names if name.endswith(self.suffixes)
+        }
+
+    def poll(self, timeout: float) -> Set[Path]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return set()
+        changed: Set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: treat everything as changed.
+                return self._all_files()
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # New directory: watch it and pick up files already inside.
+                    self._watch_tree(path, ('.',))
+                    try:
+                        changed |= {p for p in path.rglob('*') if p.name.endswith(self.suffixes)}
+                    except OSError:
+                        pass
+                continue
+            if name.endswith(self.suffixes):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(root: Path, directories: Sequence[str], poll: bool = False,
+                 interval: float = 0.5):
+    """inotify watcher where available, polling otherwise."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root, directories)
+        except (OSError, AttributeError) as e:
+            print(f"inotify unavailable ({e}); polling every {interval}s")
+    return PollingWatcher(root, directories, interval=interval)
+
+
+def watch(root: Path, directories: Sequence[str], handle: Callable[[Sequence[Path]], None],
+          debounce: float = 0.2, poll: bool = False, interval: float = 0.5,
+          stop: Optional[Callable[[], bool]] = None):
+    """Call `handle(paths)` for every debounced batch of changed files.
+
+    Events for files that `handle` itself rewrote are not reported back as
+    long as the file still holds the bytes it wrote; an edit made in the
+    meantime is. Runs until interrupted or `stop()` returns True.
+    """
+    watcher = make_watcher(root, directories, poll, interval)
+    pending: Set[Path] = set()
+    last_event = 0.0
+    try:
+        while stop is None or not stop():
+            timeout = debounce if pending else 1.0
+            changed = watcher.poll(timeout)
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                last_event = now
+                continue
+            if pending and now - last_event >= debounce:
+                batch = sorted(pending)
+                pending = set()
+                before = _stats(batch)
+                handle(batch)
+                # Swallow the events caused by our own writes, but only while
+                # the file still has the content we wrote.
+                own = {path: _digest(path) for path, stamp in _stats(batch).items()
+                       if stamp != before.get(path)}
+                if own:
+                    settle = time.monotonic() + debounce
+                    while time.monotonic() < settle:
+                        for path in watcher.poll(debounce):
+                            if path not in own or _digest(path) != own[path]:
+                                pending.add(path)
+                    if pending:
+                        last_event = time.monotonic()
+    finally:
+        watcher.close()
+
+
+def _digest(path: Path) -> Optional[bytes]:
+    try:
+        return hashlib.sha256(path.read_bytes()).digest()
+    except OSError:
+        return None
+
+
+def _stats(paths: Iterable[Path]) -> Dict[Path, Tuple[int, int]]:
+    stats = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stats[path] = (st.st_mtime_ns, st.st_size)
+    return stats
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Show where Prisma model fields are used in src/app/api, src/components and src/hooks.
+
+    python3 scripts/find_field_usages.py Product.name_th
+    python3 scripts/find_field_usages.py --suffix _th --suffix _zh
+    python3 scripts/find_field_usages.py --unused
+
+`Model.field` only lists usages known to belong to that model; usages of a
+name several models share that cannot be attributed are counted, and
+listed with --ambiguous.
+"""
+
+import argparse
+from pathlib import Path
+
+from codemod.files import REPO_ROOT
+from codemod.symbols import INDEX_NAME, SymbolIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("symbols", nargs="*", help="Model.field or bare field names")
+    parser.add_argument("--suffix", action="append", default=[],
+                        help="Report every field ending with SUFFIX (repeatable)")
+    parser.add_argument("--kind", action="append",
+                        help="Only usages of this kind: access, key, entry, string, reference")
+    parser.add_argument("--ambiguous", action="store_true",
+                        help="With Model.field, also list usages whose model could not be told")
+    parser.add_argument("--unused", action="store_true", help="List fields with no usages")
+    parser.add_argument("--root", type=Path, default=REPO_ROOT)
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Rebuild from scratch instead of updating <root>/{INDEX_NAME}")
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+    index = SymbolIndex(root, cache_path=None if args.no_cache else root / INDEX_NAME)
+    rescanned = index.refresh()
+    index.save()
+    print(f"Indexed {len(index.files)} files ({len(rescanned)} rescanned)\n")
+
+    if args.unused:
+        for name in index.unused_fields():
+            print(f"- {', '.join(index.fields[name])}")
+        return
+
+    symbols = list(args.symbols)
+    if args.suffix:
+        symbols += sorted(name for name in index.fields if name.endswith(tuple(args.suffix)))
+    if not symbols:
+        parser.error("give a field, --suffix or --unused")
+
+    for symbol in symbols:
+        try:
+            usages = index.usages(symbol, args.kind)
+        except KeyError as e:
+            print(f"✗ {e.args[0]}")
+            continue
+        name = index.resolve(symbol)
+        print(f"{symbol} ({', '.join(index.fields[name])}): {len(usages)} usages")
+        for usage in usages:
+            print(f"  {usage.path}:{usage.line}:{usage.column} [{usage.kind}] {usage.text}")
+        if '.' in symbol:
+            unknown = index.unattributed(symbol, args.kind)
+            if unknown:
+                print(f"  ({len(unknown)} more usages of {name} could belong to another model)")
+            if args.ambiguous:
+                for usage in unknown:
+                    print(f"  ? {usage.path}:{usage.line}:{usage.column} [{usage.kind}] {usage.text}")
+
+
+if __name__ == "__main__":
+    main()
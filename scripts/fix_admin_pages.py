@@ -1,59 +1,85 @@
 #!/usr/bin/env python3
 """
-Add 'use client' to all admin page files that have buttons with onClick.
+Add 'use client' to exactly the modules that need it.
+
+Instead of a hand-picked list of admin pages, the import graph of src/ is
+analyzed (see codemod/client_boundary.py): a module gets the directive
+when a server component renders it and it uses onClick-style handlers,
+hooks or browser APIs itself. Modules below such a boundary are client
+code already and are left alone, so the client bundle stays minimal.
 """
 
+import argparse
+import sys
 from pathlib import Path
 
+from codemod.client_boundary import ImportGraph, add_directive, remove_directive
+from codemod.files import REPO_ROOT
+from codemod.output import add_dry_run_argument, dry_run, read_text, write_if_changed
+
+
 def add_use_client(file_path):
     """Add 'use client' directive if not present."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+    content = read_text(file_path)
+
     # Check if already has 'use client'
     if "'use client'" in content or '"use client"' in content:
         return False
-    
-    # Add 'use client' at the beginning
-    new_content = "'use client';\n\n" + content
-    
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
-    
-    return True
+
+    return write_if_changed(file_path, add_directive(content), content)
+
+
+def remove_use_client(file_path):
+    """Drop a leading 'use client' directive."""
+    content = read_text(file_path)
+    return write_if_changed(file_path, remove_directive(content), content)
+
 
 def main():
-    base = Path("/Users/aphilack/Downloads/namngarm-main-main")
-    
-    # All admin pages that have <button> elements
-    files = [
-        "src/app/admin/users/page.tsx",
-        "src/app/admin/categories/[id]/edit/page.tsx",
-        "src/app/admin/media/page.tsx",
-        "src/app/admin/categories/page.tsx",
-        "src/app/admin/dashboard/page.tsx",
-        "src/app/admin/products/page.tsx",
-        "src/app/admin/products/[id]/edit/page.tsx",
-        "src/app/admin/quick-links/page.tsx",
-        "src/app/admin/articles/page.tsx",
-        "src/app/admin/faqs/FAQsClient.tsx",
-        "src/app/admin/articles/[id]/edit/page.tsx",
-        "src/app/admin/settings/page.tsx",
-    ]
-    
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--root", type=Path, default=REPO_ROOT,
+                        help="Repository root (default: this checkout)")
+    parser.add_argument("--check", action="store_true",
+                        help="Only report; exit with status 1 if a directive is missing")
+    parser.add_argument("--prune", action="store_true",
+                        help="Also remove directives that force server-rendered modules onto the client")
+    add_dry_run_argument(parser)
+    args = parser.parse_args()
+    base = args.root.resolve()
+    with dry_run(args.dry_run, base):
+        fix(base, args)
+
+
+def fix(base, args):
+    report = ImportGraph(base).analyze()
+    print(f"{len(report.boundaries)} client boundaries")
+
     updated = 0
-    for file_rel in files:
-        file_path = base / file_rel
-        if file_path.exists():
-            if add_use_client(file_path):
-                print(f"✓ {file_rel}")
-                updated += 1
-            else:
-                print(f"- {file_rel} (already has 'use client')")
+    for file_rel in report.missing:
+        if args.check:
+            print(f"✗ {file_rel} (missing 'use client')")
+        elif add_use_client(base / file_rel):
+            print(f"✓ {file_rel}")
+            updated += 1
+
+    for file_rel in report.redundant:
+        if args.prune and not args.check:
+            if remove_use_client(base / file_rel):
+                print(f"✓ {file_rel} (removed 'use client')")
         else:
-            print(f"✗ {file_rel} (not found)")
-    
-    print(f"\nAdded 'use client' to {updated} files")
+            print(f"- {file_rel} ('use client' not needed)")
+
+    for file_rel, client, server in report.conflicts:
+        print(f"✗ {file_rel} uses {', '.join(client)} but also {', '.join(server)}; split it")
+    if report.unreached:
+        print(f"\n{len(report.unreached)} client modules are not imported by any route:")
+        for file_rel in report.unreached:
+            print(f"  {file_rel}")
+
+    if args.check:
+        sys.exit(1 if report.missing else 0)
+    print(f"\n{'Would add' if args.dry_run else 'Added'} 'use client' to {updated} files")
+
 
 if __name__ == "__main__":
     main()
@@ -1,25 +1,38 @@
 #!/usr/bin/env python3
-import re
+"""
+Make the _th and _zh fields in prisma/schema.prisma optional.
+"""
 
-with open('prisma/schema.prisma', 'r') as f:
-    content = f.read()
+import argparse
 
-# Make _th and _zh fields optional by adding ? if not already present
-lines = content.split('\n')
-new_lines = []
+from codemod import prisma_schema
+from codemod.files import REPO_ROOT
+from codemod.output import add_dry_run_argument, dry_run, read_text, write_if_changed
 
-for line in lines:
-    # Check if line contains _th or _zh field definition
-    if re.search(r'(\w+_(th|zh))\s+(String|Json)\s*(@|$)', line):
-        # Check if it's not already optional
-        if '?' not in line.split('@')[0]:  # Check before any @ attributes
-            # Add ? after the type
-            line = re.sub(r'(\w+_(th|zh)\s+)(String|Json)(\s+)', r'\1\3?\4', line)
-    new_lines.append(line)
+SCHEMA_PATH = REPO_ROOT / "prisma/schema.prisma"
 
-content = '\n'.join(new_lines)
+def make_lang_optional(content: str, suffixes=('_th', '_zh'), types=('String', 'Json')) -> str:
+    """Make _th and _zh fields optional by adding ? if not already present."""
+    schema = prisma_schema.parse(content)
+    schema.make_optional(suffixes, types)
+    return schema.render()
 
-with open('prisma/schema.prisma', 'w') as f:
-    f.write(content)
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_dry_run_argument(parser)
+    args = parser.parse_args()
 
-print('✓ Updated Prisma schema - all _th and _zh fields are now optional')
+    original = read_text(SCHEMA_PATH)
+
+    content = make_lang_optional(original)
+
+    with dry_run(args.dry_run, REPO_ROOT):
+        if not write_if_changed(SCHEMA_PATH, content, original):
+            print('- Prisma schema already has all _th and _zh fields optional')
+        elif args.dry_run:
+            print('✓ Would make all _th and _zh fields in the Prisma schema optional')
+        else:
+            print('✓ Updated Prisma schema - all _th and _zh fields are now optional')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Bulk locale-field operations on prisma/schema.prisma.
+
+The schema is parsed once; the operation is applied to every model in a
+single pass and the schema is printed back in `prisma format` layout.
+
+    python3 scripts/prisma_fields.py optional --suffix _th --suffix _zh
+    python3 scripts/prisma_fields.py drop --suffix _zh
+    python3 scripts/prisma_fields.py rename --suffix _en --to _eng
+"""
+
+import argparse
+from pathlib import Path
+
+from codemod import prisma_schema
+from codemod.files import REPO_ROOT
+from codemod.output import add_dry_run_argument, dry_run, read_text, write_if_changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("operation", choices=("optional", "drop", "rename"))
+    parser.add_argument("--suffix", action="append", required=True,
+                        help="Field-name suffix to operate on (repeatable; rename takes one)")
+    parser.add_argument("--to", metavar="SUFFIX", help="New suffix for rename")
+    parser.add_argument("--types", help="Comma-separated scalar types for optional (default: all scalars)")
+    parser.add_argument("--schema", type=Path, default=REPO_ROOT / "prisma/schema.prisma")
+    add_dry_run_argument(parser)
+    args = parser.parse_args()
+
+    if args.operation == "rename" and (args.to is None or len(args.suffix) != 1):
+        parser.error("rename takes exactly one --suffix and a --to suffix")
+
+    original = read_text(args.schema)
+    schema = prisma_schema.parse(original)
+
+    try:
+        if args.operation == "optional":
+            count = schema.make_optional(args.suffix, args.types.split(",") if args.types else None)
+            summary = f"made {count} fields optional"
+        elif args.operation == "drop":
+            count = schema.drop(args.suffix)
+            summary = f"dropped {count} fields"
+        else:
+            count = schema.rename_suffix(args.suffix[0], args.to)
+            summary = f"renamed {count} fields"
+    except ValueError as e:
+        print(f"✗ {e}")
+        raise SystemExit(1)
+
+    content = schema.render()
+    with dry_run(args.dry_run, REPO_ROOT):
+        if write_if_changed(args.schema, content, original):
+            print(f"✓ {args.schema}: {summary}")
+        else:
+            print(f"- {args.schema} (no changes)")
+
+
+if __name__ == "__main__":
+    main()
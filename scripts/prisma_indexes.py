@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Compare the indexes in prisma/schema.prisma with the queries under src/.
+
+Every prisma.<model>.findMany/findFirst/count/... call is parsed for the
+fields it filters and sorts on (see codemod/prisma_queries.py). Queries no
+index covers get a suggested @@index; declared indexes no query uses, or
+that repeat a prefix of another index, are listed as well.
+
+    python3 scripts/prisma_indexes.py
+    python3 scripts/prisma_indexes.py --check
+    python3 scripts/prisma_indexes.py --write --dry-run
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from codemod import prisma_queries, prisma_schema
+from codemod.files import REPO_ROOT
+from codemod.output import add_dry_run_argument, dry_run, read_text, write_if_changed
+
+
+def print_report(report):
+    for model, suggestions in report.missing.items():
+        for columns, patterns in suggestions.items():
+            print(f"✗ {model}: missing @@index([{', '.join(columns)}])")
+            for pattern in patterns:
+                print(f"    {pattern.location} {pattern.describe()}")
+    for model, index, wider in report.redundant:
+        print(f"- {model}: {index.text} is redundant with {wider.text}")
+    for model, index in report.unused:
+        print(f"- {model}: {index.text} is not used by any query")
+    for model, patterns in report.incomplete.items():
+        print(f"- {model}: {len(patterns)} queries not fully resolved, unused indexes not checked")
+        for pattern in patterns:
+            print(f"    {pattern.location} {pattern.describe()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=list(prisma_queries.DEFAULT_DIRECTORIES),
+                        help="Directories to scan, relative to --root (default: src)")
+    parser.add_argument("--root", type=Path, default=REPO_ROOT,
+                        help="Repository root (default: this checkout)")
+    parser.add_argument("--schema", type=Path, help="Schema file (default: <root>/prisma/schema.prisma)")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit with status 1 if a query has no covering index")
+    parser.add_argument("--write", action="store_true",
+                        help="Add the suggested @@index lines to the schema")
+    add_dry_run_argument(parser)
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+    schema_path = args.schema or root / "prisma/schema.prisma"
+    original = read_text(schema_path)
+    schema = prisma_schema.parse(original)
+
+    report = prisma_queries.analyze(root, schema, args.paths)
+    with dry_run(args.dry_run, root):
+        print(f"{len(report.patterns)} queries on {len({p.model for p in report.patterns})} models\n")
+        print_report(report)
+
+        missing = sum(len(suggestions) for suggestions in report.missing.values())
+        if args.write and missing:
+            added = prisma_queries.apply_suggestions(schema, report)
+            if write_if_changed(schema_path, schema.render(), original):
+                print(f"\n✓ Added {added} indexes to {schema_path}")
+        else:
+            print(f"\n{missing} missing, {len(report.unused)} unused, {len(report.redundant)} redundant indexes")
+
+    if args.check and missing:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
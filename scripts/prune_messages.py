@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Prune next-intl message catalogs down to the keys src/ uses.
+
+src/ is scanned once for useTranslations/getTranslations bindings and the
+keys passed to them (see codemod/messages.py). Every catalog in
+src/messages is compared against that index and against the other
+locales:
+
+    python3 scripts/prune_messages.py                  # report only
+    python3 scripts/prune_messages.py --check          # exit 1 on missing keys
+    python3 scripts/prune_messages.py --write          # prune the catalogs in place
+    python3 scripts/prune_messages.py --split out/messages
+
+--split writes one pruned file per locale and namespace
+(out/messages/<locale>/<namespace>.json) so a route can load only the
+namespaces it uses; the namespaces per App Router file are printed.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from codemod import messages
+from codemod.files import REPO_ROOT
+from codemod.output import add_dry_run_argument, dry_run, read_text, write_if_changed
+
+
+def print_report(report, index, verbose: bool):
+    for locale, keys in report.unused.items():
+        print(f"- {locale}: {len(keys)} unused keys")
+        if verbose:
+            for key in keys:
+                print(f"    {key}")
+    for locale, keys in report.missing.items():
+        for key in keys:
+            print(f"✗ {locale}: missing {key}{'' if index.uses(key) else ' (unused)'}")
+    for key, locales in report.undefined:
+        print(f"✗ {key} is used in src/ but not defined in {locales}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--root", type=Path, default=REPO_ROOT,
+                        help="Repository root (default: this checkout)")
+    parser.add_argument("--messages", metavar="DIR", default=messages.MESSAGES_DIR,
+                        help=f"Catalog directory relative to --root (default: {messages.MESSAGES_DIR})")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List every unused key")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit with status 1 if a key is missing from a locale or used but undefined")
+    parser.add_argument("--write", action="store_true", help="Remove unused keys from the catalogs")
+    parser.add_argument("--split", type=Path, metavar="DIR",
+                        help="Write pruned per-namespace catalogs to DIR/<locale>/<namespace>.json")
+    add_dry_run_argument(parser)
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+    messages_dir = root / args.messages
+    catalogs = messages.load_catalogs(messages_dir)
+    if not catalogs:
+        sys.exit(f"✗ No catalogs in {messages_dir}")
+    index = messages.build_index(root)
+    report = messages.compare(catalogs, index)
+
+    with dry_run(args.dry_run, root):
+        print(f"Scanned {len(index.files)} files using translations\n")
+        print_report(report, index, args.verbose)
+
+        for locale, catalog in catalogs.items():
+            pruned = messages.prune(catalog, index)
+            path = messages_dir / f"{locale}.json"
+            original = read_text(path)
+            content = messages.dumps(pruned)
+            size = f"{len(original.encode('utf-8'))} -> {len(content.encode('utf-8'))} bytes"
+            if args.write:
+                if write_if_changed(path, content, original):
+                    print(f"✓ {path.relative_to(root)} ({size})")
+                else:
+                    print(f"- {path.relative_to(root)} (no changes)")
+            elif not args.split:
+                print(f"  {locale}.json would shrink {size}")
+            if args.split:
+                out = (args.split if args.split.is_absolute() else root / args.split) / locale
+                if not args.dry_run:
+                    out.mkdir(parents=True, exist_ok=True)
+                for namespace, part in messages.split(pruned).items():
+                    if write_if_changed(out / f"{namespace}.json", messages.dumps(part)):
+                        print(f"✓ {out / f'{namespace}.json'}")
+
+        if args.split:
+            print("\nNamespaces per route file:")
+            for rel, namespaces in messages.route_namespaces(index).items():
+                print(f"  {rel}: {', '.join(namespaces)}")
+
+    if args.check and (any(report.missing.values()) or report.undefined):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
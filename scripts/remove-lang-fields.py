@@ -4,68 +4,92 @@ Script to remove Thai (_th) and Chinese (_zh) language fields from TypeScript/TS
 This will clean up forms, APIs, and type definitions to only support Lao (lo) and English (en).
 """
 
+import argparse
 import re
 import os
+from functools import partial
 from pathlib import Path
 
+from codemod.files import REPO_ROOT
+from codemod.output import add_dry_run_argument, dry_run, read_text, render_diff, write_if_changed
+from codemod.parallel import CHANGED, ERROR, run_files, summarize
+from codemod.rules import remove_locale_inputs
+
 def remove_language_fields(content: str, lang_suffix: str) -> str:
     """Remove all occurrences of fields with the given language suffix."""
     
-    # Pattern 1: Remove lines with field definitions (e.g., name_th: string)
-    content = re.sub(rf'^\s*\w+{lang_suffix}:.*?[,;]\s*$', '', content, flags=re.MULTILINE)
-    
-    # Pattern 2: Remove lines with zod schema definitions (e.g., name_th: z.string())
-    content = re.sub(rf'^\s*\w+{lang_suffix}:\s*z\..*?[,;]\s*$', '', content, flags=re.MULTILINE)
-    
-    # Pattern 3: Remove lines with default values (e.g., name_th: '',)
-    content = re.sub(rf'^\s*\w+{lang_suffix}:\s*[\'"].*?[\'"],?\s*$', '', content, flags=re.MULTILINE)
-    
-    # Pattern 4: Remove lines with initialData assignments (e.g., name_th: initialData?.name_th || '',)
-    content = re.sub(rf'^\s*\w+{lang_suffix}:\s*.*?\|\|.*?[,;]\s*$', '', content, flags=re.MULTILINE)
+    # Patterns 1-4 all need a `name_th:` key, pattern 6 a quoted '_th';
+    # skip the regex scans when the literal is absent
+    if f'{lang_suffix}:' in content:
+        # Pattern 1: Remove lines with field definitions (e.g., name_th: string)
+        content = re.sub(rf'^\s*\w+{lang_suffix}:.*?[,;]\s*$', '', content, flags=re.MULTILINE)
+        
+        # Pattern 2: Remove lines with zod schema definitions (e.g., name_th: z.string())
+        content = re.sub(rf'^\s*\w+{lang_suffix}:\s*z\..*?[,;]\s*$', '', content, flags=re.MULTILINE)
+        
+        # Pattern 3: Remove lines with default values (e.g., name_th: '',)
+        content = re.sub(rf'^\s*\w+{lang_suffix}:\s*[\'"].*?[\'"],?\s*$', '', content, flags=re.MULTILINE)
+        
+        # Pattern 4: Remove lines with initialData assignments (e.g., name_th: initialData?.name_th || '',)
+        content = re.sub(rf'^\s*\w+{lang_suffix}:\s*.*?\|\|.*?[,;]\s*$', '', content, flags=re.MULTILINE)
     
-    # Pattern 5: Remove Input/Textarea components with name_th/name_zh
-    content = re.sub(rf'<(?:Input|Textarea)[^>]*name="{lang_suffix}"[^>]*>.*?</(?:Input|Textarea)>', '', content, flags=re.DOTALL)
-    content = re.sub(rf'<(?:Input|Textarea)[^>]*name="{lang_suffix}"[^>]*/>', '', content)
+    # Pattern 5: Remove Input/Textarea components with name_th/name_zh (parses only <Input>/<Textarea> tags)
+    content = remove_locale_inputs(content, (lang_suffix,))
     
     # Pattern 6: Remove onChange handlers for _th/_zh fields
-    content = re.sub(rf"onChange=\{{.*?'{lang_suffix}'.*?\}}", '', content)
+    if f"'{lang_suffix}'" in content:
+        content = re.sub(rf"onChange=\{{.*?'{lang_suffix}'.*?\}}", '', content)
     
     # Clean up multiple empty lines
     content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
     
     return content
 
-def process_file(file_path: Path):
-    """Process a single file to remove _th and _zh fields."""
-    print(f"Processing: {file_path}")
+def transform_file(file_path: Path, diff_root: Path = None):
+    """Remove _th and _zh fields from a single file. Returns True if it changed.
+
+    With `diff_root` nothing is written; returns (changed, unified diff)
+    instead, so worker processes can hand the diff back in order.
+    """
+    content = read_text(file_path)
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original_content = content
-        
-        # Remove _th fields
-        content = remove_language_fields(content, '_th')
-        
-        # Remove _zh fields  
-        content = remove_language_fields(content, '_zh')
-        
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"  ✓ Updated {file_path}")
-            return True
+    original_content = content
+    
+    # Remove _th fields
+    content = remove_language_fields(content, '_th')
+    
+    # Remove _zh fields  
+    content = remove_language_fields(content, '_zh')
+    
+    if diff_root is not None:
+        return content != original_content, render_diff(file_path, original_content, content, diff_root)
+    return write_if_changed(file_path, content, original_content)
+
+def report(outcomes, sink=None):
+    """Print each result in order; in a dry run, also emit its diff."""
+    results = []
+    for result in outcomes:
+        if result.status == CHANGED:
+            print(f"  ✓ Updated {result.path}")
+            if sink is not None:
+                sink.write_lines([result.detail])
+        elif result.status == ERROR:
+            print(f"  ✗ Error processing {result.path}: {result.error}")
         else:
-            print(f"  - No changes needed for {file_path}")
-            return False
-            
-    except Exception as e:
-        print(f"  ✗ Error processing {file_path}: {e}")
-        return False
+            print(f"  - No changes needed for {result.path}")
+        results.append(result)
+    return results
 
 def main():
-    base_path = Path("/Users/aphilack/Downloads/namngarm-main-main")
+    parser = argparse.ArgumentParser(description="Remove _th/_zh fields from TS/TSX files.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="Worker processes (0 = one per CPU, default: 1)")
+    add_dry_run_argument(parser)
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+
+    base_path = REPO_ROOT
     
     # Directories to process
     directories = [
@@ -74,9 +98,7 @@ def main():
         base_path / "src/app/api",
     ]
     
-    files_processed = 0
-    files_updated = 0
-    
+    files = []
     for directory in directories:
         if not directory.exists():
             print(f"Directory not found: {directory}")
@@ -85,17 +107,20 @@ def main():
         print(f"\nProcessing directory: {directory}")
         
         # Find all .ts and .tsx files
-        for file_path in directory.rglob("*.ts*"):
-            if file_path.is_file():
-                files_processed += 1
-                if process_file(file_path):
-                    files_updated += 1
+        files.extend(p for p in directory.rglob("*.ts*") if p.is_file())
     
-    print(f"\n{'='*60}")
-    print(f"Summary:")
-    print(f"  Files processed: {files_processed}")
-    print(f"  Files updated: {files_updated}")
-    print(f"{'='*60}")
+    transform = partial(transform_file, diff_root=base_path) if args.dry_run else transform_file
+    with dry_run(args.dry_run, base_path) as sink:
+        results = report(run_files(transform, files, args.jobs), sink)
+        
+        counts = summarize(results)
+        print(f"\n{'='*60}")
+        print(f"Summary:")
+        print(f"  Files processed: {len(results)}")
+        print(f"  Files updated: {counts[CHANGED]}")
+        if counts[ERROR]:
+            print(f"  Files failed: {counts[ERROR]}")
+        print(f"{'='*60}")
 
 if __name__ == "__main__":
     main()
@@ -4,47 +4,50 @@ Comprehensive script to remove Thai (_th) and Chinese (_zh) language fields.
 This will update TypeScript/TSX files to only support Lao (lo) and English (en).
 """
 
+import argparse
 import re
 import sys
+from functools import partial
 from pathlib import Path
 
-def remove_th_zh_from_file(file_path: Path) -> bool:
-    """Remove _th and _zh fields from a single file."""
+from codemod.files import REPO_ROOT
+from codemod.output import add_dry_run_argument, dry_run, read_text, render_diff, write_if_changed
+from codemod.parallel import CHANGED, run_files
+from codemod.prefilter import matching_files
+from codemod.rules import remove_locale_input_blocks
+
+def remove_th_zh_from_file(file_path: Path, diff_root: Path = None):
+    """Remove _th and _zh fields from a single file.
+
+    With `diff_root` nothing is written; returns (changed, unified diff)
+    instead, so worker processes can hand the diff back in order.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = read_text(file_path)
         
         original = content
         
-        # 1. Remove type/interface field definitions
-        content = re.sub(r'^\s+\w+_(th|zh):.*?;\s*$', '', content, flags=re.MULTILINE)
-        
-        # 2. Remove object property assignments (e.g., name_th: '',)
-        content = re.sub(r'^\s+\w+_(th|zh):\s*[^,]+,?\s*$', '', content, flags=re.MULTILINE)
+        # 1./2. need a `name_th:`/`name_zh:` key; skip both scans without one
+        if '_th:' in content or '_zh:' in content:
+            # 1. Remove type/interface field definitions
+            content = re.sub(r'^\s+\w+_(th|zh):.*?;\s*$', '', content, flags=re.MULTILINE)
+            
+            # 2. Remove object property assignments (e.g., name_th: '',); the value
+            # stops at the end of its line, like the engine's property-assignment rule
+            content = re.sub(r'^\s+\w+_(th|zh):\s*[^,\n]+,?\s*$', '', content, flags=re.MULTILINE)
         
-        # 3. Remove HTML input/textarea elements for _th/_zh
-        # Match multi-line div blocks containing name_th or name_zh
-        content = re.sub(
-            r'<div[^>]*>\s*<label[^>]*>(?:Thai|Chinese|ไทย|中文)[^<]*</label>\s*<(?:input|textarea)[^>]*name="[^"]*_(th|zh)"[^>]*(?:/>|>[^<]*</(?:input|textarea)>)\s*</div>',
-            '',
-            content,
-            flags=re.DOTALL | re.MULTILINE
-        )
-        
-        # 4. Remove grid column items for Thai/Chinese
-        content = re.sub(
-            r'<div>\s*<label[^>]*>(?:Thai|Chinese|ไทย|中文)[^<]*</label>\s*<(?:input|textarea)[^>]*name="[^"]*_(th|zh)"[^>]*(?:/>|>[^<]*</(?:input|textarea)>)\s*</div>',
-            '',
-            content,
-            flags=re.DOTALL
-        )
+        # 3./4. Remove <div><label>Thai|Chinese</label><input name="…_th"/></div>
+        # blocks (including grid column items); only divs opening on a
+        # language label are parsed
+        content = remove_locale_input_blocks(content, ('_th', '_zh'))
         
         # 5. Remove language tab entries
-        content = re.sub(
-            r"{\s*code:\s*'(th|zh)',\s*label:\s*'[^']+',\s*flag:\s*'[^']+'\s*},?\s*",
-            '',
-            content
-        )
+        if 'code:' in content:
+            content = re.sub(
+                r"{\s*code:\s*'(th|zh)',\s*label:\s*'[^']+',\s*flag:\s*'[^']+'\s*},?\s*",
+                '',
+                content
+            )
         
         # 6. Clean up empty lines (max 2 consecutive)
         content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
@@ -52,58 +55,51 @@ def remove_th_zh_from_file(file_path: Path) -> bool:
         # 7. Fix trailing commas in arrays/objects
         content = re.sub(r',(\s*[}\]])', r'\1', content)
         
-        if content != original:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-        return False
+        if diff_root is not None:
+            return content != original, render_diff(file_path, original, content, diff_root)
+        return write_if_changed(file_path, content, original)
         
     except Exception as e:
         print(f"Error processing {file_path}: {e}", file=sys.stderr)
         return False
 
 def main():
-    base = Path("/Users/aphilack/Downloads/namngarm-main-main")
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="Worker processes (0 = one per CPU, default: 1)")
+    add_dry_run_argument(parser)
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+
+    base = REPO_ROOT
+    transform = partial(remove_th_zh_from_file, diff_root=base) if args.dry_run else remove_th_zh_from_file
+    with dry_run(args.dry_run, base) as sink:
+        # Files that mention _th/_zh (or a 'th'/'zh' language tab), found by one
+        # byte-level scan of src/
+        files = [str(p.relative_to(base)) for p in matching_files(base, ('_th', '_zh', "'th'", "'zh'"))]
     
-    # Files to process (from our earlier search)
-    files = [
-        "src/app/admin/articles/[id]/edit/page.tsx",
-        "src/app/admin/categories/[id]/edit/page.tsx",
-        "src/app/admin/faqs/FAQForm.tsx",
-        "src/app/admin/faqs/FAQsClient.tsx",
-        "src/app/admin/media/page.tsx",
-        "src/app/admin/products/[id]/edit/page.tsx",
-        "src/app/admin/quick-links/page.tsx",
-        "src/app/admin/settings/page.tsx",
-        "src/app/api/about/route.ts",
-        "src/app/api/articles/[id]/route.ts",
-        "src/app/api/articles/route.ts",
-        "src/app/api/categories/route.ts",
-        "src/app/api/faq-categories/route.ts",
-        "src/app/api/faqs/[id]/route.ts",
-        "src/app/api/faqs/route.ts",
-        "src/app/api/products/[id]/route.ts",
-        "src/app/api/products/route.ts",
-        "src/app/api/public/settings/route.ts",
-        "src/app/api/settings/route.ts",
-        "src/app/api/tags/route.ts",
-        "src/app/api/upload/[id]/route.ts",
-        "src/components/admin/forms/AboutForm.tsx",
-    ]
+        paths = []
+        for file_rel in files:
+            file_path = base / file_rel
+            if file_path.exists():
+                paths.append(file_path)
+            else:
+                print(f"✗ {file_rel} (not found)")
     
-    updated = 0
-    for file_rel in files:
-        file_path = base / file_rel
-        if file_path.exists():
-            if remove_th_zh_from_file(file_path):
+        updated = 0
+        for result in run_files(transform, paths, args.jobs):
+            file_rel = result.path.relative_to(base)
+            if result.status == CHANGED:
                 print(f"✓ {file_rel}")
                 updated += 1
+                if sink is not None:
+                    sink.write_lines([result.detail])
             else:
                 print(f"- {file_rel} (no changes)")
-        else:
-            print(f"✗ {file_rel} (not found)")
-    
-    print(f"\nUpdated {updated}/{len(files)} files")
+        
+        verb = "Would update" if args.dry_run else "Updated"
+        print(f"\n{verb} {updated}/{len(files)} files")
 
 if __name__ == "__main__":
     main()
@@ -3,26 +3,24 @@
 Final pass - specifically target destructuring and property assignments in API routes.
 """
 
+import argparse
 import re
+from functools import partial
 from pathlib import Path
 
+from codemod.destructure import remove_suffixed_entries
+from codemod.files import REPO_ROOT
+from codemod.output import add_dry_run_argument, dry_run, read_text, render_diff, write_if_changed
+from codemod.parallel import CHANGED, run_files
+from codemod.prefilter import matching_files
+
 def remove_from_destructuring(content: str) -> str:
-    """Remove _th and _zh from destructuring patterns."""
-    # Pattern: { name_lo, name_th, name_zh, name_en, ... }
-    def clean_destructure(match):
-        items = [item.strip() for item in match.group(1).split(',')]
-        # Keep only items that don't end with _th or _zh
-        cleaned = [item for item in items if not re.search(r'\w+_(th|zh)$', item.strip())]
-        return '{ ' + ', '.join(cleaned) + ' }'
-    
-    # Match destructuring patterns
-    content = re.sub(
-        r'\{\s*([^}]+)\s*\}',
-        lambda m: clean_destructure(m) if any(x in m.group(1) for x in ['_th', '_zh']) else m.group(0),
-        content
-    )
-    
-    return content
+    """Remove _th and _zh from destructuring patterns and object shorthands.
+
+    Uses a single brace-aware scan, so nested braces, JSX expressions and
+    blocks are left untouched.
+    """
+    return remove_suffixed_entries(content, ('_th', '_zh'))
 
 def remove_from_objects(content: str) -> str:
     """Remove _th and _zh from object literals."""
@@ -37,11 +35,14 @@ def remove_from_objects(content: str) -> str:
     
     return '\n'.join(new_lines)
 
-def process_file(file_path: Path) -> bool:
-    """Process a single file."""
+def process_file(file_path: Path, diff_root: Path = None):
+    """Process a single file.
+
+    With `diff_root` nothing is written; returns (changed, unified diff)
+    instead, so worker processes can hand the diff back in order.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = read_text(file_path)
         
         original = content
         
@@ -55,52 +56,48 @@ def process_file(file_path: Path) -> bool:
         content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
         content = re.sub(r',(\s*[}\]])', r'\1', content)
         
-        if content != original:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-        return False
+        if diff_root is not None:
+            return content != original, render_diff(file_path, original, content, diff_root)
+        return write_if_changed(file_path, content, original)
         
     except Exception as e:
         print(f"Error: {e}")
         return False
 
 def main():
-    base = Path("/Users/aphilack/Downloads/namngarm-main-main")
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="Worker processes (0 = one per CPU, default: 1)")
+    add_dry_run_argument(parser)
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+
+    base = REPO_ROOT
+    transform = partial(process_file, diff_root=base) if args.dry_run else process_file
+    with dry_run(args.dry_run, base) as sink:
+        # Files that mention _th/_zh, found by one byte-level scan of src/
+        files = [str(p.relative_to(base)) for p in matching_files(base, ('_th', '_zh'))]
     
-    # Files that still have _th/_zh
-    files = [
-        "src/app/admin/settings/page.tsx",
-        "src/app/admin/quick-links/page.tsx",
-        "src/app/admin/faqs/FAQForm.tsx",
-        "src/app/admin/media/page.tsx",
-        "src/app/api/settings/route.ts",
-        "src/app/api/products/route.ts",
-        "src/app/api/products/[id]/route.ts",
-        "src/app/api/articles/route.ts",
-        "src/app/api/articles/[id]/route.ts",
-        "src/app/api/about/route.ts",
-        "src/app/api/tags/route.ts",
-        "src/app/api/faqs/route.ts",
-        "src/app/api/faq-categories/route.ts",
-        "src/app/api/categories/route.ts",
-        "src/components/AboutContent.tsx",
-        "src/components/admin/forms/AboutForm.tsx",
-        "src/components/product/ProductDetailClient.tsx",
-        "src/components/product/PremiumProductCard.tsx",
-    ]
+        paths = []
+        for file_rel in files:
+            file_path = base / file_rel
+            if file_path.exists():
+                paths.append(file_path)
     
-    updated = 0
-    for file_rel in files:
-        file_path = base / file_rel
-        if file_path.exists():
-            if process_file(file_path):
+        updated = 0
+        for result in run_files(transform, paths, args.jobs):
+            file_rel = result.path.relative_to(base)
+            if result.status == CHANGED:
                 print(f"✓ {file_rel}")
                 updated += 1
+                if sink is not None:
+                    sink.write_lines([result.detail])
             else:
                 print(f"- {file_rel}")
-    
-    print(f"\nUpdated {updated}/{len(files)} files")
+        
+        verb = "Would update" if args.dry_run else "Updated"
+        print(f"\n{verb} {updated}/{len(files)} files")
 
 if __name__ == "__main__":
     main()
@@ -3,96 +3,85 @@
 Second pass - remove _th/_zh from remaining files including frontend components.
 """
 
+import argparse
 import re
 import sys
+from functools import partial
 from pathlib import Path
 
-def remove_th_zh_comprehensive(file_path: Path) -> bool:
-    """More aggressive removal of _th and _zh fields."""
+from codemod.files import REPO_ROOT
+from codemod.output import add_dry_run_argument, dry_run, read_text, render_diff
+from codemod.parallel import CHANGED, run_files
+from codemod.prefilter import matching_files
+from codemod.stream import collapse_blank_lines, drop_lines, fix_trailing_commas, rewrite_file, transform_lines
+
+_ASSIGNMENT = re.compile(r'\w+_(th|zh)\s*[:=]')
+_PROPERTY_ACCESS = re.compile(r'\.\w+_(th|zh)\b')
+
+def is_th_zh_line(line: str) -> bool:
+    """True for lines that define, assign or read a _th/_zh property."""
+    # Skip lines with _th or _zh in property names/assignments
+    if _ASSIGNMENT.search(line):
+        return True
+    # Skip lines that are just accessing _th/_zh properties
+    return bool(_PROPERTY_ACCESS.search(line)) and 'locale' not in line.lower()
+
+# Line filter, blank-line cleanup and trailing-comma fix run as one stream
+STAGES = (drop_lines(is_th_zh_line), collapse_blank_lines, fix_trailing_commas)
+
+def remove_th_zh_comprehensive(file_path: Path, diff_root: Path = None):
+    """More aggressive removal of _th and _zh fields.
+
+    With `diff_root` nothing is written; returns (changed, unified diff)
+    instead, so worker processes can hand the diff back in order.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original = content
-        
-        # Remove all lines containing _th or _zh assignments/definitions
-        lines = content.split('\n')
-        new_lines = []
-        skip_next = False
-        
-        for i, line in enumerate(lines):
-            # Skip lines with _th or _zh in property names/assignments
-            if re.search(r'\w+_(th|zh)\s*[:=]', line):
-                continue
-            # Skip lines that are just accessing _th/_zh properties
-            if re.search(r'\.\w+_(th|zh)\b', line) and 'locale' not in line.lower():
-                continue
-            # Keep the line
-            new_lines.append(line)
-        
-        content = '\n'.join(new_lines)
-        
-        # Clean up multiple empty lines
-        content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
-        
-        # Fix trailing commas
-        content = re.sub(r',(\s*[}\]])', r'\1', content)
-        
-        if content != original:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-        return False
+        if diff_root is not None:
+            original = read_text(file_path)
+            content = transform_lines(original, STAGES)
+            return content != original, render_diff(file_path, original, content, diff_root)
+        return rewrite_file(file_path, STAGES)
         
     except Exception as e:
         print(f"Error processing {file_path}: {e}", file=sys.stderr)
         return False
 
 def main():
-    base = Path("/Users/aphilack/Downloads/namngarm-main-main")
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="Worker processes (0 = one per CPU, default: 1)")
+    add_dry_run_argument(parser)
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+
+    base = REPO_ROOT
+    transform = partial(remove_th_zh_comprehensive, diff_root=base) if args.dry_run else remove_th_zh_comprehensive
+    with dry_run(args.dry_run, base) as sink:
+        # Files that mention _th/_zh, found by one byte-level scan of src/
+        files = [str(p.relative_to(base)) for p in matching_files(base, ('_th', '_zh'))]
     
-    # Remaining files from search
-    files = [
-        "src/app/[locale]/products/[slug]/page.tsx",
-        "src/app/[locale]/faq/FAQsClient.tsx",
-        "src/app/[locale]/articles/[slug]/page.tsx",
-        "src/app/[locale]/tags/[slug]/page.tsx",
-        "src/app/admin/settings/page.tsx",
-        "src/app/admin/quick-links/page.tsx",
-        "src/app/admin/faqs/FAQForm.tsx",
-        "src/app/admin/media/page.tsx",
-        "src/app/api/settings/route.ts",
-        "src/app/api/products/route.ts",
-        "src/app/api/products/[id]/route.ts",
-        "src/app/api/articles/route.ts",
-        "src/app/api/articles/[id]/route.ts",
-        "src/app/api/about/route.ts",
-        "src/app/api/tags/route.ts",
-        "src/app/api/faqs/route.ts",
-        "src/app/api/faq-categories/route.ts",
-        "src/app/api/categories/route.ts",
-        "src/components/AboutContent.tsx",
-        "src/components/layout/QuickLinks.tsx",
-        "src/components/articles/ArticlesList.tsx",
-        "src/components/admin/forms/AboutForm.tsx",
-        "src/components/product/ProductDetailClient.tsx",
-        "src/components/product/PremiumProductCard.tsx",
-        "src/hooks/useSettings.ts",
-    ]
+        paths = []
+        for file_rel in files:
+            file_path = base / file_rel
+            if file_path.exists():
+                paths.append(file_path)
+            else:
+                print(f"✗ {file_rel} (not found)")
     
-    updated = 0
-    for file_rel in files:
-        file_path = base / file_rel
-        if file_path.exists():
-            if remove_th_zh_comprehensive(file_path):
+        updated = 0
+        for result in run_files(transform, paths, args.jobs):
+            file_rel = result.path.relative_to(base)
+            if result.status == CHANGED:
                 print(f"✓ {file_rel}")
                 updated += 1
+                if sink is not None:
+                    sink.write_lines([result.detail])
             else:
                 print(f"- {file_rel} (no changes)")
-        else:
-            print(f"✗ {file_rel} (not found)")
-    
-    print(f"\nUpdated {updated}/{len(files)} files")
+        
+        verb = "Would update" if args.dry_run else "Updated"
+        print(f"\n{verb} {updated}/{len(files)} files")
 
 if __name__ == "__main__":
     main()
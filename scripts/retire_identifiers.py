@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Remove a set of retired identifiers (settings keys, props) from the source tree.
+
+All identifiers are handled in one pass: the tree is walked once to find
+the files that mention any of them, and each such file is rewritten once,
+removing JSX attributes, object keys, type members and destructured names
+(see codemod/retire.py). References that cannot be removed on their own,
+such as `settings.heroBadge`, are listed for manual review, or dropped
+with their whole line under --drop-lines.
+
+    python3 scripts/retire_identifiers.py heroBadge heroBadge_en
+    python3 scripts/retire_identifiers.py --from retired.txt --dry-run
+"""
+
+import argparse
+import re
+from functools import partial
+from pathlib import Path
+
+from codemod import budget, retire, validate
+from codemod.files import DEFAULT_DIRECTORIES, REPO_ROOT
+from codemod.output import add_dry_run_argument, dry_run, read_text
+from codemod.parallel import CHANGED, ERROR, summarize
+from codemod.pipeline import run_pipeline
+from codemod.prefilter import matching_files
+
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+
+
+def read_identifiers(path: Path):
+    """One identifier per line; blank lines and `#` comments are ignored."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.split('#', 1)[0].strip() for line in f if line.split('#', 1)[0].strip()]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("identifiers", nargs="*", help="Identifiers to retire")
+    parser.add_argument("--from", dest="from_file", type=Path, metavar="FILE",
+                        help="Read identifiers from FILE, one per line")
+    parser.add_argument("--root", type=Path, default=REPO_ROOT,
+                        help="Repository root (default: this checkout)")
+    parser.add_argument("--path", action="append", metavar="DIR",
+                        help="Directory to search, relative to --root (repeatable, "
+                             "default: src/app, src/components, src/hooks)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="Worker processes (0 = one per CPU, default: 1)")
+    parser.add_argument("--drop-lines", action="store_true",
+                        help="Also drop every line that still mentions an identifier afterwards")
+    parser.add_argument("--no-validate", action="store_true",
+                        help="Write rewrites without checking that brackets, tags and literals still balance")
+    parser.add_argument("--time-budget", type=float, default=budget.DEFAULT_SECONDS, metavar="SEC",
+                        help=f"Skip a file that takes longer than SEC seconds (default: {budget.DEFAULT_SECONDS:g})")
+    add_dry_run_argument(parser)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    identifiers = list(args.identifiers)
+    if args.from_file:
+        identifiers += read_identifiers(args.from_file)
+    identifiers = list(dict.fromkeys(identifiers))
+    if not identifiers:
+        parser.error("give at least one identifier or --from FILE")
+    invalid = [ident for ident in identifiers if not _IDENTIFIER.fullmatch(ident)]
+    if invalid:
+        parser.error(f"not an identifier: {', '.join(invalid)}")
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+
+    root = args.root.resolve()
+    directories = args.path or list(DEFAULT_DIRECTORIES)
+    files = matching_files(root, identifiers, directories)
+
+    transform = partial(retire.remove_identifiers, identifiers=tuple(identifiers), drop_lines=args.drop_lines)
+    if not args.no_validate:
+        transform = partial(validate.checked, transform)
+    transform = partial(budget.bounded, transform, seconds=args.time_budget)
+
+    with dry_run(args.dry_run, root) as sink:
+        results = []
+        for result in run_pipeline(transform, files, args.jobs, dry_run=sink):
+            file_rel = result.path.relative_to(root)
+            if result.status == CHANGED:
+                print(f"✓ {file_rel}")
+            elif result.status == ERROR:
+                print(f"✗ {file_rel}: {result.error}")
+            else:
+                print(f"- {file_rel} (no changes)")
+            results.append(result)
+
+        # What is left (after the rewrite, in a dry run) needs a human.
+        left = []
+        for result in results:
+            if result.status == ERROR:
+                continue
+            content = read_text(result.path)
+            if args.dry_run and result.status == CHANGED:
+                content = retire.remove_identifiers(content, identifiers, args.drop_lines)
+            for line, ident, text in retire.leftovers(content, identifiers):
+                left.append(f"  {result.path.relative_to(root)}:{line} [{ident}] {text}")
+        if left:
+            print(f"\n{len(left)} references left for manual review:")
+            print('\n'.join(left))
+
+        counts = summarize(results)
+        verb = "Would update" if args.dry_run else "Updated"
+        print(f"\n{verb} {counts[CHANGED]}/{len(files)} files mentioning {len(identifiers)} identifiers")
+        if counts[ERROR]:
+            print(f"Failed on {counts[ERROR]} files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Remove Thai (_th) and Chinese (_zh) language fields in a single pass.
+
+Replaces running remove-lang-fields.py, remove_lang.py, remove_lang_pass2.py,
+remove_lang_final.py and ultra_clean.py one after another: every file is read
+once, all rules are applied in memory and the file is written at most once.
+"""
+
+import argparse
+import sys
+from functools import partial
+from pathlib import Path
+
+from codemod import budget, engine, fixpoint, gitdiff, output, regex_safety, rules, validate
+from codemod.files import DEFAULT_DIRECTORIES, REPO_ROOT, resolve_files
+from codemod.manifest import MANIFEST_NAME, Manifest
+from codemod.prefilter import matching_files
+from codemod.profile import RuleProfile
+from codemod.pipeline import run_pipeline
+from codemod.parallel import CHANGED, ERROR, UNCHANGED, FileResult, run_files, summarize
+from codemod.watch import watch
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*",
+                        help="Files or directories relative to --root (default: src/app, src/components, src/hooks)")
+    parser.add_argument("--root", type=Path, default=REPO_ROOT,
+                        help="Repository root (default: this checkout)")
+    parser.add_argument("--rules", metavar="SOURCES",
+                        help=f"Comma-separated rule sources to apply ({', '.join(rules.SOURCES)})")
+    parser.add_argument("--identifiers", metavar="IDS",
+                        help=f"Comma-separated identifiers a file must contain to be opened "
+                             f"(default: {','.join(rules.TRIGGERS)})")
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="Worker processes (0 = one per CPU, default: 1)")
+    parser.add_argument("--profile", type=Path, metavar="PATH",
+                        help="Time every rule on every file, without rewriting any, and write a JSON report to PATH")
+    parser.add_argument("--top", type=int, default=10, metavar="N",
+                        help="Rows in the hot-rule table printed with --profile (default: 10)")
+    parser.add_argument("--manifest", type=Path, metavar="PATH",
+                        help=f"Clean-file manifest (default: <root>/{MANIFEST_NAME})")
+    parser.add_argument("--no-manifest", action="store_true",
+                        help="Check every file, ignoring and not updating the manifest")
+    parser.add_argument("--single-pass", action="store_true",
+                        help="Apply the rules once instead of until the files stop changing")
+    parser.add_argument("--no-validate", action="store_true",
+                        help="Write rewrites without checking that brackets, tags and literals still balance")
+    parser.add_argument("--time-budget", type=float, default=budget.DEFAULT_SECONDS, metavar="SEC",
+                        help=f"Skip (and report) a file whose rules run longer than SEC seconds "
+                             f"(0 = no limit, default: {budget.DEFAULT_SECONDS:g})")
+    parser.add_argument("--preserve-mtime", action="store_true",
+                        help="Keep the original timestamps on rewritten files")
+    output.add_dry_run_argument(parser)
+    parser.add_argument("--since", metavar="REF",
+                        help="Only process .ts/.tsx/.prisma files that differ from REF, read through git")
+    parser.add_argument("--staged", action="store_true",
+                        help="Only process files staged for commit, as read from the index")
+    parser.add_argument("--watch", action="store_true",
+                        help="After the initial pass, keep running and rewrite files as they change")
+    parser.add_argument("--poll", action="store_true",
+                        help="With --watch, poll file stats instead of using inotify")
+    parser.add_argument("--debounce", type=float, default=0.2, metavar="SEC",
+                        help="With --watch, wait for SEC seconds of quiet before processing (default: 0.2)")
+    return parser
+
+
+def _report(result, root: Path, manifest, settled: bool):
+    """Print a result and update the manifest.
+
+    Unchanged files are recorded as clean. A rewritten file is recorded
+    only when `settled`, i.e. the rules ran to a fixpoint; after a single
+    pass it may still hold matches, so it is checked again next time.
+    """
+    file_rel = result.path.relative_to(root)
+    if result.status == CHANGED:
+        print(f"✓ {file_rel}")
+    elif result.status == ERROR:
+        print(f"✗ {file_rel}: {result.error}")
+    else:
+        print(f"- {file_rel} (no changes)")
+    if manifest is not None:
+        if result.status == UNCHANGED or (result.status == CHANGED and settled):
+            manifest.record(result.path)
+        else:
+            manifest.forget(result.path)
+
+
+def _updated(args) -> str:
+    return "Would update" if args.dry_run or args.profile else "Updated"
+
+
+def run_changed(root: Path, args, identifiers, transform):
+    """Git-aware mode: apply the rules to the changed files only.
+
+    Contents come from one `git cat-file --batch` process; schema.prisma
+    files get the schema rules, and are in scope under the same terms as
+    in a normal run. The manifest is not consulted since git already
+    narrowed the set.
+    """
+    scope = tuple(rel.rstrip("/") + "/" for rel in (args.paths or DEFAULT_DIRECTORIES))
+
+    def in_scope(rel: str) -> bool:
+        if rel.endswith(engine.SCHEMA_SUFFIX):
+            return rel == engine.SCHEMA_PATH if not args.paths else rel in args.paths
+        return rel.startswith(scope) or rel in args.paths
+
+    try:
+        changed = [f for f in gitdiff.changed_files(root, args.since, args.staged) if in_scope(f.path)]
+        contents = list(gitdiff.read_changed(root, changed))
+    except (RuntimeError, KeyError) as e:
+        sys.exit(f"✗ {e}")
+
+    results = []
+    for path, data in contents:
+        try:
+            content = data.decode("utf-8")
+            if not any(identifier in content for identifier in identifiers):
+                continue
+            changed_now = engine.rewrite_content(path, content, transform, args.preserve_mtime)
+            result = FileResult(path, CHANGED if changed_now else UNCHANGED)
+        except Exception as e:
+            result = FileResult(path, ERROR, str(e))
+        _report(result, root, None, False)
+        results.append(result)
+
+    counts = summarize(results)
+    print(f"\n{_updated(args)} {counts[CHANGED]}/{len(changed)} changed files")
+    if counts[ERROR]:
+        print(f"Failed on {counts[ERROR]} files")
+        sys.exit(1)
+
+
+def watch_files(root: Path, directories, named, identifiers, transform, manifest, args):
+    """Rewrite files as they change, reusing the compiled rules in this process.
+
+    Every file under `directories` is handled; in the directories that
+    only hold explicitly `named` files, the other files are left alone.
+    """
+    scope = tuple(root / rel for rel in directories)
+    named = set(named)
+
+    def handle(paths):
+        files = []
+        for path in paths:
+            if path not in named and not any(path.is_relative_to(base) for base in scope):
+                continue
+            if not path.exists():
+                if manifest is not None:
+                    manifest.forget(path)
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"✗ {path.relative_to(root)}: {e}")
+                continue
+            if any(identifier in content for identifier in identifiers):
+                files.append(path)
+            elif manifest is not None:
+                manifest.record(path)
+        for result in run_pipeline(transform, files, preserve_mtime=args.preserve_mtime):
+            _report(result, root, manifest, not args.single_pass)
+        if manifest is not None:
+            manifest.save()
+        sys.stdout.flush()
+
+    watched = list(directories) + sorted({p.parent.relative_to(root).as_posix() for p in named} - set(directories))
+    mode = "polling" if args.poll else "inotify"
+    print(f"\nWatching {', '.join(directories + sorted(p.relative_to(root).as_posix() for p in named))} "
+          f"({mode}); press Ctrl+C to stop")
+    try:
+        watch(root, watched, handle, debounce=args.debounce, poll=args.poll)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    root = args.root.resolve()
+    try:
+        selected = rules.rules_for(args.rules.split(",") if args.rules else None)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    if args.watch and args.profile:
+        parser.error("--watch cannot be combined with --profile")
+    git_mode = args.since is not None or args.staged
+    if git_mode and (args.watch or args.profile):
+        parser.error("--since/--staged cannot be combined with --watch or --profile")
+    if args.dry_run and (args.watch or args.profile):
+        parser.error("--dry-run cannot be combined with --watch or --profile")
+    if args.time_budget < 0:
+        parser.error("--time-budget must be >= 0")
+
+    # Patterns that can backtrack super-linearly over a whole file are
+    # flagged up front; check_rules.py lists every finding.
+    findings = regex_safety.check_rules((*selected, *rules.CLEANUP_RULES))
+    risky = sorted({finding.rule for finding in regex_safety.serious(findings)})
+    if risky:
+        print(f"- Rules that can backtrack super-linearly: {', '.join(risky)} (see scripts/check_rules.py)",
+              file=sys.stderr)
+
+    # By default the rules are re-applied until the files stop changing;
+    # --single-pass (and --profile, which times that single pass)
+    # reproduces one run of the original scripts.
+    version = rules.ruleset_version(selected)
+    if args.single_pass or args.profile:
+        transform = partial(engine.apply_rules, rules=selected)
+        version += "-single"
+    else:
+        transform = partial(fixpoint.apply_until_stable, rules=selected)
+    # A rewrite that leaves the file structurally broken is not written.
+    if not args.no_validate:
+        transform = partial(validate.checked, transform)
+    # A file the rules spend too long on is skipped rather than stalling the run.
+    transform = partial(budget.bounded, transform, seconds=args.time_budget)
+
+    # Directories are narrowed to the files that mention a trigger
+    # identifier; explicitly named files are always processed.
+    identifiers = args.identifiers.split(",") if args.identifiers else rules.TRIGGERS
+    if git_mode:
+        with output.dry_run(args.dry_run, root):
+            run_changed(root, args, identifiers, transform)
+        return
+
+    # A dry run leaves the manifest alone along with everything else.
+    manifest = None
+    if not args.no_manifest and not args.dry_run:
+        manifest = Manifest.load(args.manifest or root / MANIFEST_NAME, root, version)
+
+    # The manifest's stat check runs before the prefilter reads a file, so
+    # files known to be clean are never opened.
+    skipped = 0
+
+    def known_clean(file_path: Path) -> bool:
+        nonlocal skipped
+        if manifest is not None and manifest.is_clean(file_path):
+            skipped += 1
+            return True
+        return False
+
+    if args.paths:
+        directories = [rel for rel in args.paths if (root / rel).is_dir()]
+        named = resolve_files(root, [rel for rel in args.paths if rel not in directories])
+    else:
+        directories = list(DEFAULT_DIRECTORIES)
+        named = []
+
+    # schema.prisma gets the schema rules, as in --since/--staged mode: the
+    # default one on a full run, or any schema file named explicitly.
+    schema_files = []
+    if not args.paths and (root / engine.SCHEMA_PATH).exists():
+        schema_files.append(root / engine.SCHEMA_PATH)
+
+    with output.dry_run(args.dry_run, root) as sink:
+        files = []
+        for file_path in named:
+            if not file_path.exists():
+                print(f"✗ {file_path.relative_to(root)} (not found)")
+            elif file_path.suffix == engine.SCHEMA_SUFFIX:
+                schema_files.append(file_path)
+            elif not known_clean(file_path):
+                files.append(file_path)
+        files += matching_files(root, identifiers, directories, skip=known_clean)
+        candidates = len(files) + skipped + len(schema_files)
+
+        # Normal runs overlap reads, rules and writes; profiling times one
+        # pass of each rule per file through the plain per-file runner and
+        # writes nothing, since that output is neither validated nor settled.
+        if args.profile:
+            profile = RuleProfile()
+            profile_file = partial(engine.profile_file, rules=selected)
+            outcomes = run_files(partial(budget.bounded, profile_file, seconds=args.time_budget),
+                                 files, args.jobs)
+        else:
+            profile = None
+            outcomes = run_pipeline(transform, files, args.jobs, preserve_mtime=args.preserve_mtime,
+                                    dry_run=sink)
+
+        results = []
+        for result in outcomes:
+            _report(result, root, manifest, not (args.single_pass or args.profile))
+            results.append(result)
+            if profile is not None and result.detail is not None:
+                profile.add(result.path.relative_to(root).as_posix(), result.detail)
+
+        # The manifest's version covers the source rules only, so schema
+        # files are not recorded in it; profiling leaves them out.
+        if schema_files and profile is None:
+            schema_transform = partial(budget.bounded, engine.apply_schema_rules, seconds=args.time_budget)
+            for result in run_pipeline(schema_transform, schema_files, preserve_mtime=args.preserve_mtime,
+                                       dry_run=sink):
+                _report(result, root, None, False)
+                results.append(result)
+
+        if manifest is not None:
+            manifest.save()
+
+        counts = summarize(results)
+        print(f"\n{_updated(args)} {counts[CHANGED]}/{candidates} files")
+        if skipped:
+            print(f"Skipped {skipped} files already clean according to the manifest")
+
+        if profile is not None:
+            profile.write(args.profile, rules.ruleset_version(selected))
+            print(f"\n{profile.format_top(args.top)}")
+            print(f"\n✓ Wrote rule profile to {args.profile}")
+        if counts[ERROR]:
+            print(f"Failed on {counts[ERROR]} files")
+
+    if args.watch:
+        sources = [file_path for file_path in named if file_path not in schema_files]
+        watch_files(root, directories, sources, identifiers, transform, manifest, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The scripts import `codemod` as a top-level package from scripts/.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,50 @@
+import re
+import time
+from functools import partial
+
+import pytest
+
+from codemod import budget, engine, fixpoint, validate
+from codemod.rules import LineRule, Rule, TransformRule
+
+
+def stall(content):
+    time.sleep(5)
+    return content
+
+
+SLOW = TransformRule('slow-transform', 'test', stall)
+FAST = Rule('fast', 'test', re.compile('x'), 'y')
+
+
+@pytest.mark.parametrize('apply', [engine.apply_rules, fixpoint.apply_until_stable])
+def test_budget_names_the_running_rule(apply):
+    transform = partial(apply, rules=(FAST, SLOW))
+    with pytest.raises(budget.BudgetExceeded, match="rule 'slow-transform' exceeded the 0.2s"):
+        budget.bounded(transform, 'x', seconds=0.2)
+
+
+class SlowPattern:
+    pattern = 'slow'
+    flags = 0
+
+    def search(self, line):
+        time.sleep(5)
+
+
+def test_budget_names_a_batch_of_line_rules():
+    rules = (LineRule('other-line', 'test', re.compile('z')), LineRule('slow-line', 'test', SlowPattern()))
+    with pytest.raises(budget.BudgetExceeded, match="rules 'other-line', 'slow-line' exceeded"):
+        budget.bounded(partial(engine.apply_rules, rules=rules), 'x', seconds=0.2)
+
+
+def test_time_outside_rules_is_not_blamed_on_the_last_rule(monkeypatch):
+    monkeypatch.setattr(validate, 'validate', stall)
+    transform = partial(validate.checked, partial(engine.apply_rules, rules=(FAST,)))
+    with pytest.raises(budget.BudgetExceeded, match=r"^exceeded the 0.2s"):
+        budget.bounded(transform, 'x', seconds=0.2)
+
+
+def test_within_budget_returns_the_result():
+    assert budget.bounded(partial(engine.apply_rules, rules=(FAST,)), 'x', seconds=5) == 'y'
+    assert budget.bounded(str.upper, 'x', seconds=0) == 'X'
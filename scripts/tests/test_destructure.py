@@ -0,0 +1,21 @@
+import pytest
+
+from codemod.destructure import remove_suffixed_entries
+
+
+@pytest.mark.parametrize('content, expected', [
+    ("const { name_lo, name_th, name_zh, slug } = body;",
+     "const { name_lo, slug } = body;"),
+    ("const { a: { b_th }, c_zh = f(x, y), d } = body;",
+     "const { a: {}, d } = body;"),
+    ("const { name_th = 'a,b', slug } = body;",
+     "const { slug } = body;"),
+    ("const s = `${ { a_th } }`; const { b_th, c } = x;",
+     "const s = `${ {} }`; const { c } = x;"),
+    ("<Field label={ label_th }>{ name_zh }</Field>",
+     "<Field label={ label_th }>{ name_zh }</Field>"),
+    ("const { a_th ) = x;",
+     "const { a_th ) = x;"),
+])
+def test_remove_suffixed_entries(content, expected):
+    assert remove_suffixed_entries(content) == expected
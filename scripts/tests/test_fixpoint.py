@@ -0,0 +1,20 @@
+import re
+
+import pytest
+
+from codemod import fixpoint
+from codemod.rules import Rule
+
+TO_B = Rule('a-to-b', 'test', re.compile('a'), 'b')
+TO_A = Rule('b-to-a', 'test', re.compile('b'), 'a')
+SHORTEN = Rule('shorten', 'test', re.compile('xx'), 'x')
+
+
+def test_settles_in_the_last_allowed_round():
+    content, rounds = fixpoint.run_fixpoint('x' * 8, (SHORTEN,), cleanup=False, max_rounds=3)
+    assert (content, rounds) == ('x', 3)
+
+
+def test_rules_that_undo_each_other_do_not_converge():
+    with pytest.raises(fixpoint.NotConverged, match="after 3 rounds"):
+        fixpoint.apply_until_stable('a', (TO_B, TO_A, TO_B), cleanup=False, max_rounds=3)
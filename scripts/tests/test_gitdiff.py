@@ -0,0 +1,81 @@
+import subprocess
+import threading
+
+import pytest
+
+from codemod import gitdiff
+
+
+def git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.email", "test@example.com")
+    git(tmp_path, "config", "user.name", "test")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/a.ts").write_bytes(b"export const a = 1;\r\n")
+    (tmp_path / "src/big.ts").write_bytes(b"x" * 200_000)
+    (tmp_path / "src/empty.ts").write_bytes(b"")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+def test_read_many_returns_exact_contents(repo):
+    names = ["HEAD:src/a.ts", "HEAD:src/empty.ts", "HEAD:src/big.ts", "HEAD:src/a.ts"]
+    with gitdiff.CatFile(repo) as cat:
+        replies = list(cat.read_many(names))
+        assert cat.read("HEAD:src/empty.ts") == b""
+    assert replies == [
+        ("HEAD:src/a.ts", b"export const a = 1;\r\n"),
+        ("HEAD:src/empty.ts", b""),
+        ("HEAD:src/big.ts", b"x" * 200_000),
+        ("HEAD:src/a.ts", b"export const a = 1;\r\n"),
+    ]
+
+
+def run_with_timeout(func, seconds=20):
+    outcome = []
+    thread = threading.Thread(target=lambda: outcome.append(func()), daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "read_many did not return"
+    return outcome[0]
+
+
+def test_read_many_error_does_not_hang_on_full_pipes(repo):
+    # Enough requests that git's reply pipe and the request pipe both fill up.
+    names = ["HEAD:src/missing.ts"] + ["HEAD:src/big.ts"] * 2000
+
+    def read():
+        with gitdiff.CatFile(repo) as cat:
+            with pytest.raises(KeyError):
+                list(cat.read_many(names))
+        return True
+
+    assert run_with_timeout(read)
+
+
+def test_read_many_stopped_early_does_not_hang(repo):
+    def read():
+        with gitdiff.CatFile(repo) as cat:
+            replies = cat.read_many(["HEAD:src/big.ts"] * 2000)
+            first = next(replies)
+            replies.close()
+        return first
+
+    assert run_with_timeout(read) == ("HEAD:src/big.ts", b"x" * 200_000)
+
+
+def test_read_changed_reads_dirty_files_from_disk(repo):
+    (repo / "src/a.ts").write_bytes(b"edited\n")
+    (repo / "src/new.ts").write_bytes(b"new\n")
+    files = gitdiff.changed_files(repo, "HEAD")
+    assert [(f.path, f.object) for f in files] == [("src/a.ts", None), ("src/new.ts", None)]
+    assert dict(gitdiff.read_changed(repo, files)) == {
+        repo / "src/a.ts": b"edited\n",
+        repo / "src/new.ts": b"new\n",
+    }
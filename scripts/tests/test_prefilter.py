@@ -0,0 +1,18 @@
+from codemod import prefilter
+
+
+def test_skipped_files_are_not_read(tmp_path, monkeypatch):
+    (tmp_path / "src").mkdir()
+    for name in ("a.ts", "b.ts", "c.ts"):
+        (tmp_path / "src" / name).write_text("const name_th = 1;\n")
+    opened = []
+    real_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(path.name)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(prefilter, "open", tracking_open, raising=False)
+    found = prefilter.matching_files(tmp_path, ["_th"], ["src"], skip=lambda path: path.name == "b.ts")
+    assert [path.name for path in found] == ["a.ts", "c.ts"]
+    assert opened == ["a.ts", "c.ts"]
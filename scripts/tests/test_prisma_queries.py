@@ -0,0 +1,52 @@
+from codemod import prisma_queries, prisma_schema
+
+SCHEMA = prisma_schema.parse("""\
+model FAQ {
+  id         String  @id
+  categoryId String?
+  isActive   Boolean
+  featured   Boolean
+  order      Int
+
+  @@index([order])
+  @@index([featured])
+}
+""")
+
+
+def _patterns(source):
+    return prisma_queries.extract_patterns(source, "route.ts", SCHEMA)
+
+
+def test_arguments_in_a_variable_are_resolved():
+    [pattern] = _patterns("""
+    const where: any = { isActive: true };
+    if (categoryId) {
+      where.categoryId = categoryId;
+    }
+    let query: any = { where, orderBy: { order: 'asc' } };
+    if (limit) query.take = limit;
+    const faqs = await prisma.fAQ.findMany(query);
+    """)
+    assert pattern.complete
+    assert (pattern.equality, pattern.optional, pattern.sort, pattern.paginated) == (
+        ("isActive", "categoryId"), ("categoryId",), ("order",), True)
+
+
+def test_unresolved_arguments_keep_indexes_from_unused():
+    patterns = _patterns("const faqs = await prisma.fAQ.findMany(buildQuery(params));")
+    assert [p.complete for p in patterns] == [False]
+    report = prisma_queries.check(SCHEMA, patterns)
+    assert report.unused == []
+    assert list(report.incomplete) == ["FAQ"]
+
+
+def test_optional_fields_cap_the_suggestion():
+    patterns = _patterns("""
+    const where: any = { categoryId: id };
+    if (active) where.isActive = true;
+    if (featured) where.featured = true;
+    await prisma.fAQ.findMany({ where, orderBy: { order: 'asc' }, take: 10 });
+    """)
+    report = prisma_queries.check(SCHEMA, patterns)
+    assert list(report.missing["FAQ"]) == [("categoryId",)]
@@ -0,0 +1,103 @@
+import pytest
+
+from codemod import prisma_schema
+
+SCHEMA = """\
+generator client {
+  provider = "prisma-client-js"
+}
+
+model Product {
+  id         Int      @id @default(autoincrement())
+  name       String
+  name_th    String   @db.VarChar(255) // shown on the Thai site
+  name_zh    String?  @map("name_chinese")
+  categoryId Int
+  category   Category @relation(fields: [categoryId], references: [id])
+
+  @@index([categoryId, name_th])
+}
+
+model Category {
+  id       Int       @id
+  slug     String    @unique
+  slug_th  String
+  products Product[]
+}
+"""
+
+
+def test_render_round_trips_formatted_schema():
+    assert prisma_schema.parse(SCHEMA).render() == SCHEMA
+
+
+def test_parse_fields():
+    schema = prisma_schema.parse(SCHEMA)
+    fld = schema.models["Product"].field("name_th")
+    assert (fld.type, fld.optional, fld.attributes, fld.comment) == (
+        "String", False, ["@db.VarChar(255)"], "// shown on the Thai site")
+    assert schema.models["Category"].field("products").is_list
+
+
+def test_make_optional():
+    schema = prisma_schema.parse(SCHEMA)
+    assert schema.make_optional(["_th"]) == 2
+    assert schema.models["Product"].field("name_th").optional
+    assert schema.models["Category"].field("slug_th").optional
+
+
+def test_drop_removes_fields_and_indexes_using_them():
+    schema = prisma_schema.parse(SCHEMA)
+    assert schema.drop(["_th", "_zh"]) == 3
+    rendered = schema.render()
+    assert "name_th" not in rendered and "name_zh" not in rendered and "slug_th" not in rendered
+    assert "@@index" not in rendered
+    assert prisma_schema.parse(rendered).render() == rendered
+
+
+def test_rename_keeps_columns_with_map():
+    schema = prisma_schema.parse(SCHEMA)
+    assert schema.rename_suffix("_th", "_thai") == 2
+    product = schema.models["Product"]
+    assert product.field("name_thai").attributes == ["@db.VarChar(255)", '@map("name_th")']
+    assert schema.models["Category"].field("slug_thai").attributes == ['@map("slug_th")']
+    assert "@@index([categoryId, name_thai])" in schema.render()
+
+
+def test_rename_keeps_existing_map():
+    schema = prisma_schema.parse(SCHEMA)
+    schema.rename_suffix("_zh", "_cn")
+    assert schema.models["Product"].field("name_cn").attributes == ['@map("name_chinese")']
+
+
+def test_rename_refuses_to_overwrite_a_field():
+    schema = prisma_schema.parse(SCHEMA)
+    with pytest.raises(ValueError):
+        schema.rename_suffix("_th", "")
+
+
+UNALIGNED = """\
+model Post {
+  id Int @id
+  title   String
+  title_th String // legacy
+  body String @db.Text
+}
+"""
+
+
+def test_render_keeps_unformatted_source():
+    assert prisma_schema.parse(UNALIGNED).render() == UNALIGNED
+
+
+def test_render_rewrites_only_edited_fields():
+    schema = prisma_schema.parse(UNALIGNED)
+    assert schema.make_optional(["_th"]) == 1
+    assert schema.render().splitlines() == [
+        "model Post {",
+        "  id Int @id",
+        "  title   String",
+        "  title_th String? // legacy",
+        "  body String @db.Text",
+        "}",
+    ]
@@ -0,0 +1,80 @@
+import pytest
+
+from codemod.retire import leftovers, remove_identifiers
+
+IDS = ('heroBadge', 'heroBadge_en')
+
+CASES = [
+    # JSX attributes
+    ('<Hero title="x" heroBadge={badge} heroBadge_en="New" />\n',
+     '<Hero title="x" />\n'),
+    ('<Hero\n  heroBadge\n  title="x"\n/>\n',
+     '<Hero\n  title="x"\n/>\n'),
+    # object keys and shorthands
+    ('const o = { heroBadge: compute(a, b), title };\n',
+     'const o = { title };\n'),
+    ('const o = {\n  title,\n  heroBadge,\n};\n',
+     'const o = {\n  title,\n};\n'),
+    ('const o = { title, heroBadge };\n',
+     'const o = { title };\n'),
+    ('const o = { heroBadge };\n',
+     'const o = {};\n'),
+    # interface and type members
+    ('interface S {\n  title: string;\n  heroBadge?: string;\n  heroBadge_en?: string;\n}\n',
+     'interface S {\n  title: string;\n}\n'),
+    ('type S = {\n  heroBadge: { text: string; color: string }\n  title: string\n}\n',
+     'type S = {\n  title: string\n}\n'),
+    # destructuring and parameters
+    ("const { heroBadge = '', title } = props;\n",
+     'const { title } = props;\n'),
+    ('function Hero({ heroBadge = false, title }) {}\n',
+     'function Hero({ title }) {}\n'),
+    # class fields
+    ('class S extends Base {\n  heroBadge = 1;\n  other = 2;\n}\n',
+     'class S extends Base {\n  other = 2;\n}\n'),
+]
+
+
+@pytest.mark.parametrize('content, expected', CASES)
+def test_remove_identifiers(content, expected):
+    assert remove_identifiers(content, IDS) == expected
+    assert leftovers(expected, IDS) == []
+
+
+@pytest.mark.parametrize('content', [c for c, _ in CASES])
+def test_remove_identifiers_is_idempotent(content):
+    once = remove_identifiers(content, IDS)
+    assert remove_identifiers(once, IDS) == once
+
+
+KEPT = [
+    'if (enabled) { heroBadge = 5; }\n',
+    'function reset() {\n  heroBadge = null;\n  other();\n}\n',
+    'const reset = () => {\n  heroBadge = null;\n};\n',
+    'if (settings.heroBadge) show();\n',
+    'track(heroBadge);\n',
+    'else { heroBadge: 1 }\n',
+]
+
+
+@pytest.mark.parametrize('content', KEPT)
+def test_statements_and_references_are_reported_not_removed(content):
+    assert remove_identifiers(content, IDS) == content
+    assert [name for _, name, _ in leftovers(content, IDS)] == ['heroBadge']
+
+
+def test_strings_and_comments_are_reported_not_removed():
+    content = "const key = 'heroBadge'; // heroBadge is retired\n"
+    assert remove_identifiers(content, IDS) == content
+    assert leftovers(content, IDS) == [(1, 'heroBadge', content.strip())]
+
+
+def test_lookalike_identifiers_are_untouched():
+    content = 'const o = { heroBadges: 1, myheroBadge: 2 };\n'
+    assert remove_identifiers(content, IDS) == content
+    assert leftovers(content, IDS) == []
+
+
+def test_drop_lines_drops_what_is_left():
+    content = 'const o = {\n  heroBadge: 1,\n  title,\n};\nif (settings.heroBadge) show();\nnext();\n'
+    assert remove_identifiers(content, IDS, drop_lines=True) == 'const o = {\n  title,\n};\nnext();\n'
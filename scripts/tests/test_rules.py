@@ -0,0 +1,89 @@
+import pytest
+
+from codemod import engine, rules
+from codemod.jsx import remove_elements
+
+LINE_RULES = {rule.name: rule for rule in rules.RULES if isinstance(rule, rules.LineRule)}
+
+
+@pytest.mark.parametrize('line', [
+    "  title: post.title_th,",
+    "const label = row.name_zh ?? '';",
+    "fields.push('description_th');",
+])
+def test_any_reference_line_drops_suffixed_names(line):
+    assert LINE_RULES['any-reference-line'].drops(line)
+
+
+@pytest.mark.parametrize('line', [
+    "<img src={show_thumbnail ? src : fallback} />",
+    "const author = user_zhao;",
+    "if (locale === 'th') return post.title_th;",
+    "const name_thai = 1;",
+])
+def test_any_reference_line_keeps_other_identifiers(line):
+    assert not LINE_RULES['any-reference-line'].drops(line)
+
+
+def test_apply_rules_keeps_lookalike_identifiers():
+    content = (
+        "const card = {\n"
+        "  name: item.name,\n"
+        "  name_th: item.name_th,\n"
+        "  thumbnail: item.has_thumbnail,\n"
+        "};\n"
+    )
+    result = engine.apply_rules(content)
+    assert 'name_th' not in result
+    assert "  thumbnail: item.has_thumbnail\n" in result
+
+
+def test_property_assignment_stops_at_the_end_of_its_line():
+    rule = next(rule for rule in rules.RULES if rule.name == 'property-assignment')
+    content = (
+        "interface Form {\n"
+        "  title_th: string\n"
+        "  title_en: string;\n"
+        "  slug: string, other: number\n"
+        "}\n"
+    )
+    assert rule.pattern.sub(rule.repl, content) == (
+        "interface Form {\n"
+        "\n"
+        "  title_en: string;\n"
+        "  slug: string, other: number\n"
+        "}\n"
+    )
+
+
+def test_locale_input_rules_match_the_full_jsx_index():
+    content = (
+        "<div className=\"grid\">\n"
+        "  <div>\n"
+        "    <label onClick={() => setOpen(true)}>Thai Title</label>\n"
+        "    <input name=\"title_th\" onChange={(e) => set({ ...form, title_th: e.target.value })} />\n"
+        "  </div>\n"
+        "  <div>\n"
+        "    <label>English Title</label>\n"
+        "    <input name=\"title_en\" />\n"
+        "  </div>\n"
+        "  <div>\n"
+        "    <label>Chinese Title</label>\n"
+        "    <input name=\"title_zh\" />\n"
+        "    <span>hint</span>\n"
+        "  </div>\n"
+        "  <div>{/* legacy */}<label>ไทย</label><textarea name='intro_th'></textarea></div>\n"
+        "  <Input name=\"body_zh\" value={form.body_zh} />\n"
+        "  <Input name=\"body_en\" value={form.body_en} />\n"
+        "</div>\n"
+    )
+    # Without `starts`, remove_elements tests every element of the file
+    blocks = remove_elements(
+        content, lambda el, src: rules._is_labelled_locale_input(el, src, ('_th', '_zh')))
+    inputs = remove_elements(
+        content, lambda el, _: el.tag == 'Input' and rules._has_suffixed_name(el, ('_zh',)))
+    assert rules.remove_locale_input_blocks(content) == blocks
+    assert 'title_th' not in blocks and 'intro_th' not in blocks
+    assert 'title_zh' in blocks and 'title_en' in blocks
+    assert rules.remove_locale_inputs(content, ('_zh',)) == inputs
+    assert 'body_zh' not in inputs and 'body_en' in inputs
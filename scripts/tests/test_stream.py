@@ -0,0 +1,58 @@
+import random
+import re
+
+import pytest
+
+from codemod.stream import collapse_blank_lines, drop_lines, fix_trailing_commas, rewrite_file, transform_lines
+
+SAMPLES = [
+    'const a = "x\ry";\n',
+    'a\r\nb\r\n',
+    'a\rb\rc',
+    'mixed\r\n\rline\n\r',
+    'no newline at end',
+    '',
+    '\n\n',
+]
+
+
+@pytest.mark.parametrize('content', SAMPLES)
+def test_rewrite_file_round_trips_bytes(tmp_path, content):
+    path = tmp_path / 'sample.ts'
+    path.write_bytes(content.encode('utf-8'))
+    assert rewrite_file(path, [drop_lines(lambda line: False)]) is False
+    assert path.read_bytes() == content.encode('utf-8')
+
+
+@pytest.mark.parametrize('content', SAMPLES)
+def test_rewrite_file_matches_in_memory_stages(tmp_path, content):
+    path = tmp_path / 'sample.ts'
+    path.write_bytes(content.encode('utf-8'))
+    stages = [drop_lines(lambda line: 'b' in line), collapse_blank_lines]
+    expected = transform_lines(content, stages)
+    rewrite_file(path, stages)
+    assert path.read_bytes() == expected.encode('utf-8')
+
+
+def _fuzz(alphabet, count=20000, seed=7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+
+
+def test_fix_trailing_commas_matches_regex():
+    pattern = re.compile(r',(\s*[}\]])')
+    for content in _fuzz(['\n', ' ', ',', '}', ']', 'a', '\t', '\r']):
+        assert transform_lines(content, [fix_trailing_commas]) == pattern.sub(r'\1', content), repr(content)
+
+
+def test_collapse_blank_lines_matches_regex():
+    pattern = re.compile(r'\n\s*\n\s*\n+')
+    for content in _fuzz(['\n', ' ', '\t', 'a', '\r']):
+        assert transform_lines(content, [collapse_blank_lines]) == pattern.sub('\n\n', content), repr(content)
+
+
+def test_ultra_clean_matches_streamed_stages():
+    from ultra_clean import STAGES, ultra_clean
+    for content in _fuzz(['\n', ' ', ',', '}', 'a_th', '_zh', 'locale', "'th'", '==='], count=5000):
+        assert ultra_clean(content) == transform_lines(content, STAGES), repr(content)
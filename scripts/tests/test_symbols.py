@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from codemod.symbols import ACCESS, SymbolIndex
+
+SCHEMA = """
+model Product {
+  id         Int      @id
+  name_th    String
+  categoryId Int
+  category   Category @relation(fields: [categoryId], references: [id])
+}
+
+model Category {
+  id       Int       @id
+  name_th  String
+  slug     String
+  products Product[]
+}
+"""
+
+ROUTE = """
+export async function GET() {
+  const product = await prisma.product.findFirst({
+    select: { name_th: true, category: { select: { name_th: true } } },
+  });
+  const rows = await prisma.category.findMany({ where: { name_th: 'x' } });
+  return [product.name_th, rows.length, label.name_th];
+}
+
+function show(category: Category) {
+  return category.name_th + category.slug;
+}
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    (tmp_path / "prisma").mkdir()
+    (tmp_path / "prisma/schema.prisma").write_text(SCHEMA)
+    (tmp_path / "src/app/api").mkdir(parents=True)
+    (tmp_path / "src/app/api/route.ts").write_text(ROUTE)
+    index = SymbolIndex(tmp_path, cache_path=tmp_path / "index.json")
+    index.refresh()
+    return index
+
+
+def lines(usages):
+    return sorted(usage.line for usage in usages)
+
+
+def test_model_from_query_and_relation_keys(index):
+    assert lines(index.usages("Product.name_th")) == [4, 7]
+    assert lines(index.usages("Category.name_th")) == [4, 6, 11]
+
+
+def test_unattributed_usages_are_not_reported_for_a_model(index):
+    unknown = index.unattributed("Product.name_th")
+    assert [(u.line, u.kind) for u in unknown] == [(7, ACCESS)]
+    assert len(index.usages("name_th")) == 6
+
+
+def test_unique_name_belongs_to_its_model(index):
+    assert [u.model for u in index.usages("slug")] == ["Category"]
+    with pytest.raises(KeyError):
+        index.usages("Product.slug")
+
+
+def test_cache_round_trip_keeps_models(index, tmp_path):
+    index.save()
+    reloaded = SymbolIndex(tmp_path, cache_path=tmp_path / "index.json")
+    assert reloaded.refresh() == []
+    assert reloaded.files == index.files
+
+
+def test_refresh_rescans_changed_files(index, tmp_path):
+    path = tmp_path / "src/app/api/route.ts"
+    path.write_text(ROUTE + "\nconst p: Product = load();\nuse(p.name_th);\n")
+    os.utime(path, ns=(1, 1))
+    assert index.refresh() == ["src/app/api/route.ts"]
+    assert lines(index.usages("Product.name_th"))[-1] == 15
@@ -0,0 +1,35 @@
+import pytest
+
+from codemod import validate
+
+BROKEN = """\
+export function Page() {
+  const a = [1, 2;
+  return <div>{a}</div>;
+}
+"""
+
+
+def test_tsx_generic_arrow_is_not_jsx():
+    source = """\
+const identity = <T,>(value: T) => value;
+export const Show = <T extends object>(props: { item: T }) => <div>{String(props.item)}</div>;
+"""
+    assert validate.validate(source) == []
+
+
+def test_checked_tolerates_problems_the_input_had():
+    def drop_first_line(content):
+        return content.split('\n', 1)[1]
+
+    source = "// header\n" + BROKEN
+    assert validate.checked(drop_first_line, source) == BROKEN
+
+
+def test_checked_rejects_a_new_problem_even_if_another_is_fixed():
+    def swap_breakage(content):
+        return content.replace("[1, 2;", "[1, 2];").replace("<div>{a}</div>", "<div>{a}</span>")
+
+    assert len(validate.validate(swap_breakage(BROKEN))) <= len(validate.validate(BROKEN))
+    with pytest.raises(validate.InvalidOutput):
+        validate.checked(swap_breakage, BROKEN)
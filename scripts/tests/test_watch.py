@@ -0,0 +1,80 @@
+import time
+
+from codemod import watch as watch_module
+
+
+class ScriptedWatcher:
+    """Reports each queued batch on its own poll; idle polls just wait."""
+
+    def __init__(self, *batches):
+        self.queue = list(batches)
+        self.idle = 0
+
+    def poll(self, timeout):
+        if not self.queue:
+            self.idle += 1
+            time.sleep(min(timeout, 0.01))
+            return set()
+        action, paths = self.queue.pop(0)
+        if action is not None:
+            action()
+        return set(paths)
+
+    def close(self):
+        pass
+
+
+def _batches(monkeypatch, tmp_path, watcher, handle):
+    monkeypatch.setattr(watch_module, 'make_watcher', lambda *args: watcher)
+    batches = []
+
+    def record(paths):
+        batches.append(list(paths))
+        handle(paths)
+
+    watch_module.watch(tmp_path, ['.'], record, debounce=0.05, stop=lambda: watcher.idle > 30)
+    return batches
+
+
+def test_own_writes_are_not_reported_back(monkeypatch, tmp_path):
+    path = tmp_path / 'a.tsx'
+    path.write_text('name_th\n')
+    watcher = ScriptedWatcher((None, [path]))
+
+    def handle(paths):
+        path.write_text('clean\n')
+        watcher.queue.append((None, [path]))
+
+    assert _batches(monkeypatch, tmp_path, watcher, handle) == [[path]]
+
+
+def test_edits_during_the_settle_window_are_reported(monkeypatch, tmp_path):
+    path = tmp_path / 'a.tsx'
+    path.write_text('name_th\n')
+    watcher = ScriptedWatcher((None, [path]))
+
+    def handle(paths):
+        if path.read_text() == 'name_th\n':
+            path.write_text('clean\n')
+            # The echo of our write, then an edit before the window closes
+            watcher.queue.append((None, [path]))
+            watcher.queue.append((lambda: path.write_text('name_zh\n'), [path]))
+
+    assert _batches(monkeypatch, tmp_path, watcher, handle) == [[path], [path]]
+
+
+def test_unwatchable_directories_are_skipped(monkeypatch, tmp_path, capsys):
+    (tmp_path / 'src' / 'locked').mkdir(parents=True)
+    (tmp_path / 'src' / 'open').mkdir()
+    added = []
+
+    def add(self, directory):
+        if directory.name == 'locked':
+            raise OSError(28, "inotify_add_watch failed")
+        added.append(directory.name)
+
+    monkeypatch.setattr(watch_module.InotifyWatcher, '_add', add)
+    watcher = watch_module.InotifyWatcher(tmp_path, ['src'])
+    watcher.close()
+    assert sorted(added) == ['open', 'src']
+    assert 'Not watching' in capsys.readouterr().out
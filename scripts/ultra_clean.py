@@ -3,77 +3,91 @@
 Ultra-aggressive final pass - remove ALL _th and _zh references including string literals.
 """
 
+import argparse
 import re
+from functools import partial
 from pathlib import Path
 
+from codemod.files import REPO_ROOT
+from codemod.output import add_dry_run_argument, dry_run, read_text, render_diff
+from codemod.parallel import CHANGED, run_files
+from codemod.prefilter import matching_files
+from codemod.stream import collapse_blank_lines, drop_lines, fix_trailing_commas, rewrite_file
+
+_LOCALE_CHECK = re.compile(r"locale\s*===?\s*['\"](?:th|zh)['\"]")
+_REFERENCE = re.compile(r'_(?:th|zh)\b')
+_BLANK_RUN = re.compile(r'\n\s*\n\s*\n+')
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+
+def is_th_zh_reference(line: str) -> bool:
+    """True for any line mentioning _th/_zh outside of locale handling."""
+    # Skip any line with a _th or _zh suffix (except in comments about locale);
+    # `show_thumbnail` and the like are not references
+    if ('_th' in line or '_zh' in line) and _REFERENCE.search(line) and 'locale' not in line.lower():
+        # But keep lines that are just accessing locale (like locale === 'th')
+        return not _LOCALE_CHECK.search(line)
+    return False
+
+STAGES = (drop_lines(is_th_zh_reference), collapse_blank_lines, fix_trailing_commas)
+
 def ultra_clean(content: str) -> str:
-    """Remove all _th/_zh references aggressively."""
-    lines = content.split('\n')
-    cleaned = []
-    
-    for line in lines:
-        # Skip any line containing '_th' or '_zh' (except in comments about locale)
-        if ('_th' in line or '_zh' in line) and 'locale' not in line.lower():
-            # But keep lines that are just accessing locale (like locale === 'th')
-            if re.search(r"locale\s*===?\s*['\"](?:th|zh)['\"]", line):
-                cleaned.append(line)
-            continue
-        cleaned.append(line)
-    
-    content = '\n'.join(cleaned)
-    
-    # Clean up multiple empty lines
-    content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
-    
-    # Fix trailing commas in arrays/objects
-    content = re.sub(r',(\s*[}\]])', r'\1', content)
-    
-    return content
+    """Remove all _th/_zh references aggressively.
+
+    Same result as streaming the content through STAGES, which `process`
+    does for in-place rewrites; whole-file regexes are faster on a string
+    that is already in memory.
+    """
+    content = '\n'.join([line for line in content.split('\n')
+                          if not (('_th' in line or '_zh' in line) and is_th_zh_reference(line))])
+    content = _BLANK_RUN.sub('\n\n', content)
+    return _TRAILING_COMMA.sub(r'\1', content)
 
-def process(file_path: Path) -> bool:
+def process(file_path: Path, diff_root: Path = None):
+    """Clean one file in place, or return (changed, unified diff) with `diff_root`."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original = content
-        content = ultra_clean(content)
-        
-        if content != original:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-        return False
+        if diff_root is not None:
+            original = read_text(file_path)
+            content = ultra_clean(original)
+            return content != original, render_diff(file_path, original, content, diff_root)
+        return rewrite_file(file_path, STAGES)
     except Exception as e:
         print(f"Error: {e}")
         return False
 
 def main():
-    base = Path("/Users/aphilack/Downloads/namngarm-main-main")
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="Worker processes (0 = one per CPU, default: 1)")
+    add_dry_run_argument(parser)
+    args = parser.parse_args()
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+
+    base = REPO_ROOT
+    transform = partial(process, diff_root=base) if args.dry_run else process
+    with dry_run(args.dry_run, base) as sink:
+        # Files that mention _th/_zh, found by one byte-level scan of src/
+        files = [str(p.relative_to(base)) for p in matching_files(base, ('_th', '_zh'))]
     
-    files = [
-        "src/app/admin/settings/page.tsx",
-        "src/app/admin/quick-links/page.tsx",
-        "src/app/admin/faqs/FAQForm.tsx",
-        "src/app/admin/media/page.tsx",
-        "src/app/api/articles/route.ts",
-        "src/app/api/tags/route.ts",
-        "src/components/AboutContent.tsx",
-        "src/components/admin/forms/AboutForm.tsx",
-        "src/components/product/ProductDetailClient.tsx",
-        "src/components/product/PremiumProductCard.tsx",
-    ]
+        paths = []
+        for file_rel in files:
+            file_path = base / file_rel
+            if file_path.exists():
+                paths.append(file_path)
     
-    updated = 0
-    for file_rel in files:
-        file_path = base / file_rel
-        if file_path.exists():
-            if process(file_path):
+        updated = 0
+        for result in run_files(transform, paths, args.jobs):
+            file_rel = result.path.relative_to(base)
+            if result.status == CHANGED:
                 print(f"✓ {file_rel}")
                 updated += 1
+                if sink is not None:
+                    sink.write_lines([result.detail])
             else:
                 print(f"- {file_rel}")
-    
-    print(f"\nCleaned {updated}/{len(files)} files")
+        
+        verb = "Would clean" if args.dry_run else "Cleaned"
+        print(f"\n{verb} {updated}/{len(files)} files")
 
 if __name__ == "__main__":
     main()